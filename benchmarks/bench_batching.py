@@ -0,0 +1,72 @@
+"""
+Batched vs. one-request-per-prompt throughput, against the local mock
+server (no network needed).
+
+Each mock request costs `--latency` seconds however many prompts it
+carries, like a GPU server running a batch in one forward pass, and
+the connection pool is capped like a provider's concurrent request
+limit. Batching packs more prompts into each of those slots.
+
+    python benchmarks/bench_batching.py --prompts 2000 --concurrency 64 --connections 8 --batch-size 16
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from evalpipe.providers import BatchingProvider
+from evalpipe.providers.openai_provider import OpenAIProvider
+
+# The mock server is test code and lives with the tests.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "tests"))
+from mock_server import MockServer  # noqa: E402
+
+
+async def _drive(provider, prompts: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            await provider.infer(f"Is the sky blue? ({i})", model="mock", params={})
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(one(i) for i in range(prompts)))
+    finally:
+        await provider.aclose()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--prompts", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--connections", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--batch-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    for batch_size in (1, args.batch_size):
+        with MockServer(latency=args.latency) as server:
+            provider = OpenAIProvider(
+                base_url=server.base_url,
+                max_connections=args.connections,
+                batch_completions=batch_size > 1,
+            )
+            if batch_size > 1:
+                provider = BatchingProvider(
+                    provider, max_batch_size=batch_size, max_wait_ms=args.batch_wait_ms
+                )
+            elapsed = asyncio.run(_drive(provider, args.prompts, args.concurrency))
+            label = f"batch size {batch_size}" if batch_size > 1 else "unbatched"
+            print(
+                f"{label:16s} {args.prompts / elapsed:9.1f} prompts/s  "
+                f"{elapsed:6.2f}s  http requests={server.requests}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Cache insert/lookup throughput: the old one-JSON-file-per-key layout vs
+the single-file SQLite store.
+
+Both get the same entries (a typical result row). The old layout is
+timed on its own, smaller count by default: a million files takes a
+while to create and, more to the point, to clean up afterwards.
+
+    python benchmarks/bench_cache.py --entries 1000000 --legacy-entries 100000
+"""
+
+import argparse
+import json
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from evalpipe.cache.store import CacheStore
+
+
+def _row(i: int) -> dict:
+    return {
+        "id": f"case_{i}",
+        "prompt": f"You are a helpful assistant.\n\nTask:\nWhat is {i} * 24?\n\nAnswer:",
+        "output": str(i * 24),
+        "model": "gpt-4o-mini",
+        "latency_ms": 412,
+        "prompt_tokens": 21,
+        "completion_tokens": 3,
+        "cache_hit": False,
+        "attempts": 1,
+        "timestamp": "2026-01-15T14:30:22Z",
+    }
+
+
+def _report(label: str, count: int, seconds: float) -> None:
+    print(f"{label:<28} {count:>9} in {seconds:7.2f}s  ({count / seconds:>10.0f}/s)")
+
+
+def bench_legacy(root: Path, entries: int, lookups: int) -> None:
+    cache_dir = root / "legacy"
+    cache_dir.mkdir()
+
+    start = time.perf_counter()
+    for i in range(entries):
+        (cache_dir / f"{i:064x}.json").write_text(json.dumps(_row(i), indent=2))
+    _report("json files: insert", entries, time.perf_counter() - start)
+
+    keys = [random.randrange(entries * 2) for _ in range(lookups)]
+    start = time.perf_counter()
+    for k in keys:
+        path = cache_dir / f"{k:064x}.json"
+        if path.exists():
+            json.loads(path.read_text())
+    _report("json files: lookup (50% hit)", lookups, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    shutil.rmtree(cache_dir)
+    _report("json files: clear", entries, time.perf_counter() - start)
+
+
+def bench_store(root: Path, entries: int, lookups: int, batch: int) -> None:
+    store = CacheStore(root / "cache.db")
+
+    start = time.perf_counter()
+    for i in range(0, entries, batch):
+        store.put_many((f"{j:064x}", _row(j)) for j in range(i, min(i + batch, entries)))
+    _report("sqlite: insert (batched)", entries, time.perf_counter() - start)
+
+    keys = [f"{random.randrange(entries * 2):064x}" for _ in range(lookups)]
+    start = time.perf_counter()
+    for k in keys:
+        store.get(k)
+    _report("sqlite: lookup (50% hit)", lookups, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for i in range(0, lookups, batch):
+        store.get_many(keys[i : i + batch])
+    _report("sqlite: get_many (50% hit)", lookups, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    store.clear()
+    _report("sqlite: clear", entries, time.perf_counter() - start)
+    store.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--legacy-entries", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    parser.add_argument("--batch", type=int, default=1000)
+    args = parser.parse_args()
+
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        if args.legacy_entries:
+            bench_legacy(root, args.legacy_entries, args.lookups)
+        bench_store(root, args.entries, args.lookups, args.batch)
+
+
+if __name__ == "__main__":
+    main()
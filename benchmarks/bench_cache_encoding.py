@@ -0,0 +1,118 @@
+"""
+Cache entry encoding: bytes on disk and decode throughput.
+
+Compares the formats a cache entry has been stored in:
+- json indent=2: the old save_to_cache files
+- json compact: the SQLite store before values got a header
+- compact + prompt blobs, with no compression / zlib / zstd (if the
+  zstandard package is installed)
+
+Entries look like a long-context suite run against a few models: every
+case's rendered prompt is shared by `--models` entries.
+
+    python benchmarks/bench_cache_encoding.py --cases 20000 --prompt-chars 6000
+"""
+
+import argparse
+import json
+import random
+import sqlite3
+import string
+import tempfile
+import time
+from pathlib import Path
+
+from evalpipe.cache import codec
+from evalpipe.cache.store import CacheStore
+
+
+def _rows(cases: int, models: int, prompt_chars: int):
+    rng = random.Random(0)
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9))) for _ in range(2000)]
+    context = " ".join(rng.choices(words, k=prompt_chars // 5))[:prompt_chars]
+    for i in range(cases):
+        prompt = f"You are a helpful assistant.\n\nContext:\n{context}\n\nQuestion {i}: {' '.join(rng.choices(words, k=12))}?\n\nAnswer:"
+        for m in range(models):
+            yield f"{i:08d}-{m}", {
+                "id": f"case_{i}",
+                "prompt": prompt,
+                "output": " ".join(rng.choices(words, k=40)),
+                "model": f"model-{m}",
+                "latency_ms": rng.randint(200, 3000),
+                "prompt_tokens": prompt_chars // 4,
+                "completion_tokens": 60,
+                "cache_hit": False,
+                "coalesced": False,
+                "attempts": 1,
+                "timestamp": "2026-01-15T14:30:22Z",
+            }
+
+
+def _report(label: str, size: int, payload: int, count: int, seconds: float) -> None:
+    print(f"{label:<26} {size / 1024**2:9.1f} MB  ({size / payload:5.2f}x payload)  decode {count / seconds:>9.0f}/s")
+
+
+def bench_legacy_text(root: Path, name: str, rows, indent, payload: int, batch: int) -> None:
+    # What the store used to hold: the JSON text as the value. Opening it
+    # with CacheStore upgrades the schema but leaves the values alone.
+    path = root / f"legacy-{indent}.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE entries (key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID")
+    separators = (",", ": ") if indent else (",", ":")
+    conn.executemany("INSERT INTO entries VALUES (?, ?)", ((k, json.dumps(v, indent=indent, separators=separators)) for k, v in rows))
+    conn.execute("PRAGMA user_version = 1")
+    conn.commit()
+    conn.close()
+    CacheStore(path).close()
+    _time_reads(name, path, [k for k, _ in rows], payload, batch)
+
+
+def _time_reads(label: str, path: Path, keys, payload: int, batch: int) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute("VACUUM")
+    conn.close()
+    store = CacheStore(path)
+    start = time.perf_counter()
+    for i in range(0, len(keys), batch):
+        store.get_many(keys[i : i + batch])
+    _report(label, path.stat().st_size, payload, len(keys), time.perf_counter() - start)
+    store.close()
+
+
+def bench_store(root: Path, compression: str, rows, payload: int, batch: int) -> None:
+    path = root / f"{compression}.db"
+    store = CacheStore(path, compression=compression)
+    for i in range(0, len(rows), batch):
+        store.put_many(rows[i : i + batch])
+    store.close()
+    _time_reads(f"compact + prompts: {compression}", path, [k for k, _ in rows], payload, batch)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cases", type=int, default=20_000)
+    parser.add_argument("--models", type=int, default=3)
+    parser.add_argument("--prompt-chars", type=int, default=6000)
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args()
+
+    rows = list(_rows(args.cases, args.models, args.prompt_chars))
+    # The useful payload: each distinct prompt once, plus everything else.
+    prompts = {v["prompt"] for _, v in rows}
+    payload = sum(len(p.encode()) for p in prompts) + sum(
+        len(json.dumps({**v, "prompt": None}, separators=(",", ":")).encode()) for _, v in rows
+    )
+    print(f"{len(rows)} entries, {len(prompts)} distinct prompts, payload {payload / 1024**2:.1f} MB")
+    print("(decode: get_many through the store, in batches of --batch)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        bench_legacy_text(root, "json indent=2", rows, 2, payload, args.batch)
+        bench_legacy_text(root, "json compact", rows, None, payload, args.batch)
+        codecs = ["none", "zlib"] + (["zstd"] if codec.zstandard is not None else [])
+        for compression in codecs:
+            bench_store(root, compression, rows, payload, args.batch)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Connection reuse vs. one connection per request, against the local
+mock server (no network needed).
+
+    python benchmarks/bench_connection_reuse.py --requests 2000 --concurrency 32 --latency 0.005
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from evalpipe.providers.openai_provider import OpenAIProvider
+
+# The mock server is test code and lives with the tests.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "tests"))
+from mock_server import MockServer  # noqa: E402
+
+
+async def _drive(provider: OpenAIProvider, requests: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            await provider.infer(f"What is 17 * 24? ({i})", model="mock", params={})
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(one(i) for i in range(requests)))
+    finally:
+        await provider.aclose()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.005)
+    args = parser.parse_args()
+
+    for keep_alive in (True, False):
+        with MockServer(latency=args.latency) as server:
+            provider = OpenAIProvider(
+                base_url=server.base_url,
+                max_connections=args.concurrency,
+                keep_alive=keep_alive,
+            )
+            elapsed = asyncio.run(_drive(provider, args.requests, args.concurrency))
+            label = "pooled keep-alive" if keep_alive else "connection per request"
+            print(
+                f"{label:24s} {args.requests / elapsed:9.1f} req/s  "
+                f"{elapsed:6.2f}s  connections={server.connections}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Prompt render throughput: the old per-case render_prompt (read the
+template, hash it, one str.replace per test case key) vs a compiled
+template (split once, one join per case).
+
+    python benchmarks/bench_render.py --cases 1000000
+"""
+
+import argparse
+import hashlib
+import tempfile
+import time
+from pathlib import Path
+
+from evalpipe.prompts.render import load_template, render_prompt
+
+TEMPLATE = """You are a helpful assistant.
+Follow the instructions exactly.
+
+Category: {{category}}
+
+Task:
+{{prompt}}
+
+Answer:
+"""
+
+
+def _old_render_prompt(prompt_path: Path, test_case: dict) -> str:
+    # render_prompt as it was: load_prompt() plus a replace per key.
+    text = prompt_path.read_text(encoding="utf-8")
+    hashlib.sha256(text.encode("utf-8")).hexdigest()
+    for key, value in test_case.items():
+        text = text.replace(f"{{{{{key}}}}}", str(value))
+    return text
+
+
+def _old_render_template(template_text: str, test_case: dict) -> str:
+    for key, value in test_case.items():
+        template_text = template_text.replace(f"{{{{{key}}}}}", str(value))
+    return template_text
+
+
+def _cases(n: int):
+    for i in range(n):
+        yield {
+            "id": f"case_{i}",
+            "category": "reasoning",
+            "prompt": f"What is {i} * 24?",
+            "expected": str(i * 24),
+            "evaluation": {"type": "exact_match"},
+            "metadata": {"difficulty": "easy"},
+        }
+
+
+def _time(label: str, n: int, render) -> None:
+    start = time.perf_counter()
+    for tc in _cases(n):
+        render(tc)
+    seconds = time.perf_counter() - start
+    print(f"{label:<36} {n:>9} in {seconds:7.2f}s  ({n / seconds:>10.0f}/s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cases", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "template.txt"
+        path.write_text(TEMPLATE)
+
+        # Case generation alone, to subtract by eye.
+        _time("(generating cases only)", args.cases, lambda tc: None)
+        _time("old render_prompt (per-case load)", args.cases, lambda tc: _old_render_prompt(path, tc))
+        _time("old replace loop (template in hand)", args.cases, lambda tc: _old_render_template(TEMPLATE, tc))
+        _time("render_prompt (compiled, stat)", args.cases, lambda tc: render_prompt(path, tc))
+        template = load_template(path)
+        _time("CompiledTemplate.render", args.cases, template.render)
+
+        assert template.render(next(_cases(1))) == _old_render_template(TEMPLATE, next(_cases(1)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,18 @@
 from __future__ import annotations
+import bisect
+import math
 from typing import Any, Dict, List, Optional, Tuple
 
+TOP_FAILURES = 10
+
+# Per-row stream timings summarized per model and per category.
+STREAM_METRICS = ("ttft_ms", "inter_token_ms", "tokens_per_sec")
+
+# Histogram bucket width: values within 2% of each other share a bucket,
+# which bounds quantile error at ~1% without keeping every value.
+_GROWTH = 1.02
+_LOG_GROWTH = math.log(_GROWTH)
+
 def _safe_float(x: Any, default: float = 0.0) -> float:
     try:
         return float(x)
@@ -15,97 +27,289 @@ def _safe_int(x: Any, default: int = 0) -> int:
         return default
 
 
-def aggregate_results(
-    test_cases: List[Dict[str, Any]],
-    results: List[Dict[str, Any]],
-    evaluations: List[Dict[str, Any]],
-    costs: Optional[Dict[str, Any]] = None,
-) -> Dict[str, Any]:
-    total = len(test_cases)
-    passed = 0
-    failed = 0
+class _Histogram:
+    """
+    Log-bucketed histogram of positive values. Mergeable and bounded in
+    size, so per-model/per-category quantiles survive sharding.
+    """
 
-    by_category: Dict[str, Dict[str, int]] = {}
-    by_evaluator: Dict[str, Dict[str, int]] = {}
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.buckets: Dict[int, int] = {}
 
-    top_failures: List[Dict[str, Any]] = []
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        b = math.floor(math.log(value) / _LOG_GROWTH) if value > 0 else -(10**6)
+        self.buckets[b] = self.buckets.get(b, 0) + 1
 
-    latency_sum = 0
-    latency_count = 0
-    prompt_tokens = 0
-    completion_tokens = 0
+    def merge(self, other: "_Histogram") -> None:
+        self.count += other.count
+        self.total += other.total
+        for b, n in other.buckets.items():
+            self.buckets[b] = self.buckets.get(b, 0) + n
 
-    for idx, tc in enumerate(test_cases):
-        ev = evaluations[idx] if idx < len(evaluations) else {}
-        res = results[idx] if idx < len(results) else {}
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = min(self.count - 1, int(q * self.count))
+        seen = 0
+        for b in sorted(self.buckets):
+            seen += self.buckets[b]
+            if seen > rank:
+                # Bucket midpoint (geometric); 0 for the "zero or less" bucket.
+                return 0.0 if b == -(10**6) else _GROWTH ** (b + 0.5)
+        return 0.0
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "mean": round(self.total / self.count, 3) if self.count else 0.0,
+            "p50": round(self.quantile(0.5), 3),
+            "p95": round(self.quantile(0.95), 3),
+        }
 
+
+def _stream_summary(groups: Dict[str, Dict[str, _Histogram]]) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    for key in sorted(groups):
+        hists = groups[key]
+        out[key] = {"count": max(h.count for h in hists.values())}
+        for metric in STREAM_METRICS:
+            if metric in hists:
+                out[key][metric] = hists[metric].summary()
+    return out
+
+
+class Aggregator:
+    """
+    Running summary state.
+
+    Cases are folded in one at a time so a run never needs to hold the
+    full results/evaluations lists just to produce summary.json.
+
+    State is mergeable: shards of one suite can be aggregated separately
+    and combined with merge() into exactly what a single pass over the
+    whole suite would give. That's why failures are tracked by suite
+    index rather than by arrival order.
+    """
+
+    def __init__(self) -> None:
+        self.total = 0
+        self.passed = 0
+        self.failed = 0
+        self.errors = 0
+        self.by_category: Dict[str, Dict[str, int]] = {}
+        self.by_evaluator: Dict[str, Dict[str, int]] = {}
+        # (suite_index, failure) pairs, kept sorted, capped at TOP_FAILURES.
+        self._failures: List[Tuple[int, Dict[str, Any]]] = []
+        self.latency_sum = 0
+        self.latency_count = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        # Cache hits by how they matched ("exact" / "content").
+        self.cache_hits: Dict[str, int] = {}
+        self.judged = 0
+        self.judge_cache_hits = 0
+        # model / category -> metric -> histogram, for streamed rows only.
+        self.stream_by_model: Dict[str, Dict[str, _Histogram]] = {}
+        self.stream_by_category: Dict[str, Dict[str, _Histogram]] = {}
+
+    def add(
+        self,
+        tc: Dict[str, Any],
+        res: Optional[Dict[str, Any]],
+        ev: Optional[Dict[str, Any]],
+        index: Optional[int] = None,
+    ) -> None:
+        ev = ev or {}
+        res = res or {}
+
+        if index is None:
+            index = ev.get("index", self.total)
+
+        self.total += 1
         ok = bool(ev.get("passed", False))
         if ok:
-            passed += 1
+            self.passed += 1
         else:
-            failed += 1
+            self.failed += 1
+
+        if res.get("error"):
+            self.errors += 1
 
         category = tc.get("category") or "uncategorized"
-        by_category.setdefault(category, {"total": 0, "passed": 0, "failed": 0})
-        by_category[category]["total"] += 1
-        by_category[category]["passed"] += 1 if ok else 0
-        by_category[category]["failed"] += 0 if ok else 1
+        self.by_category.setdefault(category, {"total": 0, "passed": 0, "failed": 0})
+        self.by_category[category]["total"] += 1
+        self.by_category[category]["passed"] += 1 if ok else 0
+        self.by_category[category]["failed"] += 0 if ok else 1
 
         eval_type = None
         if isinstance(tc.get("evaluation"), dict):
             eval_type = tc["evaluation"].get("type")
         eval_type = ev.get("evaluator") or eval_type or "unknown"
 
-        by_evaluator.setdefault(eval_type, {"total": 0, "passed": 0, "failed": 0})
-        by_evaluator[eval_type]["total"] += 1
-        by_evaluator[eval_type]["passed"] += 1 if ok else 0
-        by_evaluator[eval_type]["failed"] += 0 if ok else 1
+        self.by_evaluator.setdefault(eval_type, {"total": 0, "passed": 0, "failed": 0})
+        self.by_evaluator[eval_type]["total"] += 1
+        self.by_evaluator[eval_type]["passed"] += 1 if ok else 0
+        self.by_evaluator[eval_type]["failed"] += 0 if ok else 1
 
         lat = res.get("latency_ms", None)
         if lat is not None:
-            latency_sum += _safe_int(lat, 0)
-            latency_count += 1
+            self.latency_sum += _safe_int(lat, 0)
+            self.latency_count += 1
+
+        self.prompt_tokens += _safe_int(res.get("prompt_tokens", 0), 0)
+        self.completion_tokens += _safe_int(res.get("completion_tokens", 0), 0)
+
+        if res.get("cache_hit"):
+            match = res.get("cache_match") or "exact"
+            self.cache_hits[match] = self.cache_hits.get(match, 0) + 1
+
+        if "judge_cache_hit" in ev:
+            self.judged += 1
+            self.judge_cache_hits += 1 if ev["judge_cache_hit"] else 0
 
-        prompt_tokens += _safe_int(res.get("prompt_tokens", 0), 0)
-        completion_tokens += _safe_int(res.get("completion_tokens", 0), 0)
+        # Cached and shared responses carry no timings of their own.
+        if res.get("ttft_ms") is not None and not res.get("cache_hit") and not res.get("coalesced"):
+            model = res.get("model") or "unknown"
+            for groups, key in ((self.stream_by_model, model), (self.stream_by_category, category)):
+                hists = groups.setdefault(key, {})
+                for metric in STREAM_METRICS:
+                    value = res.get(metric)
+                    if value is not None:
+                        hists.setdefault(metric, _Histogram()).add(_safe_float(value))
 
         if not ok:
-            top_failures.append(
+            self._add_failure(
+                index,
                 {
                     "id": tc.get("id") or ev.get("id") or res.get("id"),
                     "category": category,
                     "evaluator": eval_type,
                     "reason": ev.get("reason") or ev.get("error") or "failed",
-                }
+                },
             )
 
-    avg_latency_ms = (latency_sum / latency_count) if latency_count else 0.0
-    pass_rate = (passed / total) if total else 0.0
-
-    cost_block = costs or {}
-    estimated_cost = _safe_float(cost_block.get("estimated_cost", cost_block.get("total_usd", 0.0)), 0.0)
-
-    inference_usd = _safe_float(cost_block.get("inference_usd", 0.0), 0.0)
-    judge_usd = _safe_float(cost_block.get("judge_usd", 0.0), 0.0)
-
-    summary: Dict[str, Any] = {
-        "total_tests": total,
-        "passed": passed,
-        "failed": failed,
-        "pass_rate": pass_rate,
-        "by_category": by_category,
-        "by_evaluator": by_evaluator,
-        "top_failures": top_failures[:10],
-        "avg_latency_ms": avg_latency_ms,
-        "prompt_tokens": prompt_tokens,
-        "completion_tokens": completion_tokens,
-        "estimated_cost": estimated_cost,
-        "cost_breakdown": {
-            "inference_usd": inference_usd,
-            "judge_usd": judge_usd,
-            "total_usd": estimated_cost,
-        },
-    }
-
-    return summary
+    def _add_failure(self, index: int, failure: Dict[str, Any]) -> None:
+        # Only the first few failures (in suite order) make it into the
+        # summary, so there's no reason to keep the rest around.
+        if len(self._failures) >= TOP_FAILURES and index >= self._failures[-1][0]:
+            return
+        bisect.insort(self._failures, (index, failure), key=lambda item: item[0])
+        del self._failures[TOP_FAILURES:]
+
+    def merge(self, other: "Aggregator") -> "Aggregator":
+        """
+        Folds another aggregator's state into this one (in place).
+        """
+        self.total += other.total
+        self.passed += other.passed
+        self.failed += other.failed
+        self.errors += other.errors
+
+        for mine, theirs in (
+            (self.by_category, other.by_category),
+            (self.by_evaluator, other.by_evaluator),
+        ):
+            for key, counts in theirs.items():
+                bucket = mine.setdefault(key, {"total": 0, "passed": 0, "failed": 0})
+                for field, value in counts.items():
+                    bucket[field] = bucket.get(field, 0) + value
+
+        for index, failure in other._failures:
+            self._add_failure(index, failure)
+
+        for mine_s, theirs_s in (
+            (self.stream_by_model, other.stream_by_model),
+            (self.stream_by_category, other.stream_by_category),
+        ):
+            for key, hists in theirs_s.items():
+                target = mine_s.setdefault(key, {})
+                for metric, hist in hists.items():
+                    target.setdefault(metric, _Histogram()).merge(hist)
+
+        self.latency_sum += other.latency_sum
+        self.latency_count += other.latency_count
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        for match, n in other.cache_hits.items():
+            self.cache_hits[match] = self.cache_hits.get(match, 0) + n
+        self.judged += other.judged
+        self.judge_cache_hits += other.judge_cache_hits
+        return self
+
+    @property
+    def top_failures(self) -> List[Dict[str, Any]]:
+        return [failure for _, failure in self._failures]
+
+    def summary(self, costs: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        avg_latency_ms = (self.latency_sum / self.latency_count) if self.latency_count else 0.0
+        pass_rate = (self.passed / self.total) if self.total else 0.0
+
+        cost_block = costs or {}
+        estimated_cost = _safe_float(cost_block.get("estimated_cost", cost_block.get("total_usd", 0.0)), 0.0)
+
+        inference_usd = _safe_float(cost_block.get("inference_usd", 0.0), 0.0)
+        judge_usd = _safe_float(cost_block.get("judge_usd", 0.0), 0.0)
+
+        summary: Dict[str, Any] = {
+            "total_tests": self.total,
+            "passed": self.passed,
+            "failed": self.failed,
+            "pass_rate": pass_rate,
+            # Sorted so the summary doesn't depend on which shard saw a
+            # category first.
+            "by_category": {k: self.by_category[k] for k in sorted(self.by_category)},
+            "by_evaluator": {k: self.by_evaluator[k] for k in sorted(self.by_evaluator)},
+            "top_failures": self.top_failures,
+            "avg_latency_ms": avg_latency_ms,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "estimated_cost": estimated_cost,
+            "cost_breakdown": {
+                "inference_usd": inference_usd,
+                "judge_usd": judge_usd,
+                "total_usd": estimated_cost,
+            },
+        }
+
+        if self.cache_hits:
+            hits = sum(self.cache_hits.values())
+            summary["cache"] = {
+                "hits": hits,
+                "exact_hits": self.cache_hits.get("exact", 0),
+                "content_hits": self.cache_hits.get("content", 0),
+                "hit_rate": hits / self.total if self.total else 0.0,
+            }
+
+        if self.judged:
+            summary["judge"] = {
+                "judged": self.judged,
+                "cache_hits": self.judge_cache_hits,
+                "hit_rate": self.judge_cache_hits / self.judged,
+            }
+
+        if self.stream_by_model:
+            summary["streaming"] = {
+                "by_model": _stream_summary(self.stream_by_model),
+                "by_category": _stream_summary(self.stream_by_category),
+            }
+
+        return summary
+
+
+def aggregate_results(
+    test_cases: List[Dict[str, Any]],
+    results: List[Dict[str, Any]],
+    evaluations: List[Dict[str, Any]],
+    costs: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    aggregator = Aggregator()
+
+    for idx, tc in enumerate(test_cases):
+        ev = evaluations[idx] if idx < len(evaluations) else {}
+        res = results[idx] if idx < len(results) else {}
+        aggregator.add(tc, res, ev, index=idx)
 
+    return aggregator.summary(costs)
@@ -0,0 +1,125 @@
+"""
+Cache bundles: a slice of the cache in one portable file.
+
+Meant for CI: export the entries a job needs once, keep the file as a
+build artifact, and import it on a fresh runner before `evalpipe run`.
+
+A bundle is gzipped JSON lines: a header, one line per entry, then a
+trailer with the entry count and a SHA-256 over the entry lines. Both
+export and import stream, so a bundle never has to fit in memory.
+Import checks the whole file before writing anything, then merges in
+batches and leaves keys that are already in the cache alone.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from evalpipe.cache.store import CacheStore
+
+FORMAT = "evalpipe-cache-bundle"
+VERSION = 1
+
+
+class BundleError(ValueError):
+    pass
+
+
+def export_bundle(
+    store: CacheStore,
+    path: Path,
+    *,
+    models: Optional[Iterable[str]] = None,
+    test_ids: Optional[Set[str]] = None,
+) -> int:
+    """
+    Writes entries for `models` and `test_ids` (all of them when None)
+    to `path`. Entries don't record their suite, so a suite is matched
+    by its case ids. Returns the number of entries written.
+    """
+    digest = hashlib.sha256()
+    count = 0
+    with gzip.open(path, "wb") as f:
+        f.write(_line({"format": FORMAT, "version": VERSION, "created_at": time.time()}))
+        for key, row in store.iter_entries(models=models):
+            if test_ids is not None and row.get("id") not in test_ids:
+                continue
+            line = _line({"key": key, "value": row})
+            digest.update(line)
+            f.write(line)
+            count += 1
+        f.write(_line({"entries": count, "sha256": digest.hexdigest()}))
+    return count
+
+
+def import_bundle(store: CacheStore, path: Path, *, batch_size: int = 1000) -> Tuple[int, int]:
+    """
+    Merges a bundle into `store`. Returns (imported, skipped), where
+    skipped entries were already cached. Raises BundleError, without
+    writing anything, if the bundle is damaged.
+    """
+    total = verify_bundle(path)
+    imported = 0
+    batch: List[Tuple[str, Dict[str, Any]]] = []
+    for line in _entries(path):
+        entry = json.loads(line)
+        batch.append((entry["key"], entry["value"]))
+        if len(batch) >= batch_size:
+            imported += store.put_many(batch, replace=False)
+            batch = []
+    imported += store.put_many(batch, replace=False)
+    return imported, total - imported
+
+
+def verify_bundle(path: Path) -> int:
+    """Checks the header and checksum; returns the number of entries."""
+    digest = hashlib.sha256()
+    count = 0
+    last = None
+    for line in _lines(path):
+        if last is not None:
+            digest.update(last)
+            count += 1
+        last = line
+    try:
+        trailer = json.loads(last) if last else {}
+    except ValueError:
+        trailer = {}
+    if trailer.get("entries") != count or trailer.get("sha256") != digest.hexdigest():
+        raise BundleError(f"{path} is truncated or corrupt (checksum mismatch)")
+    return count
+
+
+def _line(obj: Dict[str, Any]) -> bytes:
+    return json.dumps(obj, separators=(",", ":")).encode() + b"\n"
+
+
+def _lines(path: Path) -> Iterator[bytes]:
+    """Every line after the header: the entries, then the trailer."""
+    try:
+        with gzip.open(path, "rb") as f:
+            try:
+                header = json.loads(f.readline())
+            except ValueError:
+                header = None
+            if not isinstance(header, dict) or header.get("format") != FORMAT:
+                raise BundleError(f"{path} is not a cache bundle")
+            if header.get("version") != VERSION:
+                raise BundleError(f"{path}: unsupported bundle version {header.get('version')}")
+            yield from f
+    except (OSError, EOFError, zlib.error) as e:
+        raise BundleError(f"{path} is truncated or corrupt ({e})") from e
+
+
+def _entries(path: Path) -> Iterator[bytes]:
+    last = None
+    for line in _lines(path):
+        if last is not None:
+            yield last
+        last = line
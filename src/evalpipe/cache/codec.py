@@ -0,0 +1,88 @@
+"""
+On-disk encoding for cache values.
+
+Values used to be stored as JSON text. They're now bytes: a two-byte
+header (format version, codec) followed by compact JSON, compressed
+with zlib or zstd when that's worth it. Values too small to gain from
+compression are stored raw, with a header that says so, so one store
+can hold a mix.
+
+Text values, i.e. anything written before the header existed, are
+still read as plain JSON.
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+from typing import Any, Dict, Union
+
+try:
+    import zstandard
+except ImportError:  # optional: pip install zstandard
+    zstandard = None
+
+FORMAT_VERSION = 1
+
+RAW = 0
+ZLIB = 1
+ZSTD = 2
+
+CODECS = {"none": RAW, "zlib": ZLIB, "zstd": ZSTD}
+
+# Below this, the compressed form is rarely smaller than the input.
+COMPRESS_MIN_BYTES = 512
+
+
+def check_codec(name: str) -> int:
+    if name not in CODECS:
+        raise ValueError(f"Unknown cache compression: {name!r} (expected one of {', '.join(CODECS)})")
+    if CODECS[name] == ZSTD and zstandard is None:
+        raise ValueError("zstd cache compression needs the zstandard package (pip install zstandard)")
+    return CODECS[name]
+
+
+def pack(data: bytes, codec: int = ZLIB) -> bytes:
+    if codec != RAW and len(data) >= COMPRESS_MIN_BYTES:
+        if codec == ZLIB:
+            body = zlib.compress(data, 6)
+        else:
+            body = zstandard.ZstdCompressor(level=3).compress(data)
+        if len(body) < len(data):
+            return bytes((FORMAT_VERSION, codec)) + body
+    return bytes((FORMAT_VERSION, RAW)) + data
+
+
+def unpack(blob: bytes) -> bytes:
+    version, codec = blob[0], blob[1]
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported cache value format: {version}")
+    if codec == RAW:
+        return blob[2:]
+    if codec == ZLIB:
+        return zlib.decompress(blob[2:])
+    if codec == ZSTD:
+        if zstandard is None:
+            raise ValueError("This cache has zstd-compressed values; pip install zstandard to read them")
+        return zstandard.ZstdDecompressor().decompress(blob[2:])
+    raise ValueError(f"Unknown cache value codec: {codec}")
+
+
+def encode_row(row: Dict[str, Any], codec: int = ZLIB) -> bytes:
+    return pack(json.dumps(row, separators=(",", ":")).encode(), codec)
+
+
+def decode_row(value: Union[str, bytes]) -> Dict[str, Any]:
+    if isinstance(value, str):
+        return json.loads(value)
+    return json.loads(unpack(value))
+
+
+def encode_text(text: str, codec: int = ZLIB) -> bytes:
+    return pack(text.encode(), codec)
+
+
+def decode_text(value: Union[str, bytes]) -> str:
+    if isinstance(value, str):
+        return value
+    return unpack(value).decode()
@@ -1,7 +1,14 @@
 import hashlib
 import json
+import os
+import re
+import unicodedata
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
+
+from evalpipe.cache.codec import check_codec
+from evalpipe.cache.store import DB_NAME, CacheStore
+from evalpipe.cache.tiered import TieredCache
 
 CACHE_DIR = Path(".cache")
 
@@ -29,21 +36,164 @@ def make_cache_key(
     return _stable_hash(payload)
 
 
+def make_judge_key(
+    *,
+    judge_model: str,
+    rubric_hash: str,
+    prompt: str,
+    output: str,
+) -> str:
+    payload = {
+        "key": "judge",
+        "judge_model": judge_model,
+        "rubric": rubric_hash,
+        "prompt": prompt,
+        "output": output,
+    }
+    return _stable_hash(payload)
+
+
+# How responses are keyed. "exact" (the default) is make_cache_key: a
+# case copied into another suite or renamed starts from scratch.
+# "content" additionally keys rows on what was actually sent (model,
+# normalized prompt, params, provider version), so they're reused
+# across suites and ids. Set with set_key_mode().
+KEY_MODES = ("exact", "content")
+KEY_MODE = "exact"
+
+_HSPACE = re.compile(r"[ \t\f\v]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def set_key_mode(mode: str) -> None:
+    global KEY_MODE
+    if mode not in KEY_MODES:
+        raise ValueError(f"Unknown cache key mode: {mode!r} (expected one of {', '.join(KEY_MODES)})")
+    KEY_MODE = mode
+
+
+def normalize_prompt(prompt: str) -> str:
+    """
+    NFC, Unix newlines, runs of spaces/tabs collapsed, trailing spaces
+    and extra blank lines dropped. Line structure is kept: it can matter
+    to the model, stray spaces from template edits don't.
+    """
+    text = unicodedata.normalize("NFC", prompt).replace("\r\n", "\n").replace("\r", "\n")
+    lines = [_HSPACE.sub(" ", line).strip() for line in text.split("\n")]
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+def make_content_key(
+    *,
+    model: str,
+    prompt: str,
+    params: Dict[str, Any],
+    provider_version: str,
+) -> str:
+    payload = {
+        "key": "content",
+        "model": model,
+        "prompt": normalize_prompt(prompt),
+        "params": params,
+        "provider_version": provider_version,
+    }
+    return _stable_hash(payload)
+
+
+def cache_keys(
+    *,
+    suite_id: str,
+    test_id: str,
+    model: str,
+    prompt: str,
+    params: Dict[str, Any],
+    provider_version: str,
+) -> List[Tuple[str, str]]:
+    """
+    (match, key) pairs to look up in order and to write under: the exact
+    key, plus the content key when KEY_MODE is "content".
+    """
+    keys = [("exact", make_cache_key(suite_id=suite_id, test_id=test_id, model=model, prompt=prompt, params=params))]
+    if KEY_MODE == "content":
+        keys.append(
+            ("content", make_content_key(model=model, prompt=prompt, params=params, provider_version=provider_version))
+        )
+    return keys
+
+
+# In-memory tier budget (see cache/tiered.py); set with set_memory_budget().
+MEMORY_MAX_ENTRIES = 10_000
+MEMORY_MAX_BYTES = 64 * 1024**2
+
+# Codec for new cache values (see cache/codec.py); set with set_compression().
+COMPRESSION = "zlib"
+
+_caches: Dict[Tuple[int, str], TieredCache] = {}
+
+
+def get_cache() -> TieredCache:
+    """
+    The cache under CACHE_DIR, opened on first use. Keyed by absolute
+    path, since CACHE_DIR is relative to wherever we're running, and by
+    process: a forked evaluation worker must not share its parent's
+    SQLite connection, so it opens its own.
+    """
+    # os.path.join, not Path.resolve(): this is on the per-case path.
+    where = os.path.join(os.getcwd(), CACHE_DIR, DB_NAME)
+    cache = _caches.get((os.getpid(), where))
+    if cache is None:
+        cache = _caches[(os.getpid(), where)] = TieredCache(
+            CacheStore(Path(where), compression=COMPRESSION), max_entries=MEMORY_MAX_ENTRIES, max_bytes=MEMORY_MAX_BYTES
+        )
+    return cache
+
+
+def get_store() -> CacheStore:
+    return get_cache().store
+
+
+def set_memory_budget(max_entries: int, max_bytes: int) -> None:
+    global MEMORY_MAX_ENTRIES, MEMORY_MAX_BYTES
+    MEMORY_MAX_ENTRIES, MEMORY_MAX_BYTES = max_entries, max_bytes
+    for cache in _caches.values():
+        cache.resize(max_entries=max_entries, max_bytes=max_bytes)
+
+
+def set_compression(name: str) -> None:
+    global COMPRESSION
+    codec = check_codec(name)
+    COMPRESSION = name
+    for cache in _caches.values():
+        cache.store.codec = codec
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Per-tier counters for the open cache(s); empty if none was used."""
+    if not _caches:
+        return {}
+    return get_cache().stats()
+
+
+def close_stores() -> None:
+    pid = os.getpid()
+    for (owner, _), cache in _caches.items():
+        if owner == pid:
+            cache.close()
+    _caches.clear()
+
+
 def load_from_cache(key: str) -> Optional[Dict[str, Any]]:
-    path = CACHE_DIR / f"{key}.json"
-    if not path.exists():
-        return None
-    return json.loads(path.read_text())
+    return get_cache().get(key)
 
 
 def save_to_cache(key: str, value: Dict[str, Any]) -> None:
-    CACHE_DIR.mkdir(exist_ok=True)
-    path = CACHE_DIR / f"{key}.json"
-    path.write_text(json.dumps(value, indent=2))
+    get_cache().put(key, value)
 
 
 def clear_cache() -> None:
     if not CACHE_DIR.exists():
         return
+    get_cache().clear()
+    # Leftovers from the old one-file-per-key layout.
     for f in CACHE_DIR.glob("*.json"):
         f.unlink()
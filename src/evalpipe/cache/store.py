@@ -0,0 +1,417 @@
+"""
+Single-file cache store (SQLite, WAL mode).
+
+One row per cache key instead of one JSON file per key: a million
+entries is one file rather than a million inodes, a lookup is an index
+probe rather than exists() + read_text(), and clearing is one DELETE.
+
+WAL mode lets readers carry on while another process writes, so shards
+of one suite running side by side can share a cache. Writers queue on
+SQLite's file lock; busy_timeout makes them wait instead of failing.
+get_many/put_many batch many keys into one statement/transaction.
+
+Each entry records its size, model and last access time, so prune() can
+enforce a byte budget (least recently used first) and a max age.
+Access times are buffered and written in batches rather than turning
+every read into a write. Every store also logs its hit/miss counts when
+closed, which is where `evalpipe cache stats` gets recent hit rates.
+
+Values are stored compactly (see cache/codec.py). A long rendered
+prompt, usually most of a row and shared by every model and param set
+a case runs with, is kept once in a `prompts` table keyed by its hash.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from evalpipe.cache.codec import check_codec, decode_row, decode_text, encode_row, encode_text
+
+DB_NAME = "cache.db"
+SCHEMA_VERSION = 3
+
+# Prompts shorter than this stay inline: a second table insert and join
+# cost more than storing a short prompt twice.
+PROMPT_BLOB_MIN = 512
+
+# Buffered access-time updates written per batch.
+TOUCH_BATCH = 1000
+
+_SIZE_UNITS = {"": 1, "b": 1, "k": 1024, "kb": 1024, "m": 1024**2, "mb": 1024**2, "g": 1024**3, "gb": 1024**3}
+_AGE_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+
+def parse_size(text: str) -> int:
+    """'500MB', '2g', '1024' -> bytes."""
+    m = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([a-zA-Z]*)\s*", text)
+    if not m or m.group(2).lower() not in _SIZE_UNITS:
+        raise ValueError(f"Can't parse size: {text!r}")
+    return int(float(m.group(1)) * _SIZE_UNITS[m.group(2).lower()])
+
+
+def parse_age(text: str) -> float:
+    """'7d', '12h', '30m' -> seconds."""
+    m = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([smhdw])\s*", text)
+    if not m:
+        raise ValueError(f"Can't parse age: {text!r} (use e.g. 30m, 12h, 7d)")
+    return float(m.group(1)) * _AGE_UNITS[m.group(2)]
+
+
+# SQLite caps bound parameters per statement (999 on older builds).
+_BATCH = 500
+
+
+class CacheStore:
+    def __init__(self, path: Path, *, busy_timeout_ms: int = 30_000, compression: str = "zlib") -> None:
+        self.path = Path(path)
+        self.codec = check_codec(compression)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared by whichever thread calls in; the lock
+        # keeps them from interleaving statements.
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(f"PRAGMA busy_timeout = {int(busy_timeout_ms)}")
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            # In WAL mode NORMAL only risks the last few commits on power
+            # loss, never corruption. Fine for a cache.
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+            self._migrate()
+
+        self.hits = 0
+        self.misses = 0
+        self._touched: Dict[str, float] = {}
+
+    def _migrate(self) -> None:
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+            return
+        # Take the write lock before re-reading the version: another
+        # process may be migrating the same file right now.
+        self._conn.execute("BEGIN IMMEDIATE")
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < 1:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID"
+            )
+        if version < 2:
+            now = time.time()
+            for column in ("size INTEGER", "model TEXT", "created_at REAL", "accessed_at REAL"):
+                self._conn.execute(f"ALTER TABLE entries ADD COLUMN {column}")
+            self._conn.execute(
+                "UPDATE entries SET size = length(CAST(value AS BLOB)), model = json_extract(value, '$.model'), "
+                "created_at = ?, accessed_at = ?",
+                (now, now),
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS lookups (closed_at REAL NOT NULL, hits INTEGER NOT NULL, misses INTEGER NOT NULL)"
+            )
+        if version < 3:
+            # Rows from before this keep their JSON text values and no
+            # prompt_hash; they're read as they are.
+            self._conn.execute("ALTER TABLE entries ADD COLUMN prompt_hash TEXT")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS prompts (hash TEXT PRIMARY KEY, value BLOB NOT NULL) WITHOUT ROWID"
+            )
+        self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._conn.execute("COMMIT")
+
+    def _touch(self, keys: Iterable[str]) -> None:
+        now = time.time()
+        for key in keys:
+            self._touched[key] = now
+        if len(self._touched) >= TOUCH_BATCH:
+            self.flush_access_times()
+
+    def flush_access_times(self) -> None:
+        with self._lock:
+            touched, self._touched = self._touched, {}
+            if touched:
+                self._conn.executemany(
+                    "UPDATE entries SET accessed_at = ? WHERE key = ?",
+                    [(ts, key) for key, ts in touched.items()],
+                )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT e.value, p.value FROM entries e LEFT JOIN prompts p ON p.hash = e.prompt_hash WHERE e.key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._touch([key])
+        return _decode(*row)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Hits only; missing keys are left out."""
+        found: Dict[str, Dict[str, Any]] = {}
+        # Entries for one case across models share a prompt: decode it once.
+        prompts: Dict[str, str] = {}
+        keys = list(keys)
+        for batch in _chunks(keys, _BATCH):
+            marks = ",".join("?" * len(batch))
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT e.key, e.value, e.prompt_hash, p.value FROM entries e "
+                    f"LEFT JOIN prompts p ON p.hash = e.prompt_hash WHERE e.key IN ({marks})",
+                    batch,
+                ).fetchall()
+            for key, value, prompt_hash, prompt in rows:
+                row = decode_row(value)
+                if prompt is not None:
+                    text = prompts.get(prompt_hash)
+                    if text is None:
+                        text = prompts[prompt_hash] = decode_text(prompt)
+                    row["prompt"] = text
+                found[key] = row
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        self._touch(found)
+        return found
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        self.put_many([(key, value)])
+
+    def put_many(self, items: Iterable[Tuple[str, Dict[str, Any]]], *, replace: bool = True) -> int:
+        """
+        Writes all of `items` in one transaction and returns how many rows
+        were written. With replace=False keys already present are left
+        alone (and not counted).
+        """
+        now = time.time()
+        rows = []
+        prompts: Dict[str, bytes] = {}
+        for key, value in items:
+            prompt_hash = None
+            prompt = value.get("prompt")
+            if isinstance(prompt, str) and len(prompt) >= PROMPT_BLOB_MIN:
+                prompt_hash = hashlib.sha256(prompt.encode()).hexdigest()
+                if prompt_hash not in prompts:
+                    prompts[prompt_hash] = encode_text(prompt, self.codec)
+                # Kept as a null so the field order survives the round trip.
+                value = {**value, "prompt": None}
+            blob = encode_row(value, self.codec)
+            rows.append((key, blob, len(blob), value.get("model"), now, now, prompt_hash))
+        if not rows:
+            return 0
+        with self._lock:
+            # One transaction for the lot: one commit instead of one per row.
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany("INSERT OR IGNORE INTO prompts (hash, value) VALUES (?, ?)", prompts.items())
+                written = self._conn.executemany(
+                    f"INSERT OR {'REPLACE' if replace else 'IGNORE'} INTO entries "
+                    "(key, value, size, model, created_at, accessed_at, prompt_hash) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                ).rowcount
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return written
+
+    def iter_entries(
+        self, *, models: Optional[Iterable[str]] = None, batch_size: int = 1000
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Every (key, row), in key order, optionally only for `models`.
+        Read a page at a time, so the lock isn't held while the caller
+        works through them.
+        """
+        where, args = "", []
+        if models is not None:
+            models = list(models)
+            where = f"AND e.model IN ({','.join('?' * len(models))})"
+            args = models
+        after = ""
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT e.key, e.value, p.value FROM entries e LEFT JOIN prompts p ON p.hash = e.prompt_hash "
+                    f"WHERE e.key > ? {where} ORDER BY e.key LIMIT ?",
+                    [after, *args, batch_size],
+                ).fetchall()
+            if not rows:
+                return
+            for key, value, prompt in rows:
+                yield key, _decode(value, prompt)
+            after = rows[-1][0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.execute("DELETE FROM prompts")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def prune(self, *, max_bytes: Optional[int] = None, max_age: Optional[float] = None) -> Tuple[int, int]:
+        """
+        Drops entries not used within `max_age` seconds, then least
+        recently used ones until the entries fit in `max_bytes`. Returns
+        (entries removed, bytes removed). Prompts no entry points to any
+        more go too; their bytes count towards the budget but aren't in
+        the returned total.
+        """
+        self.flush_access_times()
+        removed, freed = 0, 0
+        with self._lock:
+            if max_age is not None:
+                cutoff = time.time() - max_age
+                n, size = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries WHERE accessed_at < ?", (cutoff,)
+                ).fetchone()
+                self._conn.execute("DELETE FROM entries WHERE accessed_at < ?", (cutoff,))
+                removed, freed = removed + n, freed + size
+
+            if max_bytes is not None:
+                total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+                excess = total + self._prompt_bytes() - max_bytes
+                doomed: List[str] = []
+                if excess > 0:
+                    for key, size in self._conn.execute("SELECT key, size FROM entries ORDER BY accessed_at"):
+                        doomed.append(key)
+                        freed += size
+                        excess -= size
+                        if excess <= 0:
+                            break
+                self._conn.execute("BEGIN IMMEDIATE")
+                self._conn.executemany("DELETE FROM entries WHERE key = ?", [(k,) for k in doomed])
+                self._conn.execute("COMMIT")
+                removed += len(doomed)
+
+            if removed:
+                self._conn.execute(
+                    "DELETE FROM prompts WHERE hash NOT IN "
+                    "(SELECT prompt_hash FROM entries WHERE prompt_hash IS NOT NULL)"
+                )
+                # Deleted rows only become free pages; give the space back.
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self._conn.execute("VACUUM")
+        return removed, freed
+
+    def _prompt_bytes(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(length(value)), 0) FROM prompts").fetchone()[0]
+
+    def compact(self, *, batch_size: int = 1000) -> int:
+        """
+        Re-encodes rows still in the old JSON text format, then gives the
+        space back. Returns the number of rows rewritten.
+        """
+        rewritten = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT key, value FROM entries WHERE typeof(value) = 'text' LIMIT ?", (batch_size,)
+                ).fetchall()
+            if not rows:
+                break
+            # put_many would reset access times, which prune relies on.
+            with self._lock:
+                times = dict(
+                    self._conn.execute(
+                        f"SELECT key, accessed_at FROM entries WHERE key IN ({','.join('?' * len(rows))})",
+                        [k for k, _ in rows],
+                    ).fetchall()
+                )
+            rewritten += self.put_many((key, decode_row(value)) for key, value in rows)
+            with self._lock:
+                self._conn.executemany(
+                    "UPDATE entries SET accessed_at = ? WHERE key = ?", [(times[k], k) for k, _ in rows]
+                )
+        if rewritten:
+            with self._lock:
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+                self._conn.execute("VACUUM")
+        return rewritten
+
+    def stats(self, *, recent_runs: int = 10) -> Dict[str, Any]:
+        self.flush_access_times()
+        with self._lock:
+            entries, size, oldest = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), MIN(accessed_at) FROM entries"
+            ).fetchone()
+            by_model = self._conn.execute(
+                "SELECT COALESCE(model, 'unknown'), COUNT(*), COALESCE(SUM(size), 0) FROM entries GROUP BY 1 ORDER BY 1"
+            ).fetchall()
+            runs = self._conn.execute(
+                "SELECT hits, misses FROM lookups ORDER BY closed_at DESC LIMIT ?", (recent_runs,)
+            ).fetchall()
+            prompt_bytes = self._prompt_bytes()
+        hits = sum(h for h, _ in runs)
+        lookups = hits + sum(m for _, m in runs)
+        return {
+            "entries": entries,
+            "bytes": size + prompt_bytes,
+            "prompt_bytes": prompt_bytes,
+            "file_bytes": sum(p.stat().st_size for p in self.path.parent.glob(self.path.name + "*")),
+            "oldest_access_age_s": round(time.time() - oldest, 1) if oldest is not None else None,
+            "recent_runs": len(runs),
+            "recent_hit_rate": round(hits / lookups, 4) if lookups else None,
+            "by_model": {model: {"entries": n, "bytes": b} for model, n, b in by_model},
+        }
+
+    def close(self) -> None:
+        self.flush_access_times()
+        with self._lock:
+            if self.hits or self.misses:
+                self._conn.execute(
+                    "INSERT INTO lookups (closed_at, hits, misses) VALUES (?, ?, ?)",
+                    (time.time(), self.hits, self.misses),
+                )
+            self._conn.close()
+
+
+def _decode(value: Any, prompt: Any) -> Dict[str, Any]:
+    row = decode_row(value)
+    if prompt is not None:
+        row["prompt"] = decode_text(prompt)
+    return row
+
+
+def _chunks(items: List[Any], size: int) -> Iterator[List[Any]]:
+    for i in range(0, len(items), size):
+        yield items[i : i + size]
+
+
+def migrate_json_dir(
+    source: Path, store: CacheStore, *, delete: bool = False, batch_size: int = 1000
+) -> int:
+    """
+    Copies the old one-file-per-key layout (<key>.json) into `store`.
+    Unreadable files are skipped. Returns the number of entries copied.
+    """
+    copied = 0
+    batch: List[Tuple[str, Dict[str, Any]]] = []
+    done_files: List[Path] = []
+
+    def flush() -> None:
+        nonlocal copied
+        copied += store.put_many(batch)
+        if delete:
+            for f in done_files:
+                f.unlink()
+        batch.clear()
+        done_files.clear()
+
+    for f in Path(source).glob("*.json"):
+        try:
+            batch.append((f.stem, json.loads(f.read_text())))
+        except (OSError, ValueError):
+            continue
+        done_files.append(f)
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+    return copied
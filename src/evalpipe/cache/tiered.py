@@ -0,0 +1,166 @@
+"""
+In-process LRU in front of the on-disk store.
+
+Lookups that repeat within a process (matrix cells rendering the same
+request, resumes, re-scoring) are answered from memory without a disk
+read or a JSON parse. Writes go to both tiers (write-through), so the
+disk store is always complete and the memory tier can be dropped at
+any time.
+
+The memory tier is bounded by entry count and by an approximate byte
+size; whichever is hit first evicts the least recently used entry.
+Callers get a shallow copy, since rows get fields added after lookup.
+The memory tier is guarded by a lock so lookups and writes can be run
+off the event loop (see runner.stream_jobs).
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from evalpipe.cache.store import CacheStore
+
+
+def approx_size(value: Dict[str, Any]) -> int:
+    # Close enough to the JSON size for budgeting, without serializing.
+    return sum(len(k) + len(str(v)) + 4 for k, v in value.items())
+
+
+class TieredCache:
+    def __init__(self, store: CacheStore, *, max_entries: int = 10_000, max_bytes: int = 64 * 1024**2) -> None:
+        self.store = store
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._memory: "OrderedDict[str, Tuple[Dict[str, Any], int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+
+        self.memory_hits = 0
+        self.memory_misses = 0
+        self.evictions = 0
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self.disk_writes = 0
+
+    def remember(self, key: str, value: Dict[str, Any]) -> None:
+        """Memory tier only."""
+        if self.max_entries <= 0:
+            return
+        size = approx_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._memory.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._memory[key] = (value, size)
+            self._bytes += size
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._memory and (len(self._memory) > self.max_entries or self._bytes > self.max_bytes):
+            _, (_, evicted) = self._memory.popitem(last=False)
+            self._bytes -= evicted
+            self.evictions += 1
+
+    def recall(self, key: str, count: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Memory tier only. count=False is for a second look at a key that
+        has already been counted as a miss (a re-check after a bulk
+        prefetch): a miss isn't counted again, and a hit turns that miss
+        into a hit, so it's still one lookup either way.
+        """
+        with self._lock:
+            hit = self._memory.get(key)
+            if hit is None:
+                if count:
+                    self.memory_misses += 1
+                return None
+            self._memory.move_to_end(key)
+            if not count:
+                self.memory_misses -= 1
+            self.memory_hits += 1
+            return dict(hit[0])
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self.recall(key)
+        if value is not None:
+            return value
+        value = self.store.get(key)
+        with self._lock:
+            if value is None:
+                self.disk_misses += 1
+                return None
+            self.disk_hits += 1
+        self.remember(key, value)
+        return dict(value)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        found: Dict[str, Dict[str, Any]] = {}
+        missing = []
+        for key in keys:
+            value = self.recall(key)
+            if value is None:
+                missing.append(key)
+            else:
+                found[key] = value
+        if missing:
+            from_disk = self.store.get_many(missing)
+            with self._lock:
+                self.disk_hits += len(from_disk)
+                self.disk_misses += len(missing) - len(from_disk)
+            for key, value in from_disk.items():
+                self.remember(key, value)
+                found[key] = dict(value)
+        return found
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        self.put_many([(key, value)])
+
+    def put_many(self, items: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        items = list(items)
+        for key, value in items:
+            self.remember(key, dict(value))
+        return self.write_through(items)
+
+    def write_through(self, items: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """Disk tier only."""
+        written = self.store.put_many(items)
+        with self._lock:
+            self.disk_writes += written
+        return written
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._bytes = 0
+        self.store.clear()
+
+    def resize(self, *, max_entries: int, max_bytes: int) -> None:
+        with self._lock:
+            self.max_entries = max_entries
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "memory": {
+                "hits": self.memory_hits,
+                "misses": self.memory_misses,
+                "entries": len(self._memory),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+            },
+            "disk": {
+                "hits": self.disk_hits,
+                "misses": self.disk_misses,
+                "writes": self.disk_writes,
+            },
+        }
+
+    def close(self) -> None:
+        self.store.close()
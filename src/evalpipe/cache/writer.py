@@ -0,0 +1,76 @@
+"""
+Write-behind for cache rows.
+
+save_to_cache() is a synchronous SQLite write; called from run_single
+it stalls every coroutine on the loop for the length of a commit.
+CacheWriter.put() returns at once instead: the row goes into the memory
+tier right away (so later lookups in this process see it) and is queued
+for disk. Queued rows are written in one transaction per batch, on a
+worker thread, once `batch_size` are waiting or after `max_wait_ms`.
+
+Call aclose() before the loop goes away; rows still queued then are
+written out. A crash can lose the last batch, which for a cache just
+means paying for those calls again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from evalpipe.cache.tiered import TieredCache
+
+
+class CacheWriter:
+    def __init__(self, cache: TieredCache, *, batch_size: int = 256, max_wait_ms: float = 50.0) -> None:
+        self.cache = cache
+        self.batch_size = batch_size
+        self.max_wait_ms = max_wait_ms
+
+        self._pending: List[Tuple[str, Dict[str, Any]]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._writing: Set[asyncio.Future] = set()
+
+        self.batches = 0
+        self.rows = 0
+        self.failed_batches = 0
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        # Snapshot now: the caller keeps adding fields to its row (the
+        # pipeline tags rendered_prompt and prompt_version on), and the
+        # disk write happens later, on another thread. Neither tier
+        # hands this dict out, so one copy serves both.
+        row = dict(value)
+        self.cache.remember(key, row)
+        self._pending.append((key, row))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_wait_ms / 1000.0, self._flush)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        self.batches += 1
+        self.rows += len(batch)
+        fut = asyncio.get_running_loop().run_in_executor(None, self.cache.write_through, batch)
+        self._writing.add(fut)
+        fut.add_done_callback(self._done)
+
+    def _done(self, fut: asyncio.Future) -> None:
+        self._writing.discard(fut)
+        if fut.cancelled() or fut.exception() is not None:
+            # Losing a batch of cache rows isn't worth failing the run over.
+            self.failed_batches += 1
+
+    async def aclose(self) -> None:
+        self._flush()
+        if self._writing:
+            await asyncio.gather(*self._writing, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"batches": self.batches, "rows": self.rows, "failed_batches": self.failed_batches}
@@ -1,102 +1,515 @@
 from pathlib import Path
 from datetime import datetime, timezone
 import json
+import re
 import sys
 import typer
 import shutil
 
-from evalpipe.loader import load_suite
-from evalpipe.prompts.render import render_prompt
-from evalpipe.runner import run as run_single
-from evalpipe.evaluators import evaluate
-from evalpipe.aggregate import aggregate_results
-from evalpipe.storage import write_run_artifacts
-from evalpipe.report import generate_markdown_report
-from evalpipe.compare import compare_runs
-from evalpipe.evaluators.judge import run_judge
+from evalpipe.cache import simple_cache
+from evalpipe.cache.bundle import BundleError, export_bundle, import_bundle
+from evalpipe.cache.store import migrate_json_dir, parse_age, parse_size
+from evalpipe.concurrency import AdaptiveLimiter
+from evalpipe.early_stop import REGRESSION, EarlyStopper, shuffled
+from evalpipe.hedging import Hedger
+from evalpipe.history import FAILED, FLAKY, load_priorities, prioritized
+from evalpipe.loader import iter_suite
+from evalpipe.pipeline import EVAL_EXECUTORS, Cell, merge_runs, rebuild_from_artifacts, run_cells
+from evalpipe.prompts.render import load_template
+from evalpipe.storage import load_progress, recover_run_rows, write_run_artifacts
+from evalpipe.report import generate_markdown_report, generate_matrix_report
+from evalpipe.compare import compare_summaries
+from evalpipe.sharding import select_shard, shard_tag
+from evalpipe.providers import PROVIDERS, BatchingProvider, get_provider
+from evalpipe.ratelimit import RateLimits
 
 app = typer.Typer()
+cache_app = typer.Typer(help="Maintain the response cache.")
+app.add_typer(cache_app, name="cache")
 
 
 @app.command()
 def clear_cache():
+    simple_cache.close_stores()
     shutil.rmtree(".cache", ignore_errors=True)
     typer.echo("Cache cleared")
 
 
-@app.command()
-def run(
-    suite: Path,
-    prompt: Path = typer.Option(...),
-    model: str = typer.Option("dummy-v0"),
-    baseline: Path | None = typer.Option(None),
+@cache_app.command("migrate")
+def cache_migrate(
+    source: Path = typer.Option(Path(".cache"), help="Directory holding the old <key>.json cache files."),
+    delete: bool = typer.Option(False, help="Remove each JSON file once it's been copied."),
 ):
-    run_id = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-    run_dir = Path("runs") / run_id
-    run_dir.mkdir(parents=True, exist_ok=True)
+    """
+    Moves the old one-file-per-key cache into the single-file store.
+    """
+    if not source.is_dir():
+        raise typer.BadParameter(f"{source} is not a directory")
+    copied = migrate_json_dir(source, simple_cache.get_store(), delete=delete)
+    typer.echo(f"Migrated {copied} entries into {simple_cache.get_store().path}")
+
 
-    test_cases = load_suite(suite)
+def _cache_limits(max_size: str | None, older_than: str | None) -> dict:
+    try:
+        return {
+            "max_bytes": parse_size(max_size) if max_size else None,
+            "max_age": parse_age(older_than) if older_than else None,
+        }
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
 
-    results: list[dict] = []
-    evaluations: list[dict] = []
 
-    for tc in test_cases:
-        rendered_prompt = render_prompt(prompt, tc)
+def _fmt_bytes(n: float) -> str:
+    if n < 1024:
+        return f"{int(n)} B"
+    for unit in ("KB", "MB"):
+        n /= 1024
+        if n < 1024:
+            return f"{n:.1f} {unit}"
+    return f"{n / 1024:.1f} GB"
 
-        tc_for_runner = dict(tc)
-        tc_for_runner["prompt"] = rendered_prompt
 
-        result_obj = run_single(tc_for_runner)
+@cache_app.command("stats")
+def cache_stats(
+    as_json: bool = typer.Option(False, "--json", help="Print the raw stats as JSON."),
+):
+    """
+    Entries, size, recent hit rate and a per-model breakdown.
+    """
+    stats = simple_cache.get_store().stats()
+    simple_cache.close_stores()
+    if as_json:
+        typer.echo(json.dumps(stats, indent=2))
+        return
+    typer.echo(f"Entries: {stats['entries']}")
+    typer.echo(
+        f"Size: {_fmt_bytes(stats['bytes'])} in entries ({_fmt_bytes(stats['prompt_bytes'])} of it shared prompts), "
+        f"{_fmt_bytes(stats['file_bytes'])} on disk"
+    )
+    if stats["recent_hit_rate"] is not None:
+        typer.echo(f"Hit rate (last {stats['recent_runs']} runs): {stats['recent_hit_rate']:.1%}")
+    for model, row in stats["by_model"].items():
+        typer.echo(f"  {model}: {row['entries']} entries, {_fmt_bytes(row['bytes'])}")
 
-        provider_out = result_obj.provider_output
 
-        result = {
-            "id": tc["id"],
-            "prompt": rendered_prompt,
-            "output": provider_out.output,
-            "model": provider_out.model,
-            "latency_ms": provider_out.latency_ms,
-            "prompt_tokens": provider_out.prompt_tokens,
-            "completion_tokens": provider_out.completion_tokens,
-            "cache_hit": False,
-            "timestamp": result_obj.timestamp,
-            "rendered_prompt": rendered_prompt,
-            "prompt_version": prompt.stem,
-        }
+@cache_app.command("prune")
+def cache_prune(
+    max_size: str | None = typer.Option(None, help="Evict least recently used entries until the cache fits, e.g. 500MB."),
+    older_than: str | None = typer.Option(None, help="Drop entries not used for this long, e.g. 7d or 12h."),
+):
+    """
+    Shrinks the cache to a size and/or age budget.
+    """
+    limits = _cache_limits(max_size, older_than)
+    if limits["max_bytes"] is None and limits["max_age"] is None:
+        raise typer.BadParameter("Give --max-size and/or --older-than")
+    removed, freed = simple_cache.get_store().prune(**limits)
+    simple_cache.close_stores()
+    typer.echo(f"Removed {removed} entries ({_fmt_bytes(freed)})")
+
+
+@cache_app.command("compact")
+def cache_compact():
+    """
+    Rewrites entries from older versions in the compact format.
+    """
+    before = simple_cache.get_store().stats()["file_bytes"]
+    rewritten = simple_cache.get_store().compact()
+    after = simple_cache.get_store().stats()["file_bytes"]
+    simple_cache.close_stores()
+    typer.echo(f"Rewrote {rewritten} entries; {_fmt_bytes(before)} -> {_fmt_bytes(after)} on disk")
+
+
+@cache_app.command("export")
+def cache_export(
+    output: Path = typer.Option(..., "--output", "-o", help="Bundle file to write, e.g. cache-bundle.jsonl.gz."),
+    suite: list[Path] | None = typer.Option(None, help="Only entries for this suite's cases. Repeatable."),
+    model: list[str] | None = typer.Option(None, help="Only entries for this model. Repeatable."),
+):
+    """
+    Writes cache entries to one compressed, checksummed bundle.
+    """
+    test_ids = None
+    if suite:
+        test_ids = {tc["id"] for s in suite for tc in iter_suite(s)}
+    count = export_bundle(simple_cache.get_store(), output, models=model or None, test_ids=test_ids)
+    simple_cache.close_stores()
+    typer.echo(f"Exported {count} entries to {output} ({_fmt_bytes(output.stat().st_size)})")
+
+
+@cache_app.command("import")
+def cache_import(
+    bundle: Path = typer.Argument(..., help="Bundle written by `evalpipe cache export`."),
+):
+    """
+    Merges a bundle into the cache. Entries already cached are skipped.
+    """
+    if not bundle.is_file():
+        raise typer.BadParameter(f"{bundle} is not a file")
+    try:
+        imported, skipped = import_bundle(simple_cache.get_store(), bundle)
+    except BundleError as e:
+        typer.echo(f"Import failed: {e}", err=True)
+        raise typer.Exit(code=1)
+    finally:
+        simple_cache.close_stores()
+    typer.echo(f"Imported {imported} entries ({skipped} already cached)")
 
-        results.append(result)
 
-        eval_out = evaluate(tc, result, judge_runner=run_judge)
-        eval_out["id"] = tc["id"]
-        evaluations.append(eval_out)
+def _resolve_resume(resume: Path, given: dict) -> dict:
+    """
+    Loads a previous run's progress manifest and refuses to continue it
+    with settings that differ from the original ones. Settings left as
+    None are taken from the manifest.
+    """
+    try:
+        progress = load_progress(resume)
+    except FileNotFoundError:
+        raise typer.BadParameter(f"{resume} has no progress.json to resume from")
 
-    summary = aggregate_results(test_cases, results, evaluations)
+    for key, value in given.items():
+        if value is not None and value != progress.get(key):
+            raise typer.BadParameter(
+                f"--resume: {key} '{value}' does not match the original run ('{progress.get(key)}')"
+            )
+
+    return progress
+
+
+def _cell_dirname(model: str, prompt: Path, taken: set[str]) -> str:
+    name = re.sub(r"[^A-Za-z0-9._-]+", "-", f"{model}__{prompt.stem}")
+    base, n = name, 2
+    while name in taken:
+        name = f"{base}-{n}"
+        n += 1
+    taken.add(name)
+    return name
+
+
+def _finish_run(
+    cell: Cell,
+    *,
+    suite: Path,
+    meta_extra: dict,
+    baseline: Path | None,
+) -> tuple[dict, bool]:
+    """
+    Writes summary/meta/report for one finished run directory and checks
+    it against the baseline. Returns (summary, regression_detected).
+    """
+    run_id = cell.progress["run_id"]
+    aggregator = cell.aggregator
+
+    summary = aggregator.summary()
     summary["run_id"] = run_id
+    stopper = cell.early_stop
+    if stopper is not None:
+        summary["early_stop"] = {
+            "stopped": stopper.settled,
+            "evaluated": aggregator.total,
+            **stopper.stats(),
+        }
+    if meta_extra["stages"]["max_failures"]["limit"] is not None:
+        summary["max_failures"] = meta_extra["stages"]["max_failures"]
+    hedging = meta_extra["stages"]["inference"].get("hedging") or {}
+    if cell.model in hedging:
+        summary["hedging"] = hedging[cell.model]
 
-    write_run_artifacts(
-        run_dir=run_dir,
-        test_cases=test_cases,
-        results=results,
-        evaluations=evaluations,
-        summary=summary,
-    )
+    template = load_template(cell.prompt_path)
+    meta = {
+        "run_id": run_id,
+        "suite": str(suite),
+        "model": cell.model,
+        "prompt_version": cell.prompt_path.stem,
+        "prompt_hash": template.prompt_hash,
+        "prompt_fields": sorted(template.fields),
+        **meta_extra,
+    }
+
+    write_run_artifacts(run_dir=cell.run_dir, summary=summary, meta=meta)
 
     comparison = None
     regression_detected = False
 
     if baseline:
         baseline_summary = json.loads((baseline / "summary.json").read_text())
-        comparison = compare_runs(baseline_summary, summary)
+        comparison = compare_summaries(baseline_summary, summary)
 
+        if stopper is not None and stopper.settled:
+            # A stopped run's pass rate is a sample; trust the verdict.
+            regression_detected = stopper.verdict == REGRESSION
         # Treat any drop in pass rate as regression
-        if comparison.get("pass_rate_delta", 0) < 0:
+        elif comparison["pass_rate_delta"] < 0:
             regression_detected = True
 
-    generate_markdown_report(run_dir, summary, comparison)
+    generate_markdown_report(cell.run_dir, summary, comparison)
 
-    typer.echo(f"Run written to {run_dir}")
-    typer.echo(f"Pass rate: {summary['pass_rate']:.2f}%")
+    typer.echo(f"Run written to {cell.run_dir}")
+    typer.echo(f"Pass rate: {summary['pass_rate']:.2%}")
+    if stopper is not None and stopper.settled:
+        typer.echo(f"Stopped early after {aggregator.total} cases: {stopper.verdict}")
     typer.echo(f"Estimated cost (USD): ${summary['estimated_cost']}")
+    if aggregator.errors:
+        typer.echo(f"Inference errors: {aggregator.errors}")
+
+    return summary, regression_detected
+
+
+@app.command()
+def run(
+    suite: Path | None = typer.Argument(None, help="Suite JSONL (optional with --resume)."),
+    prompt: list[Path] | None = typer.Option(None, help="Prompt template. Repeat for a matrix run (optional with --resume)."),
+    model: list[str] | None = typer.Option(None, help="Model name. Repeat for a matrix run. Defaults to dummy-v0."),
+    baseline: Path | None = typer.Option(None),
+    max_concurrency: int = typer.Option(10, min=1, help="Max in-flight inference calls (shared across matrix cells)."),
+    adaptive_concurrency: bool = typer.Option(False, help="Let the in-flight limit float between --min-concurrency and --max-concurrency (AIMD)."),
+    min_concurrency: int = typer.Option(1, min=1, help="Floor for --adaptive-concurrency."),
+    batch_size: int = typer.Option(1, min=1, help="Group up to N concurrent calls into one provider batch request (1 = off)."),
+    batch_wait_ms: float = typer.Option(10.0, min=0.0, help="Longest a call waits for its batch to fill."),
+    hedge: bool = typer.Option(False, help="Duplicate calls still running past the model's p95 latency; first answer wins."),
+    hedge_max_extra: float = typer.Option(0.05, min=0.0, max=1.0, help="Cap on hedged calls as a fraction of all calls."),
+    stream: bool = typer.Option(False, help="Stream completions and record time-to-first-token, inter-token latency and tokens/sec."),
+    coalesce: bool = typer.Option(True, help="Share one provider call between cases that send the exact same request."),
+    rate_limit: bool = typer.Option(True, help="Throttle provider calls to the per-model RPM/TPM quotas in pricing.MODEL_RATE_LIMITS."),
+    eval_executor: str = typer.Option("thread", help=f"Where evaluators run: {', '.join(EVAL_EXECUTORS)}."),
+    eval_workers: int = typer.Option(2, min=1, help="Thread/process pool size for evaluation."),
+    eval_chunk_size: int = typer.Option(64, min=1, help="Cases handed to an evaluation worker at once."),
+    resume: Path | None = typer.Option(None, help="Continue an interrupted run, e.g. runs/<id>."),
+    num_shards: int | None = typer.Option(None, min=1, help="Split the suite into N shards (by case id hash)."),
+    shard_index: int | None = typer.Option(None, min=0, help="Which shard this process runs (0-based)."),
+    provider: str = typer.Option("dummy", help=f"Inference backend: {', '.join(sorted(PROVIDERS))}. The openai provider reads OPENAI_BASE_URL / OPENAI_API_KEY."),
+    early_stop: bool = typer.Option(False, help="Run cases in shuffled order and stop once the pass rate is confidently above or below --baseline."),
+    early_stop_confidence: float = typer.Option(0.95, min=0.5, max=0.9999, help="Confidence required before --early-stop stops."),
+    early_stop_margin: float = typer.Option(0.0, min=0.0, max=1.0, help="Pass-rate drop --early-stop tolerates when calling a run regression-free."),
+    seed: int = typer.Option(0, help="Shuffle seed for --early-stop."),
+    prioritize_failures: list[Path] | None = typer.Option(None, help="Previous run dir (or its evaluations.jsonl) whose failures run first. Repeat, newest first, to also pull flaky cases forward."),
+    max_failures: int | None = typer.Option(None, min=1, help="Cancel outstanding work once this many cases have failed."),
+    cache_max_size: str | None = typer.Option(None, help="After the run, evict least recently used cache entries beyond this size, e.g. 2GB."),
+    cache_max_age: str | None = typer.Option(None, help="After the run, drop cache entries not used for this long, e.g. 14d."),
+    cache_memory_entries: int = typer.Option(10_000, min=0, help="Cache entries kept in memory in front of the disk cache (0 = off)."),
+    cache_memory_mb: float = typer.Option(64.0, min=0.0, help="Memory budget for those entries, in MB."),
+    cache_compression: str = typer.Option("zlib", help="Codec for new cache entries: none, zlib or zstd (needs the zstandard package)."),
+    cache_key: str = typer.Option("exact", help="exact: reuse responses for the same suite and case id. content: also reuse them for any case sending the same (normalized) prompt to the same model."),
+):
+    if eval_executor not in EVAL_EXECUTORS:
+        raise typer.BadParameter(f"--eval-executor must be one of {', '.join(EVAL_EXECUTORS)}")
+    if provider not in PROVIDERS:
+        raise typer.BadParameter(f"--provider must be one of {', '.join(sorted(PROVIDERS))}")
+    if adaptive_concurrency and min_concurrency > max_concurrency:
+        raise typer.BadParameter("--min-concurrency can't be above --max-concurrency")
+    cache_limits = _cache_limits(cache_max_size, cache_max_age)
+    try:
+        simple_cache.set_compression(cache_compression)
+    except ValueError as e:
+        raise typer.BadParameter(str(e))
+    if cache_key not in simple_cache.KEY_MODES:
+        raise typer.BadParameter(f"--cache-key must be one of {', '.join(simple_cache.KEY_MODES)}")
+    if early_stop:
+        if baseline is None:
+            raise typer.BadParameter("--early-stop needs a --baseline to compare against")
+        # The stop decision lives in memory and covers the whole suite.
+        if resume or (num_shards or 1) > 1:
+            raise typer.BadParameter("--early-stop can't be combined with --resume or sharding")
+        if prioritize_failures:
+            raise typer.BadParameter("--early-stop needs a random case order; drop --prioritize-failures")
+    # `evalpipe merge` k-way merges shards by suite index, so every shard
+    # has to be written in suite order.
+    shard_order_error = "--prioritize-failures reorders cases, so it can't be combined with sharding"
+    if prioritize_failures and (num_shards or 1) > 1:
+        raise typer.BadParameter(shard_order_error)
+
+    models = list(model or [])
+    prompts = list(prompt or [])
+    done_ids: set[str] = set()
+    matrix_dir: Path | None = None
+
+    if resume:
+        if len(models) > 1 or len(prompts) > 1:
+            raise typer.BadParameter(
+                "--resume continues a single run directory; resume matrix cells one at a time"
+            )
+        progress = _resolve_resume(
+            resume,
+            {
+                "suite": str(suite) if suite else None,
+                "prompt": str(prompts[0]) if prompts else None,
+                "model": models[0] if models else None,
+                "num_shards": num_shards,
+                "shard_index": shard_index,
+            },
+        )
+        suite = Path(progress["suite"])
+        num_shards = progress.get("num_shards", 1)
+        shard_index = progress.get("shard_index", 0)
+        if prioritize_failures and num_shards > 1:
+            raise typer.BadParameter(shard_order_error)
+
+        # Only cases that reached all three artifact files count as done;
+        # anything after that is trimmed and paid for again.
+        completed = recover_run_rows(resume)
+        aggregator, done_ids = rebuild_from_artifacts(resume)
+        typer.echo(f"Resuming {resume}: {completed} cases already done")
+
+        cells = [
+            Cell(
+                model=progress["model"],
+                prompt_path=Path(progress["prompt"]),
+                run_dir=resume,
+                aggregator=aggregator,
+                resume=True,
+                progress=progress,
+            )
+        ]
+    else:
+        if suite is None or not prompts:
+            raise typer.BadParameter("SUITE and --prompt are required unless --resume is given")
+        models = models or ["dummy-v0"]
+        num_shards = num_shards or 1
+        shard_index = shard_index or 0
+        if shard_index >= num_shards:
+            raise typer.BadParameter(f"--shard-index must be below --num-shards ({num_shards})")
+
+        run_id = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+        if num_shards > 1:
+            # Shards of one suite usually start in the same second.
+            run_id = f"{run_id}_{shard_tag(num_shards, shard_index)}"
+        base_dir = Path("runs") / run_id
+
+        # More than one model or prompt: one run directory per cell under
+        # runs/<id>/, plus a matrix summary next to them.
+        if len(models) * len(prompts) > 1:
+            matrix_dir = base_dir
+
+        cells = []
+        taken: set[str] = set()
+        for p in prompts:
+            for m in models:
+                cell_dir = base_dir
+                cell_id = run_id
+                if matrix_dir is not None:
+                    name = _cell_dirname(m, p, taken)
+                    cell_dir = base_dir / name
+                    cell_id = f"{run_id}/{name}"
+                cell_dir.mkdir(parents=True, exist_ok=True)
+                cells.append(
+                    Cell(
+                        model=m,
+                        prompt_path=p,
+                        run_dir=cell_dir,
+                        progress={
+                            "run_id": cell_id,
+                            "suite": str(suite),
+                            "prompt": str(p),
+                            "model": m,
+                            "num_shards": num_shards,
+                            "shard_index": shard_index,
+                        },
+                    )
+                )
+
+    def suite_cases():
+        return select_shard(enumerate(iter_suite(suite)), num_shards, shard_index)
+
+    cases = suite_cases()
+    priorities: dict = {}
+    if prioritize_failures:
+        priorities = load_priorities(list(prioritize_failures))
+        cases = prioritized(suite_cases, priorities)
+    if early_stop:
+        baseline_summary = json.loads((baseline / "summary.json").read_text())
+        cases = shuffled(cases, seed)
+        for cell in cells:
+            cell.early_stop = EarlyStopper(
+                baseline_summary, confidence=early_stop_confidence, margin=early_stop_margin
+            )
+    if done_ids:
+        cases = ((i, tc) for i, tc in cases if tc["id"] not in done_ids)
+
+    # Batched calls to an OpenAI-compatible server go through the
+    # multi-prompt /completions endpoint.
+    provider_options = {"batch_completions": True} if batch_size > 1 and provider == "openai" else {}
+    backend = get_provider(provider, **provider_options)
+    if batch_size > 1:
+        backend = BatchingProvider(backend, max_batch_size=batch_size, max_wait_ms=batch_wait_ms)
+
+    simple_cache.set_memory_budget(cache_memory_entries, int(cache_memory_mb * 1024**2))
+    simple_cache.set_key_mode(cache_key)
+
+    # Cases stream straight off the suite file (once, however many cells
+    # there are); rows are appended to each cell's run directory as they
+    # finish and folded into its summary on the fly.
+    stages = run_cells(
+        indexed_cases=cases,
+        suite_id=suite.stem,
+        cells=cells,
+        max_concurrency=max_concurrency,
+        eval_executor=eval_executor,
+        eval_workers=eval_workers,
+        eval_chunk_size=eval_chunk_size,
+        provider=backend,
+        limiter=(
+            AdaptiveLimiter(floor=min_concurrency, ceiling=max_concurrency)
+            if adaptive_concurrency
+            else None
+        ),
+        # Quotas belong to a provider account; the dummy has none.
+        rate_limits=RateLimits() if rate_limit and provider != "dummy" else None,
+        coalesce=coalesce,
+        hedger=Hedger(max_extra_fraction=hedge_max_extra) if hedge else None,
+        stream=stream,
+        max_failures=max_failures,
+    )
+    if cache_max_size or cache_max_age:
+        removed, _ = simple_cache.get_store().prune(**cache_limits)
+        if removed:
+            typer.echo(f"Pruned {removed} cache entries")
+    simple_cache.close_stores()
+
+    meta_extra = {
+        "max_concurrency": max_concurrency,
+        "shard": {"index": shard_index, "count": num_shards},
+        "resumed_cases": len(done_ids),
+        "cache_key": cache_key,
+        "stages": stages,
+    }
+    if matrix_dir is not None:
+        meta_extra["matrix"] = str(matrix_dir)
+    if prioritize_failures:
+        meta_extra["prioritized"] = {
+            "from": [str(p) for p in prioritize_failures],
+            "failed": sum(1 for v in priorities.values() if v == FAILED),
+            "flaky": sum(1 for v in priorities.values() if v == FLAKY),
+        }
+
+    regression_detected = False
+    matrix_rows = []
+    for cell in cells:
+        summary, regressed = _finish_run(
+            cell, suite=suite, meta_extra=meta_extra, baseline=baseline
+        )
+        regression_detected = regression_detected or regressed
+        matrix_rows.append(
+            {
+                "model": cell.model,
+                "prompt_version": cell.prompt_path.stem,
+                "run_dir": str(cell.run_dir),
+                **{
+                    k: summary[k]
+                    for k in ("total_tests", "passed", "failed", "pass_rate", "avg_latency_ms", "estimated_cost")
+                },
+            }
+        )
+
+    if matrix_dir is not None:
+        (matrix_dir / "matrix.json").write_text(
+            json.dumps({"run_id": matrix_dir.name, "stages": stages, "cells": matrix_rows}, indent=2)
+        )
+        generate_matrix_report(matrix_dir, matrix_rows)
+        typer.echo(f"Matrix summary written to {matrix_dir / 'matrix.md'}")
+
+    if stages["max_failures"]["reached"]:
+        typer.echo(f"Stopped after {max_failures} failures; remaining cases were not run.")
+        raise typer.Exit(code=1)
 
     if regression_detected:
         typer.echo("Regression detected compared to baseline.")
@@ -105,5 +518,79 @@ def run(
     raise typer.Exit(code=0)
 
 
+@app.command()
+def merge(
+    run_dirs: list[Path] = typer.Argument(..., help="Shard run directories to combine."),
+    output: Path | None = typer.Option(None, help="Where to write the merged run. Defaults to runs/<id>_merged."),
+):
+    """
+    Combines the shards of one suite into a single run directory.
+    """
+    manifests = [_load_shard_manifest(d) for d in run_dirs]
+
+    counts = {m.get("num_shards", 1) for m in manifests}
+    if len(counts) != 1:
+        raise typer.BadParameter("Shards were run with different --num-shards")
+    num_shards = counts.pop()
+
+    indexes = sorted(m.get("shard_index", 0) for m in manifests)
+    if indexes != list(range(num_shards)):
+        raise typer.BadParameter(
+            f"Expected shards 0..{num_shards - 1} exactly once, got {indexes}"
+        )
+
+    for key in ("suite", "prompt", "model"):
+        if len({m.get(key) for m in manifests}) != 1:
+            raise typer.BadParameter(f"Shards disagree on {key}")
+
+    first = manifests[0]
+    run_id = f"{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}_merged"
+    run_dir = output or Path("runs") / run_id
+    if output:
+        run_id = output.name
+
+    aggregator = merge_runs(
+        run_dirs,
+        run_dir,
+        progress={
+            "run_id": run_id,
+            "suite": first["suite"],
+            "prompt": first["prompt"],
+            "model": first["model"],
+            "merged_from": [str(d) for d in run_dirs],
+        },
+    )
+
+    summary = aggregator.summary()
+    summary["run_id"] = run_id
+
+    shard_meta = [json.loads((d / "meta.json").read_text()) for d in run_dirs]
+    meta = {
+        "run_id": run_id,
+        "suite": first["suite"],
+        "model": first["model"],
+        "prompt_version": shard_meta[0].get("prompt_version"),
+        "prompt_hash": shard_meta[0].get("prompt_hash"),
+        "prompt_fields": shard_meta[0].get("prompt_fields"),
+        "merged_from": [str(d) for d in run_dirs],
+        "shards": [m.get("stages") for m in shard_meta],
+    }
+    write_run_artifacts(run_dir=run_dir, summary=summary, meta=meta)
+    generate_markdown_report(run_dir, summary)
+
+    typer.echo(f"Merged {len(run_dirs)} shards into {run_dir}")
+    typer.echo(f"Pass rate: {summary['pass_rate']:.2%}")
+
+
+def _load_shard_manifest(run_dir: Path) -> dict:
+    try:
+        progress = load_progress(run_dir)
+    except FileNotFoundError:
+        raise typer.BadParameter(f"{run_dir} is not a run directory (no progress.json)")
+    if progress.get("status") != "complete":
+        raise typer.BadParameter(f"{run_dir} did not finish; resume it before merging")
+    return progress
+
+
 if __name__ == "__main__":
     app()
\ No newline at end of file
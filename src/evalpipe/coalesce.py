@@ -0,0 +1,115 @@
+"""
+Content-addressed request coalescing.
+
+The on-disk cache is keyed per (suite, test id), so two cases that
+render to the same prompt still pay for two provider calls, even when
+they're in flight at the same moment. The coalescer sits in front of the
+provider and is keyed on what the provider actually sees: model,
+rendered prompt and params.
+
+- Identical requests that overlap share one in-flight call.
+- Finished responses stay in a bounded LRU for the rest of the process,
+  so later cases (other test ids, other suites, other matrix cells on
+  the same model) reuse them.
+
+Only the provider response is shared; each case still gets its own
+record (id, timestamp, latency) and its own cache entry.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+# Responses kept after they finish. Entries are small (output text plus
+# token counts), so this is a few MB at most.
+DEFAULT_MAX_ENTRIES = 10_000
+
+# Where a coalesced response came from.
+CALLED = "call"
+IN_FLIGHT = "in_flight"
+MEMO = "memo"
+
+
+def request_key(model: str, prompt: str, params: Dict[str, Any]) -> str:
+    raw = json.dumps(
+        {"model": model, "prompt": prompt, "params": params},
+        sort_keys=True,
+        separators=(",", ":"),
+    ).encode()
+    return hashlib.sha256(raw).hexdigest()
+
+
+class RequestCoalescer:
+    def __init__(self, max_entries: Optional[int] = None) -> None:
+        self.max_entries = DEFAULT_MAX_ENTRIES if max_entries is None else max_entries
+        self._in_flight: Dict[str, Tuple[asyncio.Future, list]] = {}
+        self._done: "OrderedDict[str, Any]" = OrderedDict()
+
+        self.calls = 0
+        self.in_flight_hits = 0
+        self.memo_hits = 0
+
+    async def run(
+        self,
+        key: str,
+        call: Callable[[], Awaitable[Any]],
+        *,
+        keep: Callable[[Any], bool] = lambda _: True,
+    ) -> Tuple[Any, str]:
+        """
+        Returns (value, source). `call` runs only if nobody else has the
+        same key in flight or memoized; values failing `keep` (errors)
+        are shared with whoever was already waiting but not memoized.
+        """
+        if key in self._done:
+            self._done.move_to_end(key)
+            self.memo_hits += 1
+            return self._done[key], MEMO
+
+        if key in self._in_flight:
+            task, waiters = self._in_flight[key]
+            self.in_flight_hits += 1
+            source = IN_FLIGHT
+        else:
+            task = asyncio.ensure_future(call())
+            waiters = [0]
+            self._in_flight[key] = (task, waiters)
+            task.add_done_callback(lambda t: self._finish(key, t, keep))
+            self.calls += 1
+            source = CALLED
+
+        waiters[0] += 1
+        try:
+            # shield: one waiter getting cancelled mustn't cancel the call
+            # for everyone else sharing it.
+            value = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done() and waiters[0] == 1:
+                task.cancel()
+            raise
+        finally:
+            waiters[0] -= 1
+        return value, source
+
+    def _finish(self, key: str, task: asyncio.Future, keep: Callable[[Any], bool]) -> None:
+        self._in_flight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        value = task.result()
+        if not keep(value):
+            return
+        self._done[key] = value
+        if len(self._done) > self.max_entries:
+            self._done.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "provider_calls": self.calls,
+            "in_flight_hits": self.in_flight_hits,
+            "memo_hits": self.memo_hits,
+            "memo_entries": len(self._done),
+        }
@@ -35,3 +35,19 @@ def compare_runs(current_run: Path, baseline_run: Path) -> Dict[str, Any]:
         },
     }
 
+
+
+def compare_summaries(baseline: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Headline deltas (current - baseline) between two summary.json dicts,
+    in the shape the markdown report expects.
+    """
+    def delta(key: str) -> float:
+        return float(current.get(key, 0.0) or 0.0) - float(baseline.get(key, 0.0) or 0.0)
+
+    return {
+        "baseline_run": baseline.get("run_id"),
+        "pass_rate_delta": delta("pass_rate"),
+        "estimated_cost_delta": delta("estimated_cost"),
+        "avg_latency_ms_delta": delta("avg_latency_ms"),
+    }
@@ -0,0 +1,199 @@
+"""
+In-flight request limiters.
+
+FixedLimiter is the old asyncio.Semaphore(max_concurrency) behind the
+limiter interface. AdaptiveLimiter does AIMD (the TCP congestion control
+idea): grow the limit while calls are fast and clean, cut it hard on
+timeouts, 429s or a latency blowup, and stay within [floor, ceiling].
+
+The runner reports every provider attempt through record(), so a 429
+that later succeeds on retry still counts as a congestion signal.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+# Outcomes reported by the runner for each provider attempt.
+OK = "ok"
+TIMEOUT = "timeout"
+RATE_LIMITED = "rate_limited"
+ERROR = "error"
+
+# Cap on the trace kept in run metadata; older points get thinned out.
+MAX_TRACE_POINTS = 1000
+
+
+class FixedLimiter:
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self._semaphore = asyncio.Semaphore(limit)
+
+    @property
+    def ceiling(self) -> int:
+        return self.limit
+
+    async def __aenter__(self) -> None:
+        await self._semaphore.acquire()
+
+    async def __aexit__(self, *exc: Any) -> None:
+        self._semaphore.release()
+
+    def record(self, outcome: str, latency_ms: Optional[float] = None) -> None:
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"mode": "fixed", "limit": self.limit}
+
+
+class AdaptiveLimiter:
+    def __init__(
+        self,
+        *,
+        floor: int,
+        ceiling: int,
+        initial: Optional[int] = None,
+        backoff: float = 0.5,
+        latency_factor: float = 3.0,
+        warmup: int = 20,
+    ) -> None:
+        """
+        floor/ceiling: hard bounds on the in-flight limit.
+        backoff: multiplicative cut on a congestion signal.
+        latency_factor: a success slower than this multiple of the
+            smoothed baseline latency counts as congestion.
+        warmup: successes needed before latency can trigger a cut.
+        """
+        if not 1 <= floor <= ceiling:
+            raise ValueError(f"need 1 <= floor <= ceiling, got {floor}, {ceiling}")
+
+        self.floor = floor
+        self.ceiling = ceiling
+        self.backoff = backoff
+        self.latency_factor = latency_factor
+        self.warmup = warmup
+
+        self._limit = float(initial if initial is not None else floor)
+        self._in_flight = 0
+        self._waiters: deque = deque()
+
+        # Slow start: +1 per success until the first cut, then +1/limit
+        # per success (about +1 per "window" of requests).
+        self._slow_start = True
+        self._baseline_ms: Optional[float] = None
+        self._samples = 0
+        self._last_cut = 0.0
+
+        self._started = time.monotonic()
+        self.increases = 0
+        self.decreases = 0
+        self.trace: List[Dict[str, Any]] = []
+        self._log("start")
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    async def __aenter__(self) -> None:
+        while self._in_flight >= self.limit:
+            fut = asyncio.get_running_loop().create_future()
+            self._waiters.append(fut)
+            try:
+                await fut
+            except asyncio.CancelledError:
+                if fut in self._waiters:
+                    self._waiters.remove(fut)
+                raise
+        self._in_flight += 1
+
+    async def __aexit__(self, *exc: Any) -> None:
+        self._in_flight -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        free = self.limit - self._in_flight
+        while free > 0 and self._waiters:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                fut.set_result(None)
+                free -= 1
+
+    def _log(self, reason: str) -> None:
+        self.trace.append(
+            {
+                "t": round(time.monotonic() - self._started, 3),
+                "limit": self.limit,
+                "reason": reason,
+            }
+        )
+        if len(self.trace) > MAX_TRACE_POINTS:
+            # Keep the first and most recent points, thin the middle.
+            self.trace = self.trace[:1] + self.trace[1:-1:2] + self.trace[-1:]
+
+    def record(self, outcome: str, latency_ms: Optional[float] = None) -> None:
+        if outcome == OK and latency_ms is not None:
+            blowup = (
+                self._baseline_ms is not None
+                and self._samples >= self.warmup
+                and latency_ms > self.latency_factor * max(self._baseline_ms, 1.0)
+            )
+            if blowup:
+                # Still counts towards the baseline, just at a fifth of the
+                # weight: one slow burst barely moves it, but if the
+                # provider has simply got slower for good, the baseline
+                # catches up and the cuts stop, instead of the limit
+                # sitting on the floor for the rest of the run.
+                self._baseline_ms += 0.01 * (latency_ms - self._baseline_ms)
+                self._decrease("latency")
+                return
+
+            self._samples += 1
+            if self._baseline_ms is None:
+                self._baseline_ms = latency_ms
+            else:
+                self._baseline_ms += 0.05 * (latency_ms - self._baseline_ms)
+            self._increase()
+        elif outcome in (TIMEOUT, RATE_LIMITED):
+            self._decrease(outcome)
+        # Other errors (bad prompt, 4xx) say nothing about load: hold.
+
+    def _increase(self) -> None:
+        if self._limit >= self.ceiling:
+            return
+        before = self.limit
+        step = 1.0 if self._slow_start else 1.0 / self._limit
+        self._limit = min(float(self.ceiling), self._limit + step)
+        if self.limit != before:
+            self.increases += 1
+            self._log("increase")
+            self._wake()
+
+    def _decrease(self, reason: str) -> None:
+        now = time.monotonic()
+        # One congestion event usually fails a whole burst of in-flight
+        # calls; only cut once per smoothed round trip.
+        cooldown = (self._baseline_ms or 100.0) / 1000.0
+        if now - self._last_cut < cooldown:
+            return
+        self._last_cut = now
+        self._slow_start = False
+
+        before = self.limit
+        self._limit = max(float(self.floor), self._limit * self.backoff)
+        if self.limit != before:
+            self.decreases += 1
+            self._log(reason)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": "adaptive",
+            "floor": self.floor,
+            "ceiling": self.ceiling,
+            "final_limit": self.limit,
+            "increases": self.increases,
+            "decreases": self.decreases,
+            "trace": self.trace,
+        }
@@ -0,0 +1,154 @@
+"""
+Sequential early stopping against a baseline.
+
+For a regression gate the question is only "did the pass rate drop below
+the baseline's?", and a few hundred cases usually answer it as well as
+the whole suite. Cases are run in a shuffled (seeded, so reproducible)
+order, which makes every prefix of the run a random sample of the suite.
+After each evaluated case we update a confidence interval on the pass
+rate, overall and per category, and stop scheduling new inference once
+the verdict can't change:
+
+- regression: the interval's upper end is below the baseline, overall
+  or for any category the baseline has;
+- no regression: every lower end is at or above baseline - margin.
+
+The intervals are Hoeffding bounds with a union bound over time
+(alpha_n = 6 alpha / (pi^2 n^2)), so they're valid however often we
+look, and alpha is split evenly across overall + categories. Both make
+them conservative; the price is a few more cases, not a wrong verdict.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+REGRESSION = "regression"
+NO_REGRESSION = "no_regression"
+
+OVERALL = "__overall__"
+
+
+def shuffled(
+    indexed_cases: Iterable[Tuple[int, Dict[str, Any]]], seed: int
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    The suite in a random but reproducible order. This has to read the
+    whole suite first; rows keep their suite index, so artifacts can
+    still be put back in suite order.
+    """
+    cases = list(indexed_cases)
+    random.Random(seed).shuffle(cases)
+    return iter(cases)
+
+
+def radius(n: int, alpha: float) -> float:
+    """Half-width of the anytime-valid interval after n cases."""
+    if n == 0:
+        return 1.0
+    return math.sqrt(math.log(math.pi**2 * n**2 / (3 * alpha)) / (2 * n))
+
+
+class _Tally:
+    def __init__(self, baseline: float) -> None:
+        self.baseline = baseline
+        self.n = 0
+        self.passed = 0
+
+    def bounds(self, alpha: float) -> Tuple[float, float]:
+        if self.n == 0:
+            return 0.0, 1.0
+        rate = self.passed / self.n
+        r = radius(self.n, alpha)
+        return max(0.0, rate - r), min(1.0, rate + r)
+
+
+class EarlyStopper:
+    def __init__(
+        self,
+        baseline_summary: Dict[str, Any],
+        *,
+        confidence: float = 0.95,
+        margin: float = 0.0,
+    ) -> None:
+        """
+        baseline_summary: the baseline run's summary.json.
+        confidence: probability the verdict agrees with the full run's
+            true pass rates.
+        margin: drops smaller than this don't block a "no regression" stop.
+        """
+        self.confidence = confidence
+        self.margin = margin
+
+        self._tallies: Dict[str, _Tally] = {OVERALL: _Tally(float(baseline_summary.get("pass_rate", 0.0)))}
+        for category, counts in (baseline_summary.get("by_category") or {}).items():
+            if counts.get("total"):
+                self._tallies[category] = _Tally(counts["passed"] / counts["total"])
+        # Bonferroni over everything we're watching.
+        self.alpha = (1.0 - confidence) / len(self._tallies)
+
+        self.evaluated = 0
+        self.verdict: Optional[str] = None
+        self.settled_at: Optional[int] = None
+        self.regressed: Optional[str] = None
+        # Tallies not yet confidently at or above baseline - margin.
+        self._unsettled = set(self._tallies)
+
+    @property
+    def settled(self) -> bool:
+        return self.verdict is not None
+
+    def add(self, tc: Dict[str, Any], ev: Dict[str, Any]) -> None:
+        self.evaluated += 1
+        if self.settled:
+            return
+
+        ok = bool(ev.get("passed", False))
+        category = tc.get("category") or "uncategorized"
+        for key in (OVERALL, category):
+            tally = self._tallies.get(key)
+            # Categories the baseline never saw have nothing to compare to.
+            if tally is None:
+                continue
+            tally.n += 1
+            tally.passed += 1 if ok else 0
+
+            lower, upper = tally.bounds(self.alpha)
+            if upper < tally.baseline:
+                self._settle(REGRESSION)
+                self.regressed = key
+                return
+            if lower >= tally.baseline - self.margin:
+                self._unsettled.discard(key)
+
+        if not self._unsettled:
+            self._settle(NO_REGRESSION)
+
+    def _settle(self, verdict: str) -> None:
+        self.verdict = verdict
+        self.settled_at = self.evaluated
+
+    def _bounds_row(self, tally: _Tally) -> Dict[str, Any]:
+        lower, upper = tally.bounds(self.alpha)
+        return {
+            "evaluated": tally.n,
+            "pass_rate": round(tally.passed / tally.n, 4) if tally.n else None,
+            "lower": round(lower, 4),
+            "upper": round(upper, 4),
+            "baseline": round(tally.baseline, 4),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "verdict": self.verdict,
+            "settled_at": self.settled_at,
+            "regressed_on": "overall" if self.regressed == OVERALL else self.regressed,
+            "confidence": self.confidence,
+            "margin": self.margin,
+            "overall": self._bounds_row(self._tallies[OVERALL]),
+            "by_category": {
+                k: self._bounds_row(t) for k, t in sorted(self._tallies.items()) if k != OVERALL
+            },
+        }
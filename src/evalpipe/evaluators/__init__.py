@@ -33,7 +33,12 @@ def evaluate(test_case, result, judge_runner=None):
                 "passed": False,
                 "reason": "Judge runner not provided",
             }
-        return evaluate_with_judge(test_case, result, judge_runner)
+        return evaluate_with_judge(
+            prompt=result.get("prompt") or "",
+            output=result.get("output") or "",
+            rubric=test_case["evaluation"].get("rubric"),
+            judge_runner=judge_runner,
+        )
 
     return {
         "passed": False,
@@ -1,4 +1,10 @@
-from typing import Dict, Any
+from typing import Callable, Dict, Any
+
+from evalpipe.judge.cache import cached_judgment, inline_rubric_hash, rubric_hash
+
+# What run_judge grades with. Part of the cache key, so bump it when the
+# scoring below changes.
+JUDGE_MODEL = "stub-judge-v0"
 
 
 def run_judge(
@@ -7,6 +13,16 @@ def run_judge(
     output: str,
     rubric: Dict[str, Any] | None = None,
 ) -> Dict[str, Any]:
+    return cached_judgment(
+        judge_model=JUDGE_MODEL,
+        rubric=inline_rubric_hash(rubric) if rubric else rubric_hash(),
+        prompt=prompt,
+        output=output,
+        judge=_stub_judge,
+    )
+
+
+def _stub_judge() -> Dict[str, Any]:
     scores = {
         "factual_correctness": 1,
         "completeness": 1,
@@ -26,8 +42,9 @@ def evaluate_with_judge(
     prompt: str,
     output: str,
     rubric: Dict[str, Any] | None = None,
+    judge_runner: Callable[..., Dict[str, Any]] = run_judge,
 ) -> Dict[str, Any]:
-    result = run_judge(
+    result = judge_runner(
         prompt=prompt,
         output=output,
         rubric=rubric,
@@ -38,5 +55,5 @@ def evaluate_with_judge(
         "reason": result["explanation"],
         "judge_scores": result["scores"],
         "judge_total": result["total"],
+        "judge_cache_hit": bool(result.get("cache_hit")),
     }
-
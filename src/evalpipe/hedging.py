@@ -0,0 +1,185 @@
+"""
+Hedged provider calls.
+
+A handful of stalled calls decide when a run finishes. With hedging on,
+a call that is still running past the model's recent p95 latency gets
+a duplicate, and whichever of the two finishes first wins; the loser is
+cancelled. Only calls already in the slow tail are duplicated, so the
+extra load is about 5% at most, and `max_extra_fraction` caps it hard.
+
+Latencies are tracked per model. To report p99 "without hedging" we
+can't use the hedged calls themselves (the slow primaries get
+cancelled), so a random `holdout_fraction` of calls is never hedged
+and serves as the control group.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Recent successful latencies used for the hedge threshold.
+WINDOW = 1000
+# Latencies kept (uniformly sampled) for the end-of-run percentiles.
+RESERVOIR = 10_000
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class _Reservoir:
+    def __init__(self, size: int, seed: int) -> None:
+        self.size = size
+        self.seen = 0
+        self.values: List[float] = []
+        self._rng = random.Random(seed)
+
+    def add(self, value: float) -> None:
+        self.seen += 1
+        if len(self.values) < self.size:
+            self.values.append(value)
+        else:
+            slot = self._rng.randrange(self.seen)
+            if slot < self.size:
+                self.values[slot] = value
+
+
+class _ModelStats:
+    def __init__(self) -> None:
+        self.recent: deque = deque(maxlen=WINDOW)
+        self.threshold_ms: Optional[float] = None
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        # Hedges skipped because the rate limits had no room for them.
+        self.hedges_refused = 0
+        self.holdout = 0
+        self.hedged_ms = _Reservoir(RESERVOIR, seed=0)
+        self.holdout_ms = _Reservoir(RESERVOIR, seed=1)
+
+
+class Hedger:
+    def __init__(
+        self,
+        *,
+        quantile: float = 0.95,
+        max_extra_fraction: float = 0.05,
+        min_samples: int = 20,
+        holdout_fraction: float = 0.1,
+        seed: int = 0,
+    ) -> None:
+        """
+        quantile: hedge calls slower than this latency quantile.
+        max_extra_fraction: hedges never exceed this share of calls.
+        min_samples: successes needed before a model's threshold is trusted.
+        holdout_fraction: share of calls never hedged, for the comparison.
+        """
+        self.quantile = quantile
+        self.max_extra_fraction = max_extra_fraction
+        self.min_samples = min_samples
+        self.holdout_fraction = holdout_fraction
+        self._rng = random.Random(seed)
+        self._models: Dict[str, _ModelStats] = {}
+
+    def _stats_for(self, model: str) -> _ModelStats:
+        if model not in self._models:
+            self._models[model] = _ModelStats()
+        return self._models[model]
+
+    def _observe(self, st: _ModelStats, latency_ms: float) -> None:
+        st.recent.append(latency_ms)
+        # Re-sorting the window on every call adds up; every 10th is plenty.
+        if len(st.recent) >= self.min_samples and (st.threshold_ms is None or len(st.recent) % 10 == 0):
+            st.threshold_ms = percentile(list(st.recent), self.quantile)
+
+    async def call(
+        self,
+        model: str,
+        make_call: Callable[[], Awaitable[T]],
+        admit_hedge: Optional[Callable[[], bool]] = None,
+    ) -> T:
+        """
+        make_call() once, plus a duplicate if it's slow. `admit_hedge` is
+        asked before the duplicate goes out (it's a real request, so the
+        caller's rate limits have to pay for it); False skips the hedge.
+        """
+        st = self._stats_for(model)
+        start = time.perf_counter()
+
+        if self._rng.random() < self.holdout_fraction:
+            st.holdout += 1
+            result = await make_call()
+            latency = (time.perf_counter() - start) * 1000
+            st.holdout_ms.add(latency)
+            self._observe(st, latency)
+            return result
+
+        st.calls += 1
+
+        def elapsed_ms() -> float:
+            return (time.perf_counter() - start) * 1000
+
+        primary = asyncio.ensure_future(make_call())
+        hedge: Optional[asyncio.Future] = None
+        try:
+            if st.threshold_ms is not None:
+                done, _ = await asyncio.wait({primary}, timeout=st.threshold_ms / 1000.0)
+                if not done and st.hedges < self.max_extra_fraction * st.calls:
+                    if admit_hedge is None or admit_hedge():
+                        st.hedges += 1
+                        hedge = asyncio.ensure_future(make_call())
+                    else:
+                        st.hedges_refused += 1
+
+            if hedge is None:
+                result = await primary
+                latency = elapsed_ms()
+                st.hedged_ms.add(latency)
+                self._observe(st, latency)
+                return result
+
+            pending = {primary, hedge}
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                succeeded = [f for f in (primary, hedge) if f in done and f.exception() is None]
+                winner = succeeded[0] if succeeded else next(iter(done))
+                # A fast failure doesn't win if the other call can still succeed.
+                if succeeded or not pending:
+                    break
+
+            latency = elapsed_ms()
+            st.hedged_ms.add(latency)
+            if winner is hedge:
+                st.hedge_wins += 1
+            if winner.exception() is None:
+                self._observe(st, latency)
+            return winner.result()
+        finally:
+            for fut in (primary, hedge):
+                if fut is not None and not fut.done():
+                    fut.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        for model, st in sorted(self._models.items()):
+            out[model] = {
+                "calls": st.calls,
+                "holdout_calls": st.holdout,
+                "hedges": st.hedges,
+                "hedge_rate": round(st.hedges / st.calls, 4) if st.calls else 0.0,
+                "hedge_wins": st.hedge_wins,
+                "hedges_refused": st.hedges_refused,
+                "threshold_ms": round(st.threshold_ms, 2) if st.threshold_ms is not None else None,
+                "p99_ms": round(percentile(st.hedged_ms.values, 0.99), 2),
+                "p99_unhedged_ms": round(percentile(st.holdout_ms.values, 0.99), 2),
+            }
+        return out
@@ -0,0 +1,71 @@
+"""
+Scheduling order from earlier runs.
+
+When iterating on a prompt, the interesting cases are the ones that
+failed last time. prioritized() runs those first, then the flaky ones,
+then everything else, so a bad change shows up in the first few
+seconds (pair it with --max-failures to stop right there).
+
+- failed: failed in the most recent of the given runs.
+- flaky: passed most recently but failed in an older given run. This
+  needs two or more runs; with one, there's no flaky tier.
+
+Only the ids of failed/flaky cases are held in memory. Instead of
+sorting the suite, it's read once per tier.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+from evalpipe.storage import read_jsonl
+
+FAILED = 0
+FLAKY = 1
+
+
+def _evaluations_path(path: Path) -> Path:
+    return path / "evaluations.jsonl" if path.is_dir() else path
+
+
+def load_priorities(runs: List[Path]) -> Dict[str, int]:
+    """
+    Maps case id -> FAILED/FLAKY from previous runs (run directories or
+    evaluations.jsonl files), most recent first. Cases that passed every
+    time aren't in the map.
+    """
+    priorities: Dict[str, int] = {}
+    passed_latest: set = set()
+    for age, run in enumerate(runs):
+        for ev in read_jsonl(_evaluations_path(run)):
+            case_id = ev.get("id")
+            if case_id is None:
+                continue
+            if age == 0:
+                if ev.get("passed"):
+                    passed_latest.add(case_id)
+                else:
+                    priorities[case_id] = FAILED
+            elif not ev.get("passed") and case_id in passed_latest:
+                priorities[case_id] = FLAKY
+    return priorities
+
+
+def prioritized(
+    make_cases: Callable[[], Iterable[Tuple[int, Dict[str, Any]]]],
+    priorities: Dict[str, int],
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Yields the (suite_index, test_case) pairs from `make_cases()` with
+    failed cases first, then flaky, then the rest, each tier in suite
+    order. `make_cases` is called once per tier.
+    """
+    tiers = sorted(set(priorities.values()))
+    for tier in tiers:
+        for index, tc in make_cases():
+            if priorities.get(tc["id"]) == tier:
+                yield index, tc
+    for index, tc in make_cases():
+        if tc["id"] not in priorities:
+            yield index, tc
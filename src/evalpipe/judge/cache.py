@@ -0,0 +1,60 @@
+"""
+Cached judge verdicts.
+
+A judge call often costs more than the inference it's grading, and the
+same (prompt, output) under the same rubric and judge model gets the
+same verdict. Verdicts are keyed on exactly those four things and kept
+in the response cache, so they share its file, memory tier and pruning.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple
+
+from evalpipe.cache.simple_cache import get_cache, make_judge_key
+
+RUBRIC_PATH = Path(__file__).with_name("rubric_v1.md")
+
+_rubric_hashes: Dict[Tuple[str, int], str] = {}
+
+
+def rubric_hash(path: Path = RUBRIC_PATH) -> str:
+    """sha256 of the rubric file, re-read only when it changes."""
+    stamp = (str(path), path.stat().st_mtime_ns)
+    digest = _rubric_hashes.get(stamp)
+    if digest is None:
+        digest = _rubric_hashes[stamp] = hashlib.sha256(path.read_bytes()).hexdigest()
+    return digest
+
+
+def inline_rubric_hash(rubric: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(rubric, sort_keys=True).encode()).hexdigest()
+
+
+def cached_judgment(
+    *,
+    judge_model: str,
+    rubric: str,
+    prompt: str,
+    output: str,
+    judge: Callable[[], Dict[str, Any]],
+) -> Dict[str, Any]:
+    """
+    The cached verdict for this (judge_model, rubric hash, prompt,
+    output), or judge()'s, which is then cached. Either way the result
+    has model and cache_hit set.
+    """
+    key = make_judge_key(judge_model=judge_model, rubric_hash=rubric, prompt=prompt, output=output)
+    cache = get_cache()
+    hit = cache.get(key)
+    if hit is not None:
+        hit["cache_hit"] = True
+        return hit
+
+    # "model" is what cache stats group entries by.
+    result = {"model": judge_model, **judge()}
+    cache.put(key, result)
+    return {**result, "cache_hit": False}
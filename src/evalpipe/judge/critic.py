@@ -1,13 +1,24 @@
-from pathlib import Path
 from typing import Dict, Any
 
-from evalpipe.providers.openai_provider import infer
+from evalpipe.judge.cache import RUBRIC_PATH, cached_judgment, rubric_hash
+from evalpipe.providers.openai_provider import DEFAULT_MODEL, infer
 
 
-RUBRIC_PATH = Path("src/evalpipe/judge/rubric_v1.md")
+def judge_output(prompt: str, output: str, *, model: str = DEFAULT_MODEL) -> Dict[str, Any]:
+    """
+    Asks `model` to grade `output` against the rubric. Verdicts are
+    cached (see judge/cache.py); cache_hit says whether this one was.
+    """
+    return cached_judgment(
+        judge_model=model,
+        rubric=rubric_hash(RUBRIC_PATH),
+        prompt=prompt,
+        output=output,
+        judge=lambda: _call_judge(prompt, output, model),
+    )
 
 
-def judge_output(prompt: str, output: str) -> Dict[str, Any]:
+def _call_judge(prompt: str, output: str, model: str) -> Dict[str, Any]:
     rubric = RUBRIC_PATH.read_text()
 
     judge_prompt = f"""
@@ -35,7 +46,7 @@ Return your judgment in strict JSON with this schema:
 }}
 """
 
-    result = infer(judge_prompt)
+    result = infer(judge_prompt, model=model)
 
     return {
         "raw_judge_output": result["output"],
@@ -1,16 +1,21 @@
 import json
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 
 from .schema import validate_test_case, SchemaError
 
 
-def load_suite(path: Path) -> List[Dict[str, Any]]:
+def iter_suite(path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Streams validated test cases one line at a time.
+
+    Same checks as load_suite, but nothing is buffered, so a suite with
+    millions of cases costs no more memory than one with ten.
+    Errors are raised lazily, when the bad line is reached.
+    """
     if not path.exists():
         raise FileNotFoundError(path)
 
-    test_cases: List[Dict[str, Any]] = []
-
     with path.open() as f:
         for line_no, line in enumerate(f, start=1):
             line = line.strip()
@@ -27,6 +32,11 @@ def load_suite(path: Path) -> List[Dict[str, Any]]:
             except SchemaError as e:
                 raise SchemaError(f"Schema error on line {line_no}: {e}") from e
 
-            test_cases.append(obj)
+            yield obj
+
+
+def load_suite(path: Path) -> List[Dict[str, Any]]:
+    if not path.exists():
+        raise FileNotFoundError(path)
 
-    return test_cases
+    return list(iter_suite(path))
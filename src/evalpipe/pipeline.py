@@ -0,0 +1,470 @@
+"""
+Streaming run pipeline.
+
+Test cases come off the suite iterator and are rendered, inferred,
+scored, appended to the run directory and folded into the summary one
+at a time. Nothing here holds the whole suite, so peak memory is the
+same for 10k cases as for 10M.
+
+Inference and scoring run as two stages joined by a bounded queue.
+Evaluators can be CPU-heavy (JSON parsing, regex scans), so scoring is
+handed to a thread or process pool in chunks instead of running on the
+event loop next to in-flight requests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import multiprocessing.util
+import time
+from collections import deque
+from contextlib import ExitStack, aclosing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from evalpipe.aggregate import Aggregator
+from evalpipe.cache import simple_cache
+from evalpipe.evaluators import evaluate
+from evalpipe.evaluators.judge import run_judge
+from evalpipe.prompts.render import CompiledTemplate, load_template
+from evalpipe.coalesce import RequestCoalescer
+from evalpipe.concurrency import FixedLimiter
+from evalpipe.early_stop import EarlyStopper
+from evalpipe.hedging import Hedger
+from evalpipe.providers import Provider
+from evalpipe.ratelimit import RateLimits
+from evalpipe.runner import DEFAULT_PARAMS, PREFETCH_CHUNK, InferenceJob, stream_jobs
+from evalpipe.storage import ARTIFACT_FILES, RunWriter, read_jsonl
+
+
+def evaluate_case(tc: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+    # Inference errors come back as normalized rows with output=None.
+    # Scoring them would just trip up evaluators that expect text.
+    if result.get("error"):
+        eval_out = {
+            "passed": False,
+            "reason": f"Inference failed ({result.get('error_type')}): {result['error']}",
+        }
+    else:
+        eval_out = evaluate(tc, result, judge_runner=run_judge)
+    eval_out["id"] = tc["id"]
+    return eval_out
+
+
+EVAL_EXECUTORS = ("inline", "thread", "process")
+
+EARLY_STOP_PREFETCH = 8
+
+# Marks the end of the inference stage on the hand-off queue.
+_DONE = object()
+
+
+@dataclass
+class PipelineRun:
+    aggregator: Aggregator
+    stages: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Cell:
+    """
+    One (model, prompt template) combination and where its rows go.
+    """
+
+    model: str
+    prompt_path: Path
+    run_dir: Path
+    aggregator: Aggregator = field(default_factory=Aggregator)
+    resume: bool = False
+    progress: Optional[Dict[str, Any]] = None
+    # With a baseline to beat: stop feeding this cell once the verdict is in.
+    early_stop: Optional[EarlyStopper] = None
+
+
+def evaluate_chunk(
+    pairs: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+) -> Tuple[List[Dict[str, Any]], float]:
+    """
+    Scores a chunk of (test_case, result) pairs.
+
+    Runs inside pool workers, so it has to stay a plain module-level
+    function. Returns the evaluations plus the time spent scoring.
+    """
+    start = time.perf_counter()
+    evaluations = [evaluate_case(tc, result) for tc, result in pairs]
+    return evaluations, time.perf_counter() - start
+
+
+def rebuild_from_artifacts(run_dir: Path) -> Tuple[Aggregator, Set[str]]:
+    """
+    Re-folds the rows already written to a run directory.
+
+    Used on resume: returns the aggregate state so far plus the ids that
+    are done. Call storage.recover_run_rows first so the three files
+    line up.
+    """
+    aggregator = Aggregator()
+    done: Set[str] = set()
+
+    readers = [read_jsonl(run_dir / f"{name}.jsonl") for name in ARTIFACT_FILES]
+    for tc, result, ev in zip(*readers):
+        aggregator.add(tc, result, ev)
+        done.add(tc["id"])
+
+    return aggregator, done
+
+
+def _folding_rows(
+    run_dir: Path, aggregator: Aggregator
+) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]]:
+    readers = [read_jsonl(run_dir / f"{name}.jsonl") for name in ARTIFACT_FILES]
+    for tc, result, ev in zip(*readers):
+        aggregator.add(tc, result, ev)
+        yield tc, result, ev
+
+
+def merge_runs(
+    run_dirs: List[Path],
+    out_dir: Path,
+    progress: Optional[Dict[str, Any]] = None,
+) -> Aggregator:
+    """
+    Combines shard run directories into one.
+
+    Each shard is aggregated on its own and the states are merged, while
+    the rows are k-way merged back into suite order (shards are already
+    in suite order internally). Streams everything; nothing is buffered.
+    """
+    shard_aggregators = [Aggregator() for _ in run_dirs]
+    streams = [
+        _folding_rows(run_dir, aggregator)
+        for run_dir, aggregator in zip(run_dirs, shard_aggregators)
+    ]
+
+    with RunWriter(out_dir, progress=progress) as writer:
+        for tc, result, ev in heapq.merge(*streams, key=lambda row: row[2]["index"]):
+            writer.append(tc, result, ev)
+        writer.checkpoint(status="complete", force=True)
+
+    merged = Aggregator()
+    for aggregator in shard_aggregators:
+        merged.merge(aggregator)
+    return merged
+
+
+def _init_eval_worker() -> None:
+    # A forked worker opens its own cache (judge verdicts) and has to close
+    # it, or its buffered access times and lookup counts never reach disk
+    # and prune takes hot verdicts for cold ones. Pool workers leave via
+    # os._exit, so atexit is no use; multiprocessing's finalizers do run.
+    multiprocessing.util.Finalize(None, simple_cache.close_stores, exitpriority=10)
+
+
+def _make_executor(kind: str, workers: int) -> Optional[Executor]:
+    if kind == "inline":
+        return None
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=workers)
+    if kind == "process":
+        return ProcessPoolExecutor(max_workers=workers, initializer=_init_eval_worker)
+    raise ValueError(f"Unknown eval executor: {kind}")
+
+
+def _rate(count: int, seconds: float) -> float:
+    return (count / seconds) if seconds > 0 else 0.0
+
+
+async def run_cells_async(
+    *,
+    indexed_cases: Iterable[Tuple[int, Dict[str, Any]]],
+    suite_id: str,
+    cells: List[Cell],
+    params: Dict[str, Any] | None = None,
+    max_concurrency: int = 10,
+    eval_executor: str = "thread",
+    eval_workers: int = 2,
+    eval_chunk_size: int = 64,
+    provider: Optional[Provider] = None,
+    limiter: Any = None,
+    rate_limits: Optional[RateLimits] = None,
+    coalesce: bool = True,
+    hedger: Optional[Hedger] = None,
+    stream: bool = False,
+    max_failures: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Runs every cell over the suite in one pass and returns stage stats.
+
+    The suite is read once; each case is rendered once per template and
+    fanned out to every model using that template. All (cell, case) calls
+    share a single concurrency limit, and each cell's rows are routed to
+    its own run directory in suite order.
+
+    `indexed_cases` yields (suite_index, test_case) pairs; the index is
+    recorded on each evaluation row so sharded or resumed runs can be
+    put back in suite order.
+
+    With `max_failures`, outstanding inference is cancelled once that
+    many failed evaluations (across all cells) have been seen. Rows
+    already inferred are still scored and written.
+    """
+    loop = asyncio.get_running_loop()
+    executor = _make_executor(eval_executor, eval_workers)
+    params = params or DEFAULT_PARAMS
+    limiter = limiter or FixedLimiter(max_concurrency)
+    # Shared across cells: matrix cells on the same model and template
+    # often render identical prompts.
+    coalescer = RequestCoalescer() if coalesce else None
+
+    # Templates are read and compiled once per run, not once per case.
+    templates: Dict[Path, CompiledTemplate] = {}
+    by_prompt: Dict[Path, List[int]] = {}
+    for ci, cell in enumerate(cells):
+        if cell.prompt_path not in templates:
+            templates[cell.prompt_path] = load_template(cell.prompt_path)
+        by_prompt.setdefault(cell.prompt_path, []).append(ci)
+
+    def live(ci: int) -> bool:
+        stopper = cells[ci].early_stop
+        return stopper is None or not stopper.settled
+
+    def jobs() -> Iterator[InferenceJob]:
+        for index, tc in indexed_cases:
+            if not any(live(ci) for ci in range(len(cells))):
+                # Everything's settled; in-flight calls still finish and
+                # get written, nothing new goes out.
+                return
+            for prompt_path, cell_ids in by_prompt.items():
+                cell_ids = [ci for ci in cell_ids if live(ci)]
+                if not cell_ids:
+                    continue
+                rendered = templates[prompt_path].render(tc)
+                for ci in cell_ids:
+                    yield InferenceJob(
+                        suite_id=suite_id,
+                        test_case=tc,
+                        model=cells[ci].model,
+                        params=params,
+                        rendered_prompt=rendered,
+                        tag=(ci, index),
+                    )
+
+    # Bounded on purpose: if scoring falls behind, the inference stage
+    # blocks on put() and stops pulling new cases off the suite.
+    queue_size = eval_chunk_size * eval_workers * 2
+    queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    max_inflight_chunks = eval_workers * 2
+
+    started = time.perf_counter()
+    inference = {"cases": 0, "seconds": 0.0}
+    evaluation = {"cases": 0, "seconds": 0.0, "busy_seconds": 0.0}
+    max_depth = 0
+    failures = {"limit": max_failures, "seen": 0, "reached": False}
+    producer: Optional[asyncio.Future] = None
+
+    async def inference_stage() -> None:
+        nonlocal max_depth
+        results = stream_jobs(
+            jobs(),
+            # Prefetch pulls jobs ahead of the pool; keep that short when
+            # cells may stop early, so few jobs are queued past the stop.
+            prefetch=EARLY_STOP_PREFETCH if any(c.early_stop for c in cells) else PREFETCH_CHUNK,
+            max_concurrency=max_concurrency,
+            provider=provider,
+            limiter=limiter,
+            rate_limits=rate_limits,
+            coalescer=coalescer,
+            hedger=hedger,
+            stream=stream,
+        )
+        try:
+            async with aclosing(results):
+                async for job, result in results:
+                    ci, index = job.tag
+                    result["rendered_prompt"] = result["prompt"]
+                    result["prompt_version"] = cells[ci].prompt_path.stem
+
+                    await queue.put((ci, index, job.test_case, result))
+                    inference["cases"] += 1
+                    max_depth = max(max_depth, queue.qsize())
+        finally:
+            inference["seconds"] = time.perf_counter() - started
+            await queue.put(_DONE)
+
+    def submit(chunk: List[Tuple[int, int, Dict[str, Any], Dict[str, Any]]]) -> asyncio.Future:
+        pairs = [(tc, result) for _, _, tc, result in chunk]
+        if executor is None:
+            fut = loop.create_future()
+            fut.set_result(evaluate_chunk(pairs))
+            return fut
+        return loop.run_in_executor(executor, evaluate_chunk, pairs)
+
+    async def evaluation_stage(writers: List[RunWriter]) -> None:
+        # Chunks are scored concurrently but written strictly in order,
+        # so the artifacts keep suite order.
+        inflight: deque = deque()
+
+        async def flush_one() -> None:
+            chunk, fut = inflight.popleft()
+            evaluations, busy = await fut
+            touched = set()
+            for (ci, index, tc, result), ev in zip(chunk, evaluations):
+                ev["index"] = index
+                writers[ci].append(tc, result, ev)
+                cells[ci].aggregator.add(tc, result, ev, index=index)
+                if cells[ci].early_stop is not None:
+                    cells[ci].early_stop.add(tc, ev)
+                if not ev.get("passed"):
+                    failures["seen"] += 1
+                touched.add(ci)
+            evaluation["cases"] += len(chunk)
+            evaluation["busy_seconds"] += busy
+            for ci in touched:
+                writers[ci].checkpoint()
+
+            if max_failures is not None and not failures["reached"] and failures["seen"] >= max_failures:
+                # Bad enough already: drop whatever is still in flight.
+                failures["reached"] = True
+                producer.cancel()
+
+        finished = False
+        while not finished:
+            item = await queue.get()
+            chunk = []
+            while item is not _DONE:
+                chunk.append(item)
+                if len(chunk) >= eval_chunk_size:
+                    break
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+            finished = item is _DONE
+
+            if chunk:
+                inflight.append((chunk, submit(chunk)))
+
+            while inflight and (
+                len(inflight) > max_inflight_chunks or inflight[0][1].done()
+            ):
+                await flush_one()
+
+        while inflight:
+            await flush_one()
+
+        evaluation["seconds"] = time.perf_counter() - started
+
+    try:
+        with ExitStack() as stack:
+            writers = [
+                stack.enter_context(
+                    RunWriter(
+                        cell.run_dir,
+                        resume=cell.resume,
+                        progress=cell.progress,
+                        completed=cell.aggregator.total,
+                    )
+                )
+                for cell in cells
+            ]
+            producer = asyncio.ensure_future(inference_stage())
+            try:
+                await evaluation_stage(writers)
+                if failures["reached"]:
+                    await asyncio.gather(producer, return_exceptions=True)
+                else:
+                    await producer
+            finally:
+                producer.cancel()
+            for writer in writers:
+                writer.checkpoint(status="complete", force=True)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    return {
+        "inference": {
+            **inference,
+            "cases_per_sec": _rate(inference["cases"], inference["seconds"]),
+            "provider": provider.stats() if provider is not None else {"name": "dummy"},
+            "concurrency": limiter.stats(),
+            "rate_limits": rate_limits.stats() if rate_limits is not None else {},
+            "coalescing": coalescer.stats() if coalescer is not None else {},
+            "hedging": hedger.stats() if hedger is not None else {},
+        },
+        "evaluation": {
+            **evaluation,
+            "cases_per_sec": _rate(evaluation["cases"], evaluation["seconds"]),
+            "executor": eval_executor,
+            "workers": eval_workers,
+            "chunk_size": eval_chunk_size,
+        },
+        "queue": {"max_size": queue_size, "max_depth": max_depth},
+        "cache": simple_cache.cache_stats(),
+        "max_failures": failures,
+        "wall_seconds": time.perf_counter() - started,
+    }
+
+
+async def run_pipeline_async(
+    *,
+    indexed_cases: Iterable[Tuple[int, Dict[str, Any]]],
+    suite_id: str,
+    prompt_path: Path,
+    model: str,
+    run_dir: Path,
+    aggregator: Optional[Aggregator] = None,
+    resume: bool = False,
+    progress: Optional[Dict[str, Any]] = None,
+    **options: Any,
+) -> PipelineRun:
+    """
+    Runs a single (model, prompt) pipeline into `run_dir`.
+
+    With resume=True rows are appended to the existing artifacts and
+    `aggregator` should carry the state rebuilt from them; the caller
+    filters finished cases out of `indexed_cases`. Remaining keyword
+    options go to run_cells_async.
+    """
+    cell = Cell(
+        model=model,
+        prompt_path=prompt_path,
+        run_dir=run_dir,
+        aggregator=aggregator or Aggregator(),
+        resume=resume,
+        progress=progress,
+    )
+    stages = await run_cells_async(
+        indexed_cases=indexed_cases,
+        suite_id=suite_id,
+        cells=[cell],
+        **options,
+    )
+    return PipelineRun(aggregator=cell.aggregator, stages=stages)
+
+
+async def _closing_provider(coro: Awaitable[Any], provider: Optional[Provider]) -> Any:
+    # Pooled connections belong to this event loop; close them before
+    # asyncio.run() tears it down.
+    try:
+        return await coro
+    finally:
+        if provider is not None:
+            await provider.aclose()
+
+
+def run_pipeline(**kwargs: Any) -> PipelineRun:
+    """
+    Synchronous wrapper around run_pipeline_async.
+    """
+    return asyncio.run(_closing_provider(run_pipeline_async(**kwargs), kwargs.get("provider")))
+
+
+def run_cells(**kwargs: Any) -> Dict[str, Any]:
+    """
+    Synchronous wrapper used by the CLI (single and matrix runs).
+    """
+    return asyncio.run(_closing_provider(run_cells_async(**kwargs), kwargs.get("provider")))
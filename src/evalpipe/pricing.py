@@ -30,3 +30,18 @@ def estimate_cost(
 
     return round(prompt_cost + completion_cost, 6)
 
+
+
+# Provider quotas per model: requests and tokens per minute. These are
+# the lowest paid-tier numbers I've seen; bump them to match your
+# account. Models not listed here (dummy-v0) aren't throttled at all.
+MODEL_RATE_LIMITS: Dict[str, Dict[str, float]] = {
+    "gpt-4o-mini": {
+        "rpm": 500,
+        "tpm": 200_000,
+    },
+    "gpt-4o": {
+        "rpm": 500,
+        "tpm": 30_000,
+    },
+}
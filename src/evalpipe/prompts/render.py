@@ -1,6 +1,11 @@
 from pathlib import Path
 import hashlib
-from typing import Dict, Any
+import os
+import re
+from typing import Dict, Any, FrozenSet, List, Tuple
+
+# {{field}}; anything but braces between the double braces.
+_PLACEHOLDER = re.compile(r"\{\{([^{}]*)\}\}")
 
 
 def load_prompt(path: str):
@@ -17,6 +22,57 @@ def load_prompt(path: str):
     return text, content_hash
 
 
+class CompiledTemplate:
+    """
+    A template split once into literal segments and {{field}} slots.
+
+    render() fills the slots and joins the lot in one go, instead of one
+    str.replace pass over the whole text per test case key. Placeholders
+    for fields the test case doesn't have are left as they are, same as
+    before.
+    """
+
+    __slots__ = ("text", "prompt_hash", "fields", "_parts", "_slots")
+
+    def __init__(self, text: str, prompt_hash: str | None = None) -> None:
+        self.text = text
+        self.prompt_hash = prompt_hash or hashlib.sha256(text.encode("utf-8")).hexdigest()
+        pieces = _PLACEHOLDER.split(text)
+        # Literals at even indexes, field names at odd ones. Slots start
+        # out holding the placeholder itself, for fields that are missing.
+        self._parts: List[str] = [p if i % 2 == 0 else "{{" + p + "}}" for i, p in enumerate(pieces)]
+        self._slots: Tuple[Tuple[int, str], ...] = tuple((i, pieces[i]) for i in range(1, len(pieces), 2))
+        self.fields: FrozenSet[str] = frozenset(field for _, field in self._slots)
+
+    def render(self, test_case: Dict[str, Any]) -> str:
+        parts = self._parts.copy()
+        for i, field in self._slots:
+            if field in test_case:
+                parts[i] = str(test_case[field])
+        return "".join(parts)
+
+
+_templates: Dict[str, Tuple[Tuple[int, int], CompiledTemplate]] = {}
+
+
+def load_template(path: str | Path) -> CompiledTemplate:
+    """
+    The compiled template at `path`. Compiled once per path and kept
+    until the file's mtime or size changes; after that, a render costs
+    a stat(), not a read and a hash.
+    """
+    key = os.fspath(path)
+    st = os.stat(key)
+    stamp = (st.st_mtime_ns, st.st_size)
+    cached = _templates.get(key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    text, content_hash = load_prompt(key)
+    template = CompiledTemplate(text, content_hash)
+    _templates[key] = (stamp, template)
+    return template
+
+
 def render_prompt(prompt_path: Path, test_case: Dict[str, Any]) -> str:
     """
     Renders a prompt template using {{field}} placeholders.
@@ -25,12 +81,5 @@ def render_prompt(prompt_path: Path, test_case: Dict[str, Any]) -> str:
     Simple string replacement keeps prompt behavior obvious
     and avoids surprises during debugging.
     """
-    template_text, _ = load_prompt(str(prompt_path))
-
-    rendered = template_text
-
-    for key, value in test_case.items():
-        placeholder = f"{{{{{key}}}}}"
-        rendered = rendered.replace(placeholder, str(value))
+    return load_template(prompt_path).render(test_case)
 
-    return rendered
@@ -0,0 +1,22 @@
+from typing import Any, Callable, Dict
+
+from evalpipe.providers.base import Provider, ProviderError, RateLimitError, StreamChunk, collect_stream
+from evalpipe.providers.batching import BatchingProvider
+from evalpipe.providers.dummy import DummyProvider
+from evalpipe.providers.openai_provider import OpenAIProvider
+
+
+PROVIDERS: Dict[str, Callable[..., Provider]] = {
+    "dummy": DummyProvider,
+    "openai": OpenAIProvider,
+}
+
+
+def get_provider(name: str, **kwargs: Any) -> Provider:
+    try:
+        factory = PROVIDERS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown provider: {name} (expected one of {', '.join(sorted(PROVIDERS))})"
+        ) from None
+    return factory(**kwargs)
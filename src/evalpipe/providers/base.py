@@ -0,0 +1,129 @@
+"""
+Provider interface.
+
+A provider turns a rendered prompt into a ProviderOutput (text, token
+counts, latency). The runner only talks to this interface, so swapping
+the dummy provider for a real API is a --provider flag, not a code change.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Protocol
+
+from evalpipe.schemas.evaluation_schema import ProviderOutput
+
+
+class ProviderError(RuntimeError):
+    """
+    Provider call failed (bad status, malformed response, ...).
+    """
+
+    def __init__(self, message: str, status: int | None = None) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class RateLimitError(ProviderError):
+    """
+    Provider rejected the call for quota reasons (HTTP 429).
+    """
+
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        super().__init__(message, status=429)
+        self.retry_after = retry_after
+
+
+@dataclass
+class StreamChunk:
+    """
+    One piece of a streamed completion. Token counts, when the provider
+    reports them, usually come on the last chunk only.
+    """
+
+    text: str = ""
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+
+
+class Provider(Protocol):
+    name: str
+    version: str
+
+    async def infer(self, prompt: str, *, model: str, params: Dict[str, Any]) -> ProviderOutput:
+        ...
+
+    async def infer_batch(
+        self, prompts: List[str], *, model: str, params: Dict[str, Any]
+    ) -> List[ProviderOutput]:
+        ...
+
+    def infer_stream(
+        self, prompt: str, *, model: str, params: Dict[str, Any]
+    ) -> AsyncIterator[StreamChunk]:
+        ...
+
+    def stats(self) -> Dict[str, Any]:
+        ...
+
+    async def aclose(self) -> None:
+        ...
+
+
+async def infer_each(
+    provider: Provider, prompts: List[str], *, model: str, params: Dict[str, Any]
+) -> List[ProviderOutput]:
+    """
+    Fallback infer_batch for providers without a native batch endpoint.
+    """
+    return list(
+        await asyncio.gather(
+            *(provider.infer(p, model=model, params=params) for p in prompts)
+        )
+    )
+
+
+async def collect_stream(chunks: AsyncIterator[StreamChunk], *, model: str) -> ProviderOutput:
+    """
+    Drains a streamed completion into a ProviderOutput with timings:
+    time to first token, mean gap between tokens after that, and decode
+    speed (tokens after the first / time after the first). Without
+    provider token counts, each non-empty chunk counts as one token.
+    """
+    start = time.perf_counter()
+    first: Optional[float] = None
+    last: Optional[float] = None
+    text_chunks = 0
+    parts: List[str] = []
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+
+    async for chunk in chunks:
+        if chunk.text:
+            now = time.perf_counter()
+            if first is None:
+                first = now
+            last = now
+            text_chunks += 1
+            parts.append(chunk.text)
+        if chunk.prompt_tokens is not None:
+            prompt_tokens = chunk.prompt_tokens
+        if chunk.completion_tokens is not None:
+            completion_tokens = chunk.completion_tokens
+
+    end = time.perf_counter()
+    tokens = completion_tokens if completion_tokens is not None else text_chunks
+    decode_seconds = (last - first) if first is not None and last is not None else 0.0
+
+    return ProviderOutput(
+        output="".join(parts),
+        model=model,
+        latency_ms=int((end - start) * 1000),
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        ttft_ms=(first - start) * 1000 if first is not None else None,
+        inter_token_ms=decode_seconds * 1000 / (text_chunks - 1) if text_chunks > 1 else None,
+        tokens_per_sec=(tokens - 1) / decode_seconds if tokens > 1 and decode_seconds > 0 else None,
+    )
@@ -0,0 +1,142 @@
+"""
+Micro-batching in front of a provider.
+
+BatchingProvider looks like any other provider to the runner: each case
+still calls infer() with its own prompt, under its own retries, timeout
+and cache entry. Behind that, calls for the same (model, params) are
+held for up to `max_wait_ms` or until `max_batch_size` of them are
+waiting, then go out together as one infer_batch() call and the outputs
+are handed back to each caller.
+
+Batches can only be as big as the number of calls in flight, so raise
+--max-concurrency along with --batch-size.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from evalpipe.providers.base import Provider, ProviderError, StreamChunk
+from evalpipe.schemas.evaluation_schema import ProviderOutput
+
+
+class _Batch:
+    def __init__(self, model: str, params: Dict[str, Any]) -> None:
+        self.model = model
+        self.params = params
+        self.items: List[Tuple[str, asyncio.Future]] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class BatchingProvider:
+    def __init__(
+        self,
+        inner: Provider,
+        *,
+        max_batch_size: int = 16,
+        max_wait_ms: float = 10.0,
+    ) -> None:
+        self.inner = inner
+        self.name = inner.name
+        self.version = inner.version
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+
+        self._pending: Dict[str, _Batch] = {}
+        self._sending: Set[asyncio.Task] = set()
+
+        self.batches = 0
+        self.prompts = 0
+        self.largest_batch = 0
+
+    async def infer(self, prompt: str, *, model: str, params: Dict[str, Any]) -> ProviderOutput:
+        loop = asyncio.get_running_loop()
+        key = json.dumps([model, params], sort_keys=True)
+
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = _Batch(model, params)
+            batch.timer = loop.call_later(self.max_wait_ms / 1000.0, self._flush, key)
+
+        fut = loop.create_future()
+        batch.items.append((prompt, fut))
+        if len(batch.items) >= self.max_batch_size:
+            self._flush(key)
+        return await fut
+
+    def _flush(self, key: str) -> None:
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        task = asyncio.ensure_future(self._send(batch))
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+    async def _send(self, batch: _Batch) -> None:
+        # Callers that timed out or got cancelled while waiting don't
+        # need their prompt sent any more.
+        items = [(p, f) for p, f in batch.items if not f.done()]
+        if not items:
+            return
+
+        self.batches += 1
+        self.prompts += len(items)
+        self.largest_batch = max(self.largest_batch, len(items))
+
+        try:
+            outputs = await self.inner.infer_batch(
+                [p for p, _ in items], model=batch.model, params=batch.params
+            )
+        except Exception as e:
+            # The whole batch failed; each caller's retry loop decides
+            # what to do about it.
+            for _, fut in items:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+
+        if len(outputs) != len(items):
+            error = ProviderError(f"infer_batch returned {len(outputs)} outputs for {len(items)} prompts")
+            for _, fut in items:
+                if not fut.done():
+                    fut.set_exception(error)
+            return
+
+        for (_, fut), out in zip(items, outputs):
+            if not fut.done():
+                fut.set_result(out)
+
+    async def infer_batch(
+        self, prompts: List[str], *, model: str, params: Dict[str, Any]
+    ) -> List[ProviderOutput]:
+        return await self.inner.infer_batch(prompts, model=model, params=params)
+
+    def infer_stream(
+        self, prompt: str, *, model: str, params: Dict[str, Any]
+    ) -> AsyncIterator[StreamChunk]:
+        # Streams are per prompt by nature; nothing to batch.
+        return self.inner.infer_stream(prompt, model=model, params=params)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.inner.stats(),
+            "batching": {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait_ms,
+                "batches": self.batches,
+                "prompts": self.prompts,
+                "mean_batch_size": round(self.prompts / self.batches, 2) if self.batches else 0.0,
+                "largest_batch": self.largest_batch,
+            },
+        }
+
+    async def aclose(self) -> None:
+        for key in list(self._pending):
+            self._flush(key)
+        if self._sending:
+            await asyncio.gather(*self._sending, return_exceptions=True)
+        await self.inner.aclose()
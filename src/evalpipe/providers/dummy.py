@@ -0,0 +1,59 @@
+import re
+import time
+from typing import Any, AsyncIterator, Dict, List
+
+from evalpipe.providers.base import StreamChunk, infer_each
+from evalpipe.schemas.evaluation_schema import ProviderOutput
+
+
+class DummyProvider:
+    """
+    Deterministic local provider (the default).
+
+    Delegates to runner.dummy_infer at call time, so tests that patch
+    that function keep working no matter how the runner is invoked.
+    """
+
+    name = "dummy"
+    version = "v0"
+
+    def __init__(self) -> None:
+        self.requests = 0
+
+    async def infer(self, prompt: str, *, model: str, params: Dict[str, Any]) -> ProviderOutput:
+        from evalpipe import runner
+
+        self.requests += 1
+        start = time.perf_counter()
+        output = await runner.dummy_infer(prompt)
+
+        return ProviderOutput(
+            output=output,
+            model=model,
+            latency_ms=int((time.perf_counter() - start) * 1000),
+            prompt_tokens=None,
+            completion_tokens=None,
+        )
+
+    async def infer_batch(
+        self, prompts: List[str], *, model: str, params: Dict[str, Any]
+    ) -> List[ProviderOutput]:
+        return await infer_each(self, prompts, model=model, params=params)
+
+    async def infer_stream(
+        self, prompt: str, *, model: str, params: Dict[str, Any]
+    ) -> AsyncIterator[StreamChunk]:
+        from evalpipe import runner
+
+        self.requests += 1
+        output = await runner.dummy_infer(prompt)
+        # One "token" per word, leading whitespace kept so the pieces
+        # join back into the exact output.
+        for piece in re.findall(r"\s*\S+", output):
+            yield StreamChunk(text=piece)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"name": self.name, "requests": self.requests}
+
+    async def aclose(self) -> None:
+        return None
@@ -0,0 +1,213 @@
+"""
+Minimal async HTTP/1.1 client with a keep-alive connection pool.
+
+Opening a TCP (+TLS) connection per call costs a round trip or three,
+which at eval-suite volumes adds up to more than the model latency on
+short prompts. The pool keeps idle connections around and hands them to
+the next request, so a whole run typically uses `max_connections`
+sockets total.
+
+Deliberately small: JSON POSTs, Content-Length or chunked responses,
+no redirects, no proxies. It avoids pulling in aiohttp/httpx just for this.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import ssl
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+@dataclass
+class HTTPResponse:
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+_Conn = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class HTTPConnectionPool:
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        max_connections: int = 64,
+        keep_alive: bool = True,
+        connect_timeout: float = 10.0,
+    ) -> None:
+        parts = urlsplit(base_url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {base_url}")
+
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.base_path = parts.path.rstrip("/")
+        self.ssl = ssl.create_default_context() if parts.scheme == "https" else None
+        self.keep_alive = keep_alive
+        self.connect_timeout = connect_timeout
+
+        self._idle: deque = deque()
+        self._slots = asyncio.Semaphore(max_connections)
+
+        self.connections_opened = 0
+        self.requests = 0
+
+    async def _connect(self) -> _Conn:
+        conn = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, ssl=self.ssl),
+            timeout=self.connect_timeout,
+        )
+        self.connections_opened += 1
+        return conn
+
+    @staticmethod
+    def _close(conn: _Conn) -> None:
+        conn[1].close()
+
+    def _encode(self, method: str, path: str, body: Optional[bytes], headers: Dict[str, str]) -> bytes:
+        lines = [
+            f"{method} {self.base_path}{path} HTTP/1.1",
+            f"Host: {self.host}:{self.port}",
+            f"Connection: {'keep-alive' if self.keep_alive else 'close'}",
+            f"Content-Length: {len(body or b'')}",
+        ]
+        lines.extend(f"{k}: {v}" for k, v in headers.items())
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (body or b"")
+
+    @staticmethod
+    async def _read_head(reader: asyncio.StreamReader) -> Tuple[int, Dict[str, str]]:
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed before response")
+        status = int(status_line.split()[1])
+
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            headers[key.strip().lower()] = value.strip()
+        return status, headers
+
+    @staticmethod
+    async def _iter_body(reader: asyncio.StreamReader, headers: Dict[str, str]) -> AsyncIterator[bytes]:
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size_line = await reader.readline()
+                size = int(size_line.split(b";")[0].strip() or b"0", 16)
+                if size == 0:
+                    # Trailers (if any) end with a blank line.
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    return
+                chunk = await reader.readexactly(size)
+                await reader.readexactly(2)
+                yield chunk
+        elif "content-length" in headers:
+            length = int(headers["content-length"])
+            if length:
+                yield await reader.readexactly(length)
+        else:
+            while chunk := await reader.read(65536):
+                yield chunk
+
+    def _reusable(self, headers: Dict[str, str]) -> bool:
+        if not self.keep_alive or headers.get("connection", "").lower() == "close":
+            return False
+        return "content-length" in headers or "transfer-encoding" in headers
+
+    async def _checkout(self) -> Tuple[_Conn, bool]:
+        while self._idle:
+            conn = self._idle.pop()
+            if not conn[0].at_eof() and not conn[1].is_closing():
+                return conn, True
+            self._close(conn)
+        return await self._connect(), False
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> HTTPResponse:
+        chunks = []
+        async for part in self.stream(method, path, body, headers):
+            if isinstance(part, tuple):
+                status, resp_headers = part
+            else:
+                chunks.append(part)
+        return HTTPResponse(status=status, headers=resp_headers, body=b"".join(chunks))
+
+    async def stream(
+        self,
+        method: str,
+        path: str,
+        body: Optional[bytes] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> AsyncIterator[Any]:
+        """
+        Yields (status, headers) once, then raw body chunks as they arrive.
+        The connection goes back to the pool only if the body was fully read.
+        """
+        payload = self._encode(method, path, body, headers or {})
+
+        async with self._slots:
+            conn, reused = await self._checkout()
+            try:
+                try:
+                    conn[1].write(payload)
+                    await conn[1].drain()
+                    status, resp_headers = await self._read_head(conn[0])
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    if not reused:
+                        raise
+                    # Server dropped an idle keep-alive connection; one
+                    # retry on a fresh socket is safe since nothing was read.
+                    self._close(conn)
+                    conn, reused = await self._connect(), False
+                    conn[1].write(payload)
+                    await conn[1].drain()
+                    status, resp_headers = await self._read_head(conn[0])
+
+                self.requests += 1
+                yield status, resp_headers
+                async for chunk in self._iter_body(conn[0], resp_headers):
+                    yield chunk
+            except BaseException:
+                # Cancelled or failed mid-response: the socket is in an
+                # unknown state, never put it back.
+                self._close(conn)
+                raise
+
+            if self._reusable(resp_headers):
+                self._idle.append(conn)
+            else:
+                self._close(conn)
+
+    async def aclose(self) -> None:
+        while self._idle:
+            conn = self._idle.pop()
+            self._close(conn)
+            try:
+                await conn[1].wait_closed()
+            except Exception:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "connections_opened": self.connections_opened,
+            "requests": self.requests,
+            "idle_connections": len(self._idle),
+            "keep_alive": self.keep_alive,
+        }
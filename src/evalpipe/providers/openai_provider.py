@@ -1,5 +1,240 @@
-def infer(prompt: str) -> dict:
+"""
+OpenAI-compatible chat completions provider.
+
+Works against api.openai.com or anything that speaks the same API
+(vLLM, llama.cpp server, the local mock server in tests/mock_server.py).
+All calls in a run share one keep-alive connection pool.
+
+Chat completions takes one conversation per request. With
+batch_completions=True, infer_batch() instead sends the prompts as one
+list to the (legacy) /completions endpoint, which vLLM and friends
+serve in a single forward pass. Prompts then go in raw, without the
+chat template.
+"""
+
+import asyncio
+import json
+import os
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from evalpipe.providers.base import ProviderError, RateLimitError, StreamChunk, infer_each
+from evalpipe.providers.http_pool import HTTPConnectionPool
+from evalpipe.schemas.evaluation_schema import ProviderOutput
+
+DEFAULT_BASE_URL = "https://api.openai.com/v1"
+DEFAULT_MODEL = "gpt-4o-mini"
+
+
+def _parse_retry_after(value: str) -> Optional[float]:
     """
+    Retry-After in seconds. It's allowed to be an HTTP date as well as a
+    number; anything that parses as neither is ignored, and the caller's
+    usual backoff applies.
+    """
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class OpenAIProvider:
+    name = "openai"
+    version = "chat-completions-v1"
+
+    def __init__(
+        self,
+        *,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        max_connections: int = 64,
+        keep_alive: bool = True,
+        batch_completions: bool = False,
+    ) -> None:
+        self.base_url = base_url or os.getenv("OPENAI_BASE_URL") or DEFAULT_BASE_URL
+        self.api_key = api_key if api_key is not None else os.getenv("OPENAI_API_KEY", "")
+        self.pool = HTTPConnectionPool(
+            self.base_url,
+            max_connections=max_connections,
+            keep_alive=keep_alive,
+        )
+        self.batch_completions = batch_completions
+
+    def _headers(self) -> Dict[str, str]:
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        return headers
+
+    def _payload(self, prompt: str, model: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            **params,
+        }
+
+    @staticmethod
+    def _raise_for_status(status: int, headers: Dict[str, str], body: bytes) -> None:
+        if status < 400:
+            return
+        detail = body[:200].decode("utf-8", "replace")
+        if status == 429:
+            retry_after = headers.get("retry-after")
+            raise RateLimitError(
+                f"rate limited: {detail}",
+                retry_after=_parse_retry_after(retry_after) if retry_after else None,
+            )
+        raise ProviderError(f"HTTP {status}: {detail}", status=status)
+
+    async def infer(self, prompt: str, *, model: str, params: Dict[str, Any]) -> ProviderOutput:
+        start = time.perf_counter()
+        resp = await self.pool.request(
+            "POST",
+            "/chat/completions",
+            json.dumps(self._payload(prompt, model, params)).encode("utf-8"),
+            self._headers(),
+        )
+        self._raise_for_status(resp.status, resp.headers, resp.body)
+
+        try:
+            data = resp.json()
+            output = data["choices"][0]["message"]["content"]
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            raise ProviderError(f"Malformed response: {e}") from e
+
+        usage = data.get("usage") or {}
+        return ProviderOutput(
+            output=output,
+            model=data.get("model", model),
+            latency_ms=int((time.perf_counter() - start) * 1000),
+            prompt_tokens=usage.get("prompt_tokens"),
+            completion_tokens=usage.get("completion_tokens"),
+        )
+
+    async def infer_stream(
+        self, prompt: str, *, model: str, params: Dict[str, Any]
+    ) -> AsyncIterator[StreamChunk]:
+        """
+        Server-sent events from /chat/completions with stream=true. Usage
+        is asked for via stream_options and arrives on the last event.
+        """
+        payload = {
+            **self._payload(prompt, model, params),
+            "stream": True,
+            "stream_options": {"include_usage": True},
+        }
+        parts = self.pool.stream(
+            "POST",
+            "/chat/completions",
+            json.dumps(payload).encode("utf-8"),
+            {**self._headers(), "Accept": "text/event-stream"},
+        )
+        status, headers = await parts.__anext__()
+        if status >= 400:
+            body = b"".join([chunk async for chunk in parts])
+            self._raise_for_status(status, headers, body)
+
+        pending = b""
+        async for raw in parts:
+            pending += raw
+            # Events can be split across (or packed into) network chunks.
+            *lines, pending = pending.split(b"\n")
+            for line in lines:
+                line = line.strip()
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[5:].strip()
+                if data == b"[DONE]":
+                    continue
+                try:
+                    event = json.loads(data)
+                except ValueError as e:
+                    raise ProviderError(f"Malformed stream event: {e}") from e
+
+                usage = event.get("usage") or {}
+                text = ""
+                for choice in event.get("choices") or []:
+                    text += (choice.get("delta") or {}).get("content") or ""
+                if text or usage:
+                    yield StreamChunk(
+                        text=text,
+                        prompt_tokens=usage.get("prompt_tokens"),
+                        completion_tokens=usage.get("completion_tokens"),
+                    )
+
+    async def infer_batch(
+        self, prompts: List[str], *, model: str, params: Dict[str, Any]
+    ) -> List[ProviderOutput]:
+        if not self.batch_completions:
+            # Chat completions has no multi-prompt request; the pool still
+            # keeps these on already-open connections.
+            return await infer_each(self, prompts, model=model, params=params)
+
+        start = time.perf_counter()
+        resp = await self.pool.request(
+            "POST",
+            "/completions",
+            json.dumps({"model": model, "prompt": prompts, **params}).encode("utf-8"),
+            self._headers(),
+        )
+        self._raise_for_status(resp.status, resp.headers, resp.body)
+
+        try:
+            data = resp.json()
+            texts = [""] * len(prompts)
+            for choice in data["choices"]:
+                texts[choice["index"]] = choice["text"]
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            raise ProviderError(f"Malformed response: {e}") from e
+
+        # Usage only comes back for the whole request; split it by
+        # prompt/output length so per-case costs still add up.
+        usage = data.get("usage") or {}
+        prompt_total = usage.get("prompt_tokens")
+        completion_total = usage.get("completion_tokens")
+        prompt_chars = sum(len(p) for p in prompts) or 1
+        output_chars = sum(len(t) for t in texts) or 1
+        latency_ms = int((time.perf_counter() - start) * 1000)
+
+        return [
+            ProviderOutput(
+                output=text,
+                model=data.get("model", model),
+                latency_ms=latency_ms,
+                prompt_tokens=(
+                    round(prompt_total * len(prompt) / prompt_chars)
+                    if prompt_total is not None
+                    else None
+                ),
+                completion_tokens=(
+                    round(completion_total * len(text) / output_chars)
+                    if completion_total is not None
+                    else None
+                ),
+            )
+            for prompt, text in zip(prompts, texts)
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        return {"name": self.name, "base_url": self.base_url, **self.pool.stats()}
+
+    async def aclose(self) -> None:
+        await self.pool.aclose()
+
+
+def infer(prompt: str, model: str = DEFAULT_MODEL) -> dict:
+    """
+    One-off synchronous call (used by the judge).
+
     Returns:
     {
         "output": str,
@@ -8,4 +243,36 @@ def infer(prompt: str) -> dict:
         "prompt_tokens": int | None,
         "completion_tokens": int | None
     }
-    """
\ No newline at end of file
+
+    Blocks until the call is done, so it can't be used from a coroutine
+    (or from evaluation running inline on the pipeline's event loop);
+    there, await OpenAIProvider.infer instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        # asyncio.run would refuse anyway, with a less useful message and
+        # an un-awaited coroutine warning on top.
+        raise RuntimeError(
+            "openai_provider.infer() is synchronous and was called inside a running "
+            "event loop; await OpenAIProvider.infer there instead, or evaluate with "
+            "--eval-executor thread/process"
+        )
+
+    async def _once() -> ProviderOutput:
+        provider = OpenAIProvider()
+        try:
+            return await provider.infer(prompt, model=model, params={"temperature": 0.0})
+        finally:
+            await provider.aclose()
+
+    out = asyncio.run(_once())
+    return {
+        "output": out.output,
+        "model": out.model,
+        "latency_ms": out.latency_ms,
+        "prompt_tokens": out.prompt_tokens,
+        "completion_tokens": out.completion_tokens,
+    }
@@ -0,0 +1,154 @@
+"""
+Client-side RPM/TPM throttling.
+
+Each model gets two token buckets (requests and tokens) refilled
+continuously at the per-minute quota from pricing.MODEL_RATE_LIMITS.
+A call is admitted only once both buckets can cover it, so a burst of
+long prompts waits here instead of going out and coming back as 429s
+that burn retries.
+
+The token cost of a call isn't known until it returns, so admission
+charges an estimate (prompt length / 4 + max_tokens) and settle() puts
+back the difference once the real usage is in.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from evalpipe.pricing import MODEL_RATE_LIMITS
+
+# How much unused quota may pile up, in seconds of refill. Providers
+# meter over sub-minute windows, so letting a full minute's worth go
+# out at once would just get throttled on their end.
+BURST_SECONDS = 5.0
+
+# Rough chars-per-token for English text; only used for admission.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(prompt: str, params: Dict[str, Any]) -> int:
+    return len(prompt) // CHARS_PER_TOKEN + 1 + int(params.get("max_tokens") or 0)
+
+
+class TokenBucket:
+    def __init__(self, per_minute: float, burst_seconds: float = BURST_SECONDS) -> None:
+        self.rate = per_minute / 60.0
+        self.capacity = max(self.rate * burst_seconds, 1.0)
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self._refill(now)
+        # Anything bigger than the bucket would never fit; let it through
+        # once the bucket is full and run it into debt instead.
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.level) / self.rate)
+
+    def take(self, amount: float) -> None:
+        self.level -= amount
+
+    def give_back(self, amount: float) -> None:
+        self.level = min(self.capacity, self.level + amount)
+
+
+class ModelRateLimiter:
+    def __init__(self, *, rpm: float, tpm: float, burst_seconds: float = BURST_SECONDS) -> None:
+        self.requests = TokenBucket(rpm, burst_seconds)
+        self.tokens = TokenBucket(tpm, burst_seconds)
+        # Waiters are admitted in arrival order so a long prompt can't be
+        # starved by a stream of short ones.
+        self._lock = asyncio.Lock()
+        self._paused_until = 0.0
+
+        self.admitted = 0
+        self.waited_seconds = 0.0
+        self.throttled = 0
+
+    async def acquire(self, tokens: int) -> None:
+        start = time.monotonic()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                delay = max(
+                    self._paused_until - now,
+                    self.requests.wait_time(1, now),
+                    self.tokens.wait_time(tokens, now),
+                )
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
+            self.requests.take(1)
+            self.tokens.take(tokens)
+        self.admitted += 1
+        self.waited_seconds += time.monotonic() - start
+
+    def try_acquire(self, tokens: int) -> bool:
+        """
+        acquire() without the wait: charges the call and returns True only
+        if both buckets can cover it right now (and nobody is queued ahead).
+        """
+        now = time.monotonic()
+        if (
+            self._lock.locked()
+            or self._paused_until > now
+            or self.requests.wait_time(1, now) > 0
+            or self.tokens.wait_time(tokens, now) > 0
+        ):
+            return False
+        self.requests.take(1)
+        self.tokens.take(tokens)
+        self.admitted += 1
+        return True
+
+    def settle(self, estimated: int, actual: Optional[int]) -> None:
+        if actual is not None:
+            self.tokens.give_back(estimated - actual)
+
+    def pause(self, seconds: Optional[float]) -> None:
+        """The provider said 429 anyway: hold every call for this model."""
+        self.throttled += 1
+        if seconds:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rpm": self.requests.rate * 60,
+            "tpm": self.tokens.rate * 60,
+            "admitted": self.admitted,
+            "waited_seconds": round(self.waited_seconds, 3),
+            "throttled": self.throttled,
+        }
+
+
+class RateLimits:
+    """Per-model limiters, created on first use."""
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, Dict[str, float]]] = None,
+        *,
+        burst_seconds: float = BURST_SECONDS,
+    ) -> None:
+        self.limits = MODEL_RATE_LIMITS if limits is None else limits
+        self.burst_seconds = burst_seconds
+        self._models: Dict[str, ModelRateLimiter] = {}
+
+    def for_model(self, model: str) -> Optional[ModelRateLimiter]:
+        if model not in self._models:
+            quota = self.limits.get(model)
+            if not quota:
+                return None
+            self._models[model] = ModelRateLimiter(
+                rpm=quota["rpm"], tpm=quota["tpm"], burst_seconds=self.burst_seconds
+            )
+        return self._models[model]
+
+    def stats(self) -> Dict[str, Any]:
+        return {model: limiter.stats() for model, limiter in sorted(self._models.items())}
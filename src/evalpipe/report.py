@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 
 def _fmt_pct(x: float) -> str:
@@ -30,6 +30,18 @@ def generate_markdown_report(run_dir: Path, summary: Dict[str, Any], comparison:
     lines.append(f"- Pass rate: `{_fmt_pct(float(summary.get('pass_rate', 0.0)))}`")
     lines.append(f"- Avg latency: `{_fmt_ms(float(summary.get('avg_latency_ms', 0.0)))}`")
     lines.append(f"- Estimated cost: `{_fmt_usd(float(summary.get('estimated_cost', 0.0)))}`")
+    cache = summary.get("cache")
+    if cache:
+        lines.append(
+            f"- Cache hit rate: `{_fmt_pct(float(cache.get('hit_rate', 0.0)))}` "
+            f"({int(cache.get('exact_hits', 0))} exact-key, {int(cache.get('content_hits', 0))} content hits)"
+        )
+    judge = summary.get("judge")
+    if judge:
+        lines.append(
+            f"- Judge cache hit rate: `{_fmt_pct(float(judge.get('hit_rate', 0.0)))}` "
+            f"({int(judge.get('cache_hits', 0))} of {int(judge.get('judged', 0))} judged cases)"
+        )
     lines.append("")
 
     tokens = summary.get("tokens") or {}
@@ -43,6 +55,47 @@ def generate_markdown_report(run_dir: Path, summary: Dict[str, Any], comparison:
     lines.append(f"| Judge | {int(jud.get('prompt', 0))} | {int(jud.get('completion', 0))} |")
     lines.append("")
 
+    hedging = summary.get("hedging")
+    if hedging:
+        lines.append("## Hedging")
+        lines.append("")
+        lines.append(f"- Hedge rate: `{_fmt_pct(float(hedging.get('hedge_rate', 0.0)))}` ({int(hedging.get('hedges', 0))} of {int(hedging.get('calls', 0))} calls, {int(hedging.get('hedge_wins', 0))} won)")
+        lines.append(f"- p99 latency with hedging: `{_fmt_ms(float(hedging.get('p99_ms', 0.0)))}`")
+        lines.append(f"- p99 latency without hedging: `{_fmt_ms(float(hedging.get('p99_unhedged_ms', 0.0)))}` ({int(hedging.get('holdout_calls', 0))} held-out calls)")
+        lines.append("")
+
+    early = summary.get("early_stop")
+    if early:
+        overall = early.get("overall") or {}
+        lines.append("## Early stopping")
+        lines.append("")
+        if early.get("stopped"):
+            lines.append(f"- Stopped after `{int(early.get('evaluated', 0))}` cases: **{early.get('verdict')}**")
+            if early.get("regressed_on"):
+                lines.append(f"- Regressed on: `{early['regressed_on']}`")
+        else:
+            lines.append("- Verdict not settled; ran every case")
+        lines.append(f"- Pass rate bounds ({_fmt_pct(float(early.get('confidence', 0.0)))} confidence): `{_fmt_pct(float(overall.get('lower', 0.0)))}` – `{_fmt_pct(float(overall.get('upper', 0.0)))}` vs baseline `{_fmt_pct(float(overall.get('baseline', 0.0)))}`")
+        lines.append("")
+
+    streaming = (summary.get("streaming") or {}).get("by_model") or {}
+    if streaming:
+        lines.append("## Streaming")
+        lines.append("")
+        lines.append("| Model | Streamed | TTFT p50 | TTFT p95 | Inter-token p50 | Tokens/sec p50 |")
+        lines.append("|---|---:|---:|---:|---:|---:|")
+        for model in sorted(streaming.keys()):
+            v = streaming[model]
+            ttft = v.get("ttft_ms") or {}
+            itl = v.get("inter_token_ms") or {}
+            tps = v.get("tokens_per_sec") or {}
+            lines.append(
+                f"| {model} | {int(v.get('count', 0))} | {_fmt_ms(float(ttft.get('p50', 0.0)))} | "
+                f"{_fmt_ms(float(ttft.get('p95', 0.0)))} | {_fmt_ms(float(itl.get('p50', 0.0)))} | "
+                f"{float(tps.get('p50', 0.0)):.1f} |"
+            )
+        lines.append("")
+
     by_cat = summary.get("by_category") or {}
     if by_cat:
         lines.append("## By category")
@@ -100,3 +153,46 @@ def generate_markdown_report(run_dir: Path, summary: Dict[str, Any], comparison:
 
     (run_dir / "report.md").write_text("\n".join(lines) + "\n")
 
+
+
+def generate_matrix_report(run_dir: Path, cells: List[Dict[str, Any]]) -> None:
+    """
+    One table for a matrix run: prompts down, models across, pass rate
+    in each cell. Per-cell details live in each cell's own report.md.
+    """
+    models = sorted({c["model"] for c in cells})
+    prompts = sorted({c["prompt_version"] for c in cells})
+    by_key = {(c["prompt_version"], c["model"]): c for c in cells}
+
+    lines: list[str] = []
+    lines.append("# Matrix Report")
+    lines.append("")
+    lines.append(f"- Run ID: `{run_dir.name}`")
+    lines.append(f"- Cells: `{len(cells)}` ({len(models)} models x {len(prompts)} prompts)")
+    lines.append("")
+
+    lines.append("## Pass rate")
+    lines.append("")
+    lines.append("| Prompt | " + " | ".join(models) + " |")
+    lines.append("|---|" + "---:|" * len(models))
+    for p in prompts:
+        row = []
+        for m in models:
+            c = by_key.get((p, m))
+            row.append(_fmt_pct(float(c.get("pass_rate", 0.0))) if c else "-")
+        lines.append(f"| {p} | " + " | ".join(row) + " |")
+    lines.append("")
+
+    lines.append("## Cells")
+    lines.append("")
+    lines.append("| Model | Prompt | Total | Passed | Avg latency | Est. cost | Run dir |")
+    lines.append("|---|---|---:|---:|---:|---:|---|")
+    for c in cells:
+        lines.append(
+            f"| {c['model']} | {c['prompt_version']} | {int(c.get('total_tests', 0))} "
+            f"| {int(c.get('passed', 0))} | {_fmt_ms(float(c.get('avg_latency_ms', 0.0)))} "
+            f"| {_fmt_usd(float(c.get('estimated_cost', 0.0)))} | `{c.get('run_dir', '')}` |"
+        )
+    lines.append("")
+
+    (run_dir / "matrix.md").write_text("\n".join(lines) + "\n")
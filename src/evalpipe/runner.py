@@ -1,15 +1,22 @@
-from typing import Dict, Any, Tuple, Iterable, List, Optional
+from typing import Dict, Any, Tuple, Iterable, List, Optional, Callable, AsyncIterator, Awaitable
+from dataclasses import dataclass
 from datetime import datetime, timezone
 import time
 import json
 import asyncio
+from contextlib import aclosing
 
 from evalpipe.schemas.evaluation_schema import EvaluationResult, ProviderOutput
-from evalpipe.cache.simple_cache import (
-    make_cache_key,
-    load_from_cache,
-    save_to_cache,
-)
+from evalpipe.providers import DummyProvider, Provider, RateLimitError, collect_stream
+from evalpipe import coalesce, concurrency
+from evalpipe.coalesce import RequestCoalescer, request_key
+from evalpipe.hedging import Hedger
+from evalpipe.concurrency import FixedLimiter
+from evalpipe.ratelimit import RateLimits, estimate_tokens
+from evalpipe.scheduler import Items, worker_pool
+from evalpipe.cache.simple_cache import cache_keys, get_cache
+from evalpipe.cache.tiered import TieredCache
+from evalpipe.cache.writer import CacheWriter
 
 # FIXME: prompt rendering assumes UTF-8 text files.
 # This will break if prompts are generated from non-UTF8 sources.
@@ -99,6 +106,122 @@ def _error_result(
     }
 
 
+@dataclass
+class _CallOutcome:
+    """What the provider gave back for one request, after retries."""
+
+    output: Optional[ProviderOutput]
+    attempts: int
+    error_type: Optional[str] = None
+    error_message: Optional[str] = None
+
+
+async def _call_provider(
+    *,
+    provider: Provider,
+    model: str,
+    rendered_prompt: str,
+    params: Dict[str, Any],
+    limiter: Any = None,
+    rate_limits: Optional[RateLimits] = None,
+    hedger: Optional[Hedger] = None,
+    stream: bool = False,
+) -> _CallOutcome:
+    last_error_type: Optional[str] = None
+    last_error_message: Optional[str] = None
+
+    quota = rate_limits.for_model(model) if rate_limits is not None else None
+    estimated_tokens = estimate_tokens(rendered_prompt, params) if quota is not None else 0
+
+    # Retry loop: I originally tried higher retry counts,
+    # but found retries rarely help unless the failure is a timeout.
+    for attempt in range(MAX_RETRIES + 1):
+        retry_after: Optional[float] = None
+        if quota is not None:
+            # Retries spend quota too, so every attempt waits its turn.
+            await quota.acquire(estimated_tokens)
+
+        attempt_start = time.perf_counter()
+        try:
+            def infer() -> Awaitable[ProviderOutput]:
+                if stream:
+                    return collect_stream(
+                        provider.infer_stream(rendered_prompt, model=model, params=params),
+                        model=model,
+                    )
+                return provider.infer(rendered_prompt, model=model, params=params)
+
+            def admit_hedge() -> bool:
+                # The duplicate is a second real request: it pays quota
+                # like any other, and is skipped rather than queued.
+                return quota is None or quota.try_acquire(estimated_tokens)
+
+            # Timeout prevents hanging forever on stalled calls. It covers
+            # both halves of a hedged call.
+            provider_out = await asyncio.wait_for(
+                hedger.call(model, infer, admit_hedge) if hedger is not None else infer(),
+                timeout=TIMEOUT_SECONDS,
+            )
+            if limiter is not None:
+                limiter.record(
+                    concurrency.OK,
+                    (time.perf_counter() - attempt_start) * 1000,
+                )
+            if quota is not None:
+                used = None
+                if provider_out.prompt_tokens is not None and provider_out.completion_tokens is not None:
+                    used = provider_out.prompt_tokens + provider_out.completion_tokens
+                quota.settle(estimated_tokens, used)
+            return _CallOutcome(output=provider_out, attempts=attempt + 1)
+
+        except asyncio.TimeoutError:
+            last_error_type = "timeout"
+            last_error_message = "timeout"
+            if limiter is not None:
+                limiter.record(concurrency.TIMEOUT)
+        except RateLimitError as e:
+            last_error_type = type(e).__name__
+            last_error_message = str(e) or "rate limited"
+            retry_after = e.retry_after
+            if limiter is not None:
+                limiter.record(concurrency.RATE_LIMITED)
+            if quota is not None:
+                quota.pause(retry_after)
+        except Exception as e:
+            last_error_type = type(e).__name__
+            last_error_message = str(e) or "error"
+            if limiter is not None:
+                limiter.record(concurrency.ERROR)
+
+        if attempt < MAX_RETRIES:
+            # Small exponential backoff to avoid tight retry loops; a
+            # 429's Retry-After wins if it asks for longer.
+            await asyncio.sleep(max(0.05 * (2 ** attempt), retry_after or 0.0))
+
+    return _CallOutcome(
+        output=None,
+        attempts=MAX_RETRIES + 1,
+        error_type=last_error_type or "error",
+        error_message=last_error_message or "error",
+    )
+
+
+def _round_opt(x: Optional[float]) -> Optional[float]:
+    return round(x, 3) if x is not None else None
+
+
+def _provider_version(provider: Optional[Provider]) -> str:
+    provider = provider or DummyProvider()
+    return f"{provider.name}/{provider.version}"
+
+
+def _cache_hit(row: Dict[str, Any], match: str, test_id: str, rendered_prompt: str) -> Dict[str, Any]:
+    # A content hit can come from another suite or id; the row should
+    # still describe the case it's answering.
+    row.update(id=test_id, prompt=rendered_prompt, cache_hit=True, cache_match=match)
+    return row
+
+
 async def run_single(
     *,
     suite_id: str,
@@ -106,133 +229,345 @@ async def run_single(
     model: str,
     rendered_prompt: str,
     params: Dict[str, Any],
+    provider: Optional[Provider] = None,
+    limiter: Any = None,
+    rate_limits: Optional[RateLimits] = None,
+    coalescer: Optional[RequestCoalescer] = None,
+    hedger: Optional[Hedger] = None,
+    stream: bool = False,
+    cache_writer: Optional[CacheWriter] = None,
+    prefetched: bool = False,
 ) -> Dict[str, Any]:
     """
     Executes a single test case with caching + retries.
+    Without a provider this uses the deterministic dummy one.
+    Every provider attempt is reported to `limiter` (if given) so an
+    adaptive limiter can react to timeouts and 429s, and waits for the
+    model's RPM/TPM budget in `rate_limits` (if given) before going out.
+    With a `coalescer`, cases sending the exact same request share one
+    provider call; with a `hedger`, slow calls get a duplicate. With
+    `stream`, the completion is streamed and the row also gets ttft_ms,
+    inter_token_ms and tokens_per_sec. `prefetched` means the disk
+    cache was already checked for this key, so only the memory tier is
+    looked at again; with a `cache_writer` the row is written behind.
     """
     test_id = test_case["id"]
+    provider = provider or DummyProvider()
 
     # Cache key includes prompt + params + model to avoid re-running
     # identical evaluations. This saved a noticeable amount of time
     # when re-running the same suite during development.
-    cache_key = make_cache_key(
+    keys = cache_keys(
         suite_id=suite_id,
         test_id=test_id,
         model=model,
         prompt=rendered_prompt,
         params=params,
+        provider_version=_provider_version(provider),
     )
 
-    cached = load_from_cache(cache_key)
-    if cached:
-        cached["cache_hit"] = True
-        return cached
+    cache = cache_writer.cache if cache_writer is not None else get_cache()
+    for match, cache_key in keys:
+        # A prefetched miss can still have been filled in since by another
+        # case in this run, but only ever in the memory tier. The prefetch
+        # already counted this lookup, so don't count it again.
+        cached = cache.recall(cache_key, count=False) if prefetched else cache.get(cache_key)
+        if cached:
+            return _cache_hit(cached, match, test_id, rendered_prompt)
 
     start = time.time()
-    last_error_type: Optional[str] = None
-    last_error_message: Optional[str] = None
 
-    # Retry loop: I originally tried higher retry counts,
-    # but found retries rarely help unless the failure is a timeout.
-    for attempt in range(MAX_RETRIES + 1):
+    def call() -> Awaitable[_CallOutcome]:
+        return _call_provider(
+            provider=provider,
+            model=model,
+            rendered_prompt=rendered_prompt,
+            params=params,
+            limiter=limiter,
+            rate_limits=rate_limits,
+            hedger=hedger,
+            stream=stream,
+        )
+
+    source = coalesce.CALLED
+    if coalescer is None:
+        outcome = await call()
+    else:
+        outcome, source = await coalescer.run(
+            request_key(model, rendered_prompt, params),
+            call,
+            keep=lambda o: o.output is not None,
+        )
+    # Cases that piggybacked on someone else's call made no attempts.
+    attempts = outcome.attempts if source == coalesce.CALLED else 0
+
+    if outcome.output is None:
+        return _error_result(
+            test_id=test_id,
+            rendered_prompt=rendered_prompt,
+            model=model,
+            start=start,
+            error_type=outcome.error_type or "error",
+            error_message=outcome.error_message or "error",
+            attempts=attempts,
+        )
+
+    latency_ms = int((time.time() - start) * 1000)
+    llm_response = {
+        "id": test_id,
+        "prompt": rendered_prompt,
+        "output": outcome.output.output,
+        "model": model,
+        "latency_ms": latency_ms,
+        "prompt_tokens": outcome.output.prompt_tokens,
+        "completion_tokens": outcome.output.completion_tokens,
+        "cache_hit": False,
+        "coalesced": source != coalesce.CALLED,
+        "attempts": attempts,
+        "timestamp": datetime.now(timezone.utc)
+        .isoformat()
+        .replace("+00:00", "Z"),
+    }
+    # Stream timings belong to whoever made the call, not to cases that
+    # reused its response.
+    if outcome.output.ttft_ms is not None and source == coalesce.CALLED:
+        llm_response["ttft_ms"] = round(outcome.output.ttft_ms, 3)
+        llm_response["inter_token_ms"] = _round_opt(outcome.output.inter_token_ms)
+        llm_response["tokens_per_sec"] = _round_opt(outcome.output.tokens_per_sec)
+
+    for _, cache_key in keys:
+        if cache_writer is not None:
+            cache_writer.put(cache_key, llm_response)
+        else:
+            cache.put(cache_key, llm_response)
+    return llm_response
+
+
+@dataclass
+class InferenceJob:
+    """
+    One provider call to schedule.
+
+    Either `rendered_prompt` is set, or `render` builds it from the test
+    case once the job gets a slot. `tag` is opaque to the runner and comes
+    back with the result (the pipeline uses it to route rows).
+    """
+
+    suite_id: str
+    test_case: Dict[str, Any]
+    model: str
+    params: Dict[str, Any]
+    rendered_prompt: str | None = None
+    render: Optional[Callable[[Dict[str, Any]], str]] = None
+    tag: Any = None
+    # Filled in by the cache prefetch in stream_jobs.
+    prefetched: bool = False
+    cached: Optional[Dict[str, Any]] = None
+
+    def cache_keys(self, provider_version: str) -> List[Tuple[str, str]]:
+        return cache_keys(
+            suite_id=self.suite_id,
+            test_id=self.test_case["id"],
+            model=self.model,
+            prompt=self.rendered_prompt or "",
+            params=self.params,
+            provider_version=provider_version,
+        )
+
+
+async def _run_guarded(
+    limiter: Any,
+    job: InferenceJob,
+    provider: Optional[Provider] = None,
+    rate_limits: Optional[RateLimits] = None,
+    coalescer: Optional[RequestCoalescer] = None,
+    hedger: Optional[Hedger] = None,
+    stream: bool = False,
+    cache_writer: Optional[CacheWriter] = None,
+) -> Dict[str, Any]:
+    async with limiter:
+        start = time.time()
+        prompt_text = job.rendered_prompt or ""
         try:
-            # Timeout prevents hanging forever on stalled calls.
-            output = await asyncio.wait_for(
-                dummy_infer(rendered_prompt),
-                timeout=TIMEOUT_SECONDS,
+            if job.render is not None:
+                prompt_text = job.render(job.test_case)
+            return await run_single(
+                suite_id=job.suite_id,
+                test_case=job.test_case,
+                model=job.model,
+                rendered_prompt=prompt_text,
+                params=job.params,
+                provider=provider,
+                limiter=limiter,
+                rate_limits=rate_limits,
+                coalescer=coalescer,
+                hedger=hedger,
+                stream=stream,
+                cache_writer=cache_writer,
+                prefetched=job.prefetched,
+            )
+        except Exception as e:
+            # This used to silently fail — keeping an explicit error
+            # makes debugging bad test cases much easier.
+            return _error_result(
+                test_id=job.test_case.get("id", "unknown"),
+                rendered_prompt=prompt_text,
+                model=job.model,
+                start=start,
+                error_type=type(e).__name__,
+                error_message=str(e) or "error",
+                attempts=0,
             )
 
-            latency_ms = int((time.time() - start) * 1000)
-            llm_response = {
-                "id": test_id,
-                "prompt": rendered_prompt,
-                "output": output,
-                "model": model,
-                "latency_ms": latency_ms,
-                "prompt_tokens": None,
-                "completion_tokens": None,
-                "cache_hit": False,
-                "attempts": attempt + 1,
-                "timestamp": datetime.now(timezone.utc)
-                .isoformat()
-                .replace("+00:00", "Z"),
-            }
-
-            save_to_cache(cache_key, llm_response)
-            return llm_response
 
-        except asyncio.TimeoutError:
-            last_error_type = "timeout"
-            last_error_message = "timeout"
-        except Exception as e:
-            last_error_type = type(e).__name__
-            last_error_message = str(e) or "error"
+# Jobs whose cache entries are looked up together, in one query.
+PREFETCH_CHUNK = 128
 
-        if attempt < MAX_RETRIES:
-            # Small backoff to avoid tight retry loops.
-            # TODO: switch to exponential backoff if real providers are added.
-            await asyncio.sleep(0.05 * (2 ** attempt))
 
-    return _error_result(
-        test_id=test_id,
-        rendered_prompt=rendered_prompt,
-        model=model,
-        start=start,
-        error_type=last_error_type or "error",
-        error_message=last_error_message or "error",
-        attempts=MAX_RETRIES + 1,
-    )
+async def _prefetched(
+    jobs: Items, cache: TieredCache, chunk_size: int, provider_version: str
+) -> AsyncIterator[InferenceJob]:
+    """
+    Passes `jobs` through, with cache hits resolved a chunk at a time by
+    one bulk lookup on a worker thread. The next chunk's lookup runs
+    while the current chunk is consumed, and lookahead is one chunk, so
+    this stays lazy.
+    """
+    loop = asyncio.get_running_loop()
+
+    def lookup(chunk: List[InferenceJob]) -> List[InferenceJob]:
+        keyed = []
+        for job in chunk:
+            if job.render is not None:
+                try:
+                    job.rendered_prompt = job.render(job.test_case)
+                    job.render = None
+                except Exception:
+                    # Left for _run_guarded to turn into an error row.
+                    continue
+            keyed.append((job, job.cache_keys(provider_version)))
+        hits = cache.get_many({key for _, keys in keyed for _, key in keys})
+        for job, keys in keyed:
+            job.prefetched = True
+            for match, key in keys:
+                if key in hits:
+                    # Copied: cases sharing a content key each get a row.
+                    job.cached = _cache_hit(dict(hits[key]), match, job.test_case["id"], job.rendered_prompt or "")
+                    break
+        return chunk
+
+    async def chunks() -> AsyncIterator[List[InferenceJob]]:
+        chunk: List[InferenceJob] = []
+        if hasattr(jobs, "__aiter__"):
+            async for job in jobs:
+                chunk.append(job)
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+        else:
+            for job in jobs:
+                chunk.append(job)
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
+
+    ahead: Optional[asyncio.Future] = None
+    try:
+        async for chunk in chunks():
+            lookup_next = loop.run_in_executor(None, lookup, chunk)
+            if ahead is not None:
+                for job in await ahead:
+                    yield job
+            ahead = lookup_next
+        if ahead is not None:
+            for job in await ahead:
+                yield job
+    finally:
+        if ahead is not None and not ahead.done():
+            ahead.cancel()
+
+
+def _jobs_for(
+    *,
+    suite_id: str,
+    test_cases: Items,
+    model: str,
+    rendered_prompt: str | None,
+    params: Dict[str, Any],
+    render: Optional[Callable[[Dict[str, Any]], str]],
+) -> Items:
+    def job(tc: Dict[str, Any]) -> InferenceJob:
+        return InferenceJob(
+            suite_id=suite_id,
+            test_case=tc,
+            model=model,
+            params=params,
+            rendered_prompt=rendered_prompt,
+            render=render,
+        )
+
+    if hasattr(test_cases, "__aiter__"):
+        async def async_jobs() -> AsyncIterator[InferenceJob]:
+            async for tc in test_cases:
+                yield job(tc)
+
+        return async_jobs()
+    return (job(tc) for tc in test_cases)
 
 
 async def run_inference_async(
     *,
     suite_id: str,
-    test_cases: Iterable[Dict[str, Any]],
+    test_cases: Items,
     model: str,
-    rendered_prompt: str,
+    rendered_prompt: str | None = None,
     params: Dict[str, Any],
     max_concurrency: int,
+    render: Optional[Callable[[Dict[str, Any]], str]] = None,
+    provider: Optional[Provider] = None,
+    limiter: Any = None,
+    rate_limits: Optional[RateLimits] = None,
+    coalescer: Optional[RequestCoalescer] = None,
+    hedger: Optional[Hedger] = None,
+    ordered: bool = True,
+    stream: bool = False,
 ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
     """
     Runs inference over an entire suite with bounded concurrency.
-    """
 
-    # Semaphore limits concurrent in-flight requests.
-    # I initially tried unbounded asyncio.gather(), but it spiked memory
-    # and made failures harder to debug under load.
-    semaphore = asyncio.Semaphore(max_concurrency)
-
-    async def guarded(eval_case: Dict[str, Any]) -> Dict[str, Any]:
-        async with semaphore:
-            start = time.time()
-            try:
-                return await run_single(
-                    suite_id=suite_id,
-                    test_case=eval_case,
-                    model=model,
-                    rendered_prompt=rendered_prompt,
-                    params=params,
-                )
-            except Exception as e:
-                # This used to silently fail — keeping an explicit error
-                # makes debugging bad test cases much easier.
-                return _error_result(
-                    test_id=eval_case.get("id", "unknown"),
-                    rendered_prompt=rendered_prompt,
-                    model=model,
-                    start=start,
-                    error_type=type(e).__name__,
-                    error_message=str(e) or "error",
-                    attempts=0,
-                )
-
-    tasks = [guarded(tc) for tc in test_cases]
-    gathered = await asyncio.gather(*tasks, return_exceptions=False)
+    `test_cases` can be any iterator or async iterator; it's consumed
+    lazily. `render` builds the prompt per test case (the CLI passes the
+    template renderer here). Without it every case gets the same
+    `rendered_prompt`. Results come back in input order unless
+    `ordered=False`. Pass an AdaptiveLimiter as `limiter` to let the
+    in-flight limit move between its floor and ceiling instead of
+    sitting at `max_concurrency`.
+    """
+    jobs = _jobs_for(
+        suite_id=suite_id,
+        test_cases=test_cases,
+        model=model,
+        rendered_prompt=rendered_prompt,
+        params=params,
+        render=render,
+    )
 
     results: List[Dict[str, Any]] = []
     errors: List[Dict[str, Any]] = []
 
-    for res in gathered:
+    async for _, res in stream_jobs(
+        jobs,
+        max_concurrency=max_concurrency,
+        provider=provider,
+        limiter=limiter,
+        rate_limits=rate_limits,
+        coalescer=coalescer,
+        hedger=hedger,
+        ordered=ordered,
+        stream=stream,
+    ):
         if res.get("error"):
             errors.append(res)
         results.append(res)
@@ -240,30 +575,91 @@ async def run_inference_async(
     return results, errors
 
 
+async def stream_jobs(
+    jobs: Items,
+    *,
+    max_concurrency: int,
+    provider: Optional[Provider] = None,
+    limiter: Any = None,
+    rate_limits: Optional[RateLimits] = None,
+    coalescer: Optional[RequestCoalescer] = None,
+    hedger: Optional[Hedger] = None,
+    ordered: bool = True,
+    stream: bool = False,
+    prefetch: int = PREFETCH_CHUNK,
+) -> AsyncIterator[Tuple[InferenceJob, Dict[str, Any]]]:
+    """
+    Runs jobs through one shared concurrency limit.
+
+    One worker per slot of the limiter's ceiling pulls jobs lazily from
+    `jobs` (sync or async). At most 2 * ceiling jobs are alive at any
+    time, so memory doesn't grow with the number of jobs. Yields
+    (job, result) pairs in input order, or as they finish with
+    ordered=False.
+
+    Cache lookups happen up front, `prefetch` jobs at a time in one bulk
+    query off the event loop (0 turns this off). Hits come straight back
+    without waiting for the limiter; new rows are written behind.
+    """
+    # The limiter bounds concurrent in-flight requests.
+    # I initially tried unbounded asyncio.gather(), but it spiked memory
+    # and made failures harder to debug under load.
+    limiter = limiter or FixedLimiter(max_concurrency)
+
+    cache = get_cache()
+    writer = CacheWriter(cache)
+
+    async def run(job: InferenceJob) -> Dict[str, Any]:
+        if job.cached is not None:
+            return job.cached
+        return await _run_guarded(limiter, job, provider, rate_limits, coalescer, hedger, stream, writer)
+
+    source = _prefetched(jobs, cache, prefetch, _provider_version(provider)) if prefetch else jobs
+    # aclosing: if our consumer stops early, the pool's workers (and
+    # their in-flight calls) get cancelled now, not whenever the
+    # generator is garbage collected.
+    try:
+        async with aclosing(worker_pool(source, run, workers=limiter.ceiling, ordered=ordered)) as pairs:
+            async for job, result in pairs:
+                yield job, result
+    finally:
+        await writer.aclose()
+
+
 def run_inference(
     *,
     suite_id: str,
     test_cases: Iterable[Dict[str, Any]],
     model: str,
-    rendered_prompt: str,
+    rendered_prompt: str | None = None,
     params: Dict[str, Any] | None = None,
     max_concurrency: int = 10,
+    render: Optional[Callable[[Dict[str, Any]], str]] = None,
+    provider: Optional[Provider] = None,
 ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
     """
-    Synchronous wrapper used by the CLI.
+    Synchronous wrapper around run_inference_async.
+    Closes the provider's connections when done.
     """
     params = params or DEFAULT_PARAMS
 
-    return asyncio.run(
-        run_inference_async(
-            suite_id=suite_id,
-            test_cases=test_cases,
-            model=model,
-            rendered_prompt=rendered_prompt,
-            params=params,
-            max_concurrency=max_concurrency,
-        )
-    )
+    async def _run() -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        try:
+            return await run_inference_async(
+                suite_id=suite_id,
+                test_cases=test_cases,
+                model=model,
+                rendered_prompt=rendered_prompt,
+                params=params,
+                max_concurrency=max_concurrency,
+                render=render,
+                provider=provider,
+            )
+        finally:
+            if provider is not None:
+                await provider.aclose()
+
+    return asyncio.run(_run())
 
 
 def run(test_case: Dict[str, Any]) -> EvaluationResult:
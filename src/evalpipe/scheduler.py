@@ -0,0 +1,136 @@
+"""
+Bounded worker pool over a lazy stream of items.
+
+`workers` coroutines pull items one at a time from any iterator or async
+iterator and run `fn` on them. An item counts against the pool from the
+moment it's pulled until the caller has consumed its result, and at most
+`workers + buffer` items are alive at once, so memory stays flat however
+long the stream is. A slow consumer stops the workers from pulling.
+
+Results come out in input order by default, through a reorder buffer:
+one stalled item holds back what comes after it, but the other workers
+keep going until the buffer is full. With ordered=False, results come
+out as they complete.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, Iterable, Optional, Tuple, Union
+
+Items = Union[Iterable[Any], AsyncIterable[Any]]
+
+
+_END = object()
+
+
+async def worker_pool(
+    items: Items,
+    fn: Callable[[Any], Awaitable[Any]],
+    *,
+    workers: int,
+    buffer: Optional[int] = None,
+    ordered: bool = True,
+) -> AsyncIterator[Tuple[Any, Any]]:
+    """
+    Yields (item, fn(item)) pairs. `buffer` defaults to `workers`.
+    An exception from the source or from `fn` stops the pool and is
+    re-raised to the caller.
+    """
+    loop = asyncio.get_running_loop()
+    buffer = workers if buffer is None else buffer
+    is_async = hasattr(items, "__aiter__")
+    source: Any = items.__aiter__() if is_async else iter(items)
+    pull_lock = asyncio.Lock()
+
+    # Items pulled but not yet handed to the caller. A plain counter plus
+    # FIFO waiters: asyncio.Semaphore rescans all its waiters on every
+    # release, which showed up as the top cost at a million items.
+    free_slots = workers + buffer
+    slot_waiters: deque = deque()
+
+    finished: Dict[int, Tuple[Any, Any]] = {}  # ordered: seq -> result
+    ready: deque = deque()  # as completed
+    wake: Optional[asyncio.Future] = None
+    next_seq = 0
+    taken = 0
+    exhausted = False
+    running = workers
+    error: Optional[BaseException] = None
+
+    def notify() -> None:
+        if wake is not None and not wake.done():
+            wake.set_result(None)
+
+    async def take_slot() -> None:
+        nonlocal free_slots
+        while free_slots == 0:
+            waiter = loop.create_future()
+            slot_waiters.append(waiter)
+            await waiter
+        free_slots -= 1
+
+    def give_slot() -> None:
+        nonlocal free_slots
+        free_slots += 1
+        while slot_waiters:
+            waiter = slot_waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                break
+
+    async def worker() -> None:
+        nonlocal taken, exhausted, running, error
+        try:
+            while True:
+                await take_slot()
+                if is_async:
+                    # Async generators can't be advanced from two tasks at once.
+                    async with pull_lock:
+                        item = _END if exhausted else await anext(source, _END)
+                else:
+                    # next() never yields to the loop, so no lock needed.
+                    item = _END if exhausted else next(source, _END)
+                if item is _END:
+                    exhausted = True
+                    give_slot()
+                    return
+                seq = taken
+                taken += 1
+
+                result = await fn(item)
+                if ordered:
+                    finished[seq] = (item, result)
+                else:
+                    ready.append((item, result))
+                notify()
+        except Exception as e:
+            error = e
+        finally:
+            running -= 1
+            notify()
+
+    tasks = [asyncio.ensure_future(worker()) for _ in range(workers)]
+    try:
+        while True:
+            if error is not None:
+                raise error
+            if ordered and next_seq in finished:
+                item, result = finished.pop(next_seq)
+                next_seq += 1
+            elif not ordered and ready:
+                item, result = ready.popleft()
+            elif running == 0:
+                return
+            else:
+                wake = loop.create_future()
+                await wake
+                continue
+
+            give_slot()
+            yield item, result
+    finally:
+        # Consumer stopped early (or blew up): don't leave orphaned work.
+        for task in tasks:
+            task.cancel()
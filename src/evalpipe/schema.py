@@ -11,6 +11,7 @@ SUPPORTED_EVAL_TYPES = {
     "contains",
     "numeric",
     "schema",
+    "llm_judge",
 }
 
 
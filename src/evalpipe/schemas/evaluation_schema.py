@@ -12,6 +12,10 @@ class ProviderOutput:
     latency_ms: int
     prompt_tokens: Optional[int]
     completion_tokens: Optional[int]
+    # Only filled in for streamed completions.
+    ttft_ms: Optional[float] = None
+    inter_token_ms: Optional[float] = None
+    tokens_per_sec: Optional[float] = None
 
 
 @dataclass
@@ -0,0 +1,38 @@
+"""
+Deterministic suite sharding.
+
+A case's shard depends only on its id, so every process (or machine)
+splitting the same suite agrees on who runs what without coordinating,
+and adding cases to a suite doesn't reshuffle the existing ones.
+"""
+
+import hashlib
+from typing import Any, Dict, Iterable, Iterator, Tuple
+
+
+def shard_of(case_id: str, num_shards: int) -> int:
+    # sha256 rather than hash(): Python's str hash is salted per process.
+    digest = hashlib.sha256(case_id.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % num_shards
+
+
+def select_shard(
+    indexed_cases: Iterable[Tuple[int, Dict[str, Any]]],
+    num_shards: int,
+    shard_index: int,
+) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Keeps the (suite_index, test_case) pairs that belong to `shard_index`.
+    Suite indexes are passed through untouched so shards can be merged
+    back into suite order later.
+    """
+    if not 0 <= shard_index < num_shards:
+        raise ValueError(f"shard_index must be in [0, {num_shards}), got {shard_index}")
+
+    for index, tc in indexed_cases:
+        if num_shards == 1 or shard_of(tc["id"], num_shards) == shard_index:
+            yield index, tc
+
+
+def shard_tag(num_shards: int, shard_index: int) -> str:
+    return f"shard-{shard_index}-of-{num_shards}"
@@ -1,8 +1,18 @@
 import json
+import os
+import time
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable, Any
+from typing import Iterable, Iterator, Any, Dict, Optional
 from dataclasses import asdict, is_dataclass
 
+# Per-case artifacts, written in lockstep (one row per case in each).
+ARTIFACT_FILES = ("test_cases", "results", "evaluations")
+PROGRESS_FILE = "progress.json"
+
+# Progress manifest is rewritten at most this often while a run is going.
+CHECKPOINT_INTERVAL_SECONDS = 1.0
+
 def _serialize(obj: Any) -> Any:
     if is_dataclass(obj):
         return asdict(obj)
@@ -44,3 +54,135 @@ def write_run_artifacts(
     with open(run_dir / "meta.json", "w") as f:
         json.dump(_serialize(meta_out), f, indent=2)
 
+
+def read_jsonl(path: Path) -> Iterator[Any]:
+    with open(path, "r") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _count_complete_rows(path: Path) -> int:
+    count = 0
+    with open(path, "rb") as f:
+        for line in f:
+            # A crash mid-write leaves a partial last line behind.
+            if not line.endswith(b"\n"):
+                break
+            try:
+                json.loads(line)
+            except ValueError:
+                break
+            count += 1
+    return count
+
+
+def _truncate_rows(path: Path, keep: int) -> None:
+    with open(path, "rb+") as f:
+        for _ in range(keep):
+            f.readline()
+        f.truncate(f.tell())
+
+
+def recover_run_rows(run_dir: Path) -> int:
+    """
+    Trims per-case artifacts back to the last case that made it into
+    all of them, and returns how many cases that is.
+
+    Rows are written test case -> result -> evaluation, so a crash can
+    leave the files one row apart (or with a half-written line).
+    """
+    paths = [run_dir / f"{name}.jsonl" for name in ARTIFACT_FILES]
+    counts = [_count_complete_rows(p) if p.exists() else 0 for p in paths]
+    keep = min(counts)
+
+    for p in paths:
+        if p.exists():
+            _truncate_rows(p, keep)
+
+    return keep
+
+
+def load_progress(run_dir: Path) -> Dict[str, Any]:
+    path = run_dir / PROGRESS_FILE
+    if not path.exists():
+        raise FileNotFoundError(path)
+    return json.loads(path.read_text())
+
+
+def write_progress(run_dir: Path, progress: Dict[str, Any]) -> None:
+    # Write-then-rename so a crash never leaves a half-written manifest.
+    path = run_dir / PROGRESS_FILE
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_text(json.dumps(_serialize(progress), indent=2))
+    os.replace(tmp, path)
+
+
+class RunWriter:
+    """
+    Appends per-case rows to a run directory as they are produced.
+
+    write_run_artifacts needs every row up front; this keeps three file
+    handles open instead and flushes after every case, so a crashed run
+    keeps everything it finished. A small progress.json manifest records
+    how far the run got (see `evalpipe run --resume`).
+    """
+
+    def __init__(
+        self,
+        run_dir: Path,
+        *,
+        resume: bool = False,
+        progress: Optional[Dict[str, Any]] = None,
+        completed: int = 0,
+    ) -> None:
+        self.run_dir = run_dir
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        self.completed = completed
+        self.progress = dict(progress or {})
+        self._last_checkpoint = 0.0
+
+        mode = "a" if resume else "w"
+        self._files = {
+            name: open(run_dir / f"{name}.jsonl", mode)
+            for name in ARTIFACT_FILES
+        }
+        self.checkpoint(force=True)
+
+    def append(self, test_case: Any, result: Any, evaluation: Any) -> None:
+        for name, row in (
+            ("test_cases", test_case),
+            ("results", result),
+            ("evaluations", evaluation),
+        ):
+            f = self._files[name]
+            f.write(json.dumps(_serialize(row)) + "\n")
+            f.flush()
+        self.completed += 1
+
+    def checkpoint(self, *, status: str = "running", force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._last_checkpoint < CHECKPOINT_INTERVAL_SECONDS:
+            return
+        self._last_checkpoint = now
+
+        self.progress.update(
+            {
+                "status": status,
+                "completed": self.completed,
+                "updated_at": datetime.now(timezone.utc)
+                .isoformat()
+                .replace("+00:00", "Z"),
+            }
+        )
+        write_progress(self.run_dir, self.progress)
+
+    def close(self) -> None:
+        for f in self._files.values():
+            f.close()
+
+    def __enter__(self) -> "RunWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
@@ -0,0 +1,13 @@
+import pytest
+
+from mock_server import MockServer
+
+
+@pytest.fixture
+def mock_server():
+    """
+    Local OpenAI-compatible stub. Tweak `latency` / `rate_limit_every`
+    on the returned server before making calls.
+    """
+    with MockServer() as server:
+        yield server
@@ -0,0 +1,279 @@
+"""
+Local OpenAI-compatible stub server.
+
+Runs an asyncio HTTP server on a background thread so tests and
+benchmarks can exercise the real HTTP provider (connection pooling,
+rate limiting, retries) without network access or an API key.
+Answers come from runner.dummy_infer, so the bundled suites score the
+same as with the dummy provider. Requests with "stream": true get
+server-sent events, one word per event, paced by `ttft` and
+`token_interval`.
+
+    with MockServer(latency=0.02) as server:
+        provider = OpenAIProvider(base_url=server.base_url)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+
+class MockServer:
+    def __init__(
+        self,
+        *,
+        latency: float = 0.0,
+        rate_limit_every: int = 0,
+        ttft: float = 0.0,
+        token_interval: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        """
+        latency: seconds to wait before answering each request.
+        rate_limit_every: if set, every Nth request gets a 429.
+        ttft / token_interval: streamed responses send the first event
+            after `ttft` seconds and each following one `token_interval` later.
+        """
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.ttft = ttft
+        self.token_interval = token_interval
+        self.host = host
+        self.port = port
+
+        self.connections = 0
+        self.requests = 0
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    def start(self) -> "MockServer":
+        ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+
+        def serve() -> None:
+            asyncio.set_event_loop(self._loop)
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle, self.host, self.port)
+            )
+            self.port = self._server.sockets[0].getsockname()[1]
+            ready.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=serve, name="evalpipe-mock-server", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self) -> None:
+        if self._loop is None:
+            return
+
+        async def shutdown() -> None:
+            self._server.close()
+            await self._server.wait_closed()
+
+        asyncio.run_coroutine_threadsafe(shutdown(), self._loop).result(timeout=5)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._loop.close()
+        self._loop = None
+
+    def __enter__(self) -> "MockServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+
+                headers: Dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+                self.requests += 1
+                keep_alive = headers.get("connection", "").lower() != "close"
+
+                if method == "POST" and path.endswith("/chat/completions") and self._wants_stream(body):
+                    await self._stream_chat(writer, body, keep_alive)
+                else:
+                    status, extra_headers, payload = await self._respond(method, path, body)
+                    writer.write(self._head(status, keep_alive, {
+                        "Content-Type": "application/json",
+                        "Content-Length": str(len(payload)),
+                        **extra_headers,
+                    }) + payload)
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _wants_stream(body: bytes) -> bool:
+        try:
+            return bool(json.loads(body).get("stream"))
+        except (ValueError, AttributeError):
+            return False
+
+    @staticmethod
+    def _head(status: int, keep_alive: bool, headers: Dict[str, str]) -> bytes:
+        lines = [
+            f"HTTP/1.1 {status} {'OK' if status < 400 else 'Error'}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+            *(f"{k}: {v}" for k, v in headers.items()),
+        ]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def _stream_chat(self, writer: asyncio.StreamWriter, body: bytes, keep_alive: bool) -> None:
+        from evalpipe.runner import dummy_infer
+
+        request_no = self.requests
+        data = json.loads(body)
+        prompt = data["messages"][-1]["content"]
+
+        if self.rate_limit_every and request_no % self.rate_limit_every == 0:
+            payload = b'{"error": "rate limited"}'
+            writer.write(self._head(429, keep_alive, {
+                "Content-Type": "application/json",
+                "Content-Length": str(len(payload)),
+                "Retry-After": "0",
+            }) + payload)
+            return
+
+        writer.write(self._head(200, keep_alive, {
+            "Content-Type": "text/event-stream",
+            "Transfer-Encoding": "chunked",
+        }))
+        await writer.drain()
+
+        def send(event: Any) -> None:
+            raw = b"data: " + (event if isinstance(event, bytes) else json.dumps(event).encode()) + b"\n\n"
+            writer.write(f"{len(raw):x}\r\n".encode() + raw + b"\r\n")
+
+        output = await dummy_infer(prompt)
+        pieces = re.findall(r"\s*\S+", output)
+        await asyncio.sleep(self.ttft)
+        for i, piece in enumerate(pieces):
+            if i:
+                await asyncio.sleep(self.token_interval)
+            send({
+                "id": f"mock-{request_no}",
+                "object": "chat.completion.chunk",
+                "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+            })
+            await writer.drain()
+
+        if (data.get("stream_options") or {}).get("include_usage"):
+            send({
+                "id": f"mock-{request_no}",
+                "object": "chat.completion.chunk",
+                "choices": [],
+                "usage": {
+                    "prompt_tokens": len(prompt.split()),
+                    "completion_tokens": len(pieces),
+                    "total_tokens": len(prompt.split()) + len(pieces),
+                },
+            })
+        send(b"[DONE]")
+        writer.write(b"0\r\n\r\n")
+
+    async def _respond(self, method: str, path: str, body: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        from evalpipe.runner import dummy_infer
+
+        if method != "POST" or not path.endswith("/completions"):
+            return 404, {}, b'{"error": "not found"}'
+
+        request_no = self.requests
+        data = json.loads(body)
+        model = data.get("model", "mock")
+        if not path.endswith("/chat/completions"):
+            return await self._respond_completions(request_no, model, data)
+        prompt = data["messages"][-1]["content"]
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if self.rate_limit_every and request_no % self.rate_limit_every == 0:
+            return 429, {"Retry-After": "0"}, b'{"error": "rate limited"}'
+
+        output = await dummy_infer(prompt)
+        response = {
+            "id": f"mock-{request_no}",
+            "object": "chat.completion",
+            "model": model,
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": output},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": len(prompt.split()),
+                "completion_tokens": len(output.split()),
+                "total_tokens": len(prompt.split()) + len(output.split()),
+            },
+        }
+        return 200, {}, json.dumps(response).encode("utf-8")
+
+    async def _respond_completions(
+        self, request_no: int, model: str, data: Dict[str, Any]
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Legacy /completions: `prompt` may be a list, answered in one go
+        (one `latency` wait per request, however many prompts it has).
+        """
+        from evalpipe.runner import dummy_infer
+
+        prompts = data["prompt"] if isinstance(data["prompt"], list) else [data["prompt"]]
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if self.rate_limit_every and request_no % self.rate_limit_every == 0:
+            return 429, {"Retry-After": "0"}, b'{"error": "rate limited"}'
+
+        outputs = [await dummy_infer(p) for p in prompts]
+        prompt_tokens = sum(len(p.split()) for p in prompts)
+        completion_tokens = sum(len(o.split()) for o in outputs)
+        response = {
+            "id": f"mock-{request_no}",
+            "object": "text_completion",
+            "model": model,
+            "choices": [
+                {"index": i, "text": out, "finish_reason": "stop"}
+                for i, out in enumerate(outputs)
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+        return 200, {}, json.dumps(response).encode("utf-8")
@@ -0,0 +1,105 @@
+import asyncio
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from evalpipe import concurrency
+from evalpipe.cli import app
+from evalpipe.concurrency import AdaptiveLimiter
+from evalpipe.providers.openai_provider import OpenAIProvider
+from evalpipe.runner import run_inference_async
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SUITE = REPO_ROOT / "data" / "suites" / "basic_v1.jsonl"
+PROMPT = REPO_ROOT / "src" / "evalpipe" / "prompts" / "basic_v1.txt"
+
+
+def test_limiter_grows_then_backs_off_within_bounds():
+    limiter = AdaptiveLimiter(floor=2, ceiling=16)
+    assert limiter.limit == 2
+
+    for _ in range(100):
+        limiter.record(concurrency.OK, 10.0)
+    assert limiter.limit == 16
+
+    limiter.record(concurrency.RATE_LIMITED)
+    assert limiter.limit == 8
+
+    # Other errors don't say anything about load.
+    limiter.record(concurrency.ERROR)
+    assert limiter.limit == 8
+
+    for _ in range(10):
+        limiter._last_cut = 0.0
+        limiter.record(concurrency.TIMEOUT)
+    assert limiter.limit == 2
+    assert [p["reason"] for p in limiter.trace][-1] == "timeout"
+
+
+
+def test_limiter_rebaselines_after_a_lasting_latency_step():
+    limiter = AdaptiveLimiter(floor=2, ceiling=16)
+    for _ in range(100):
+        limiter.record(concurrency.OK, 10.0)
+    assert limiter.limit == 16
+
+    # The provider gets 10x slower and stays that way. Each sample is a
+    # round trip apart, so the cut cooldown never holds one back.
+    for _ in range(300):
+        limiter._last_cut = 0.0
+        limiter.record(concurrency.OK, 100.0)
+
+    assert "latency" in {p["reason"] for p in limiter.trace}
+    assert limiter.trace[-1]["reason"] == "increase"
+    assert limiter.limit == 16
+
+def test_429s_cut_the_limit_and_in_flight_stays_under_ceiling(tmp_path, monkeypatch, mock_server):
+    monkeypatch.chdir(tmp_path)  # fresh cache: every case has to hit the server
+    mock_server.latency = 0.005
+    mock_server.rate_limit_every = 5
+    provider = OpenAIProvider(base_url=mock_server.base_url)
+    limiter = AdaptiveLimiter(floor=1, ceiling=8)
+
+    async def go():
+        try:
+            return await run_inference_async(
+                suite_id="s",
+                test_cases=[{"id": f"c{i}", "input": f"q{i}"} for i in range(60)],
+                model="gpt-4o-mini",
+                rendered_prompt="sky?",
+                params={},
+                max_concurrency=8,
+                provider=provider,
+                limiter=limiter,
+            )
+        finally:
+            await provider.aclose()
+
+    results, _ = asyncio.run(go())
+
+    assert len(results) == 60
+    assert limiter.decreases > 0
+    assert "rate_limited" in {p["reason"] for p in limiter.trace}
+    assert all(1 <= p["limit"] <= 8 for p in limiter.trace)
+    assert provider.pool.connections_opened <= 8
+
+
+def test_cli_records_limit_trace(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    out = CliRunner().invoke(
+        app,
+        [
+            "run", str(SUITE), "--prompt", str(PROMPT),
+            "--adaptive-concurrency", "--min-concurrency", "2", "--max-concurrency", "8",
+        ],
+    )
+    assert out.exit_code == 0, out.output
+
+    run_dir = next((tmp_path / "runs").iterdir())
+    meta = json.loads((run_dir / "meta.json").read_text())
+    limits = meta["stages"]["inference"]["concurrency"]
+    assert limits["mode"] == "adaptive"
+    assert (limits["floor"], limits["ceiling"]) == (2, 8)
+    assert limits["trace"][0] == {"t": limits["trace"][0]["t"], "limit": 2, "reason": "start"}
@@ -0,0 +1,96 @@
+import asyncio
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from evalpipe.cache import simple_cache
+from evalpipe.cli import app
+from evalpipe.providers import BatchingProvider
+from evalpipe.providers.openai_provider import OpenAIProvider
+from evalpipe.runner import run_inference_async
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SUITE = REPO_ROOT / "data" / "suites" / "basic_v1.jsonl"
+PROMPT = REPO_ROOT / "src" / "evalpipe" / "prompts" / "basic_v1.txt"
+
+QUESTIONS = ["What is 17 * 24?", "Is the sky blue?", "How many days are in a week?"]
+
+
+def test_batches_split_back_per_case(tmp_path, monkeypatch, mock_server):
+    monkeypatch.chdir(tmp_path)
+    mock_server.latency = 0.01
+    provider = BatchingProvider(
+        OpenAIProvider(base_url=mock_server.base_url, batch_completions=True),
+        max_batch_size=8,
+        max_wait_ms=50,
+    )
+    cases = [{"id": f"c{i}", "q": QUESTIONS[i % 3] + f" ({i})"} for i in range(24)]
+
+    async def go():
+        try:
+            return await run_inference_async(
+                suite_id="s",
+                test_cases=cases,
+                model="gpt-4o-mini",
+                params={},
+                max_concurrency=24,
+                render=lambda tc: tc["q"],
+                provider=provider,
+            )
+        finally:
+            await provider.aclose()
+
+    results, errors = asyncio.run(go())
+
+    assert not errors
+    assert [r["output"] for r in results[:3]] == ["408", "YES", "7"]
+    assert all(r["prompt_tokens"] > 0 for r in results)
+    assert mock_server.requests == 3
+    assert provider.stats()["batching"]["largest_batch"] == 8
+    assert len(simple_cache.get_store()) == 24
+
+
+def test_lone_call_goes_out_after_linger():
+    calls = []
+
+    class Inner:
+        name, version = "fake", "v0"
+
+        async def infer_batch(self, prompts, *, model, params):
+            calls.append(list(prompts))
+            return [type("Out", (), {"output": p.upper()})() for p in prompts]
+
+        def stats(self):
+            return {}
+
+        async def aclose(self):
+            pass
+
+    provider = BatchingProvider(Inner(), max_batch_size=16, max_wait_ms=5)
+    out = asyncio.run(provider.infer("hi", model="m", params={}))
+
+    assert out.output == "HI"
+    assert calls == [["hi"]]
+
+
+def test_cli_batch_size(tmp_path, monkeypatch, mock_server):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("OPENAI_BASE_URL", mock_server.base_url)
+
+    out = CliRunner().invoke(
+        app,
+        [
+            "run", str(SUITE), "--prompt", str(PROMPT),
+            "--provider", "openai", "--model", "gpt-4o-mini",
+            "--batch-size", "8", "--max-concurrency", "32",
+        ],
+    )
+    assert out.exit_code == 0, out.output
+
+    run_dir = next((tmp_path / "runs").iterdir())
+    meta = json.loads((run_dir / "meta.json").read_text())
+    batching = meta["stages"]["inference"]["provider"]["batching"]
+    assert batching["prompts"] == 31
+    assert batching["batches"] < 31
+    assert mock_server.requests == batching["batches"]
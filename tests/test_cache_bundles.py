@@ -0,0 +1,75 @@
+import gzip
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from evalpipe.cache import simple_cache
+from evalpipe.cache.bundle import BundleError, export_bundle, import_bundle
+from evalpipe.cache.store import CacheStore
+from evalpipe.cli import app
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SUITE = REPO_ROOT / "data" / "suites" / "basic_v1.jsonl"
+PROMPT = REPO_ROOT / "src" / "evalpipe" / "prompts" / "basic_v1.txt"
+
+
+def test_round_trip_skips_existing_and_filters(tmp_path):
+    source = CacheStore(tmp_path / "source.db")
+    source.put_many((f"k{i}", {"id": f"case_{i % 5}", "model": "a" if i % 2 else "b", "output": str(i)}) for i in range(20))
+
+    bundle = tmp_path / "bundle.jsonl.gz"
+    assert export_bundle(source, bundle, models=["a"], test_ids={"case_1", "case_3"}) == 4
+
+    target = CacheStore(tmp_path / "target.db")
+    target.put("k1", {"id": "case_1", "model": "a", "output": "kept"})
+    assert import_bundle(target, bundle, batch_size=2) == (3, 1)
+    assert len(target) == 4
+    assert target.get("k1")["output"] == "kept"
+    assert target.get("k3") == source.get("k3")
+
+
+def test_damaged_bundle_is_rejected_before_writing(tmp_path):
+    source = CacheStore(tmp_path / "source.db")
+    source.put_many((f"k{i}", {"output": str(i)}) for i in range(10))
+    bundle = tmp_path / "bundle.jsonl.gz"
+    export_bundle(source, bundle)
+
+    lines = gzip.decompress(bundle.read_bytes()).splitlines(keepends=True)
+    bundle.write_bytes(gzip.compress(b"".join(lines[:-2] + lines[-1:])))  # one entry dropped
+
+    target = CacheStore(tmp_path / "target.db")
+    with pytest.raises(BundleError):
+        import_bundle(target, bundle)
+    assert len(target) == 0
+
+    bundle.write_bytes(gzip.compress(b"".join(lines))[:-20])  # cut short
+    with pytest.raises(BundleError):
+        import_bundle(target, bundle)
+
+
+def test_cli_warms_a_fresh_cache(tmp_path, monkeypatch):
+    cli = CliRunner()
+    warm, fresh = tmp_path / "warm", tmp_path / "fresh"
+    warm.mkdir()
+    fresh.mkdir()
+    bundle = tmp_path / "bundle.jsonl.gz"
+
+    monkeypatch.chdir(warm)
+    out = cli.invoke(app, ["run", str(SUITE), "--prompt", str(PROMPT)])
+    assert out.exit_code == 0, out.output
+    out = cli.invoke(app, ["cache", "export", "--suite", str(SUITE), "--model", "dummy-v0", "-o", str(bundle)])
+    assert out.exit_code == 0, out.output
+    assert "Exported 31 entries" in out.output
+
+    monkeypatch.chdir(fresh)
+    out = cli.invoke(app, ["cache", "import", str(bundle)])
+    assert out.exit_code == 0, out.output
+    assert "Imported 31 entries (0 already cached)" in out.output
+    out = cli.invoke(app, ["cache", "import", str(bundle)])
+    assert "Imported 0 entries (31 already cached)" in out.output
+
+    out = cli.invoke(app, ["run", str(SUITE), "--prompt", str(PROMPT)])
+    assert out.exit_code == 0, out.output
+    assert simple_cache.get_store().stats()["recent_hit_rate"] == 1.0
+    simple_cache.close_stores()
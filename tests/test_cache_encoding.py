@@ -0,0 +1,49 @@
+import json
+import sqlite3
+
+from evalpipe.cache import codec
+from evalpipe.cache.store import CacheStore
+
+
+def _row(prompt, model):
+    return {"id": "c1", "prompt": prompt, "output": "x " * 400, "model": model, "cache_hit": False}
+
+
+def test_long_prompts_are_stored_once(tmp_path):
+    store = CacheStore(tmp_path / "cache.db")
+    prompt = "Context: " + "lorem ipsum " * 500
+    store.put_many((f"k{m}", _row(prompt, f"model-{m}")) for m in range(3))
+    store.put("short", _row("What is 2+2?", "model-0"))
+
+    conn = sqlite3.connect(tmp_path / "cache.db")
+    assert conn.execute("SELECT COUNT(*) FROM prompts").fetchone()[0] == 1
+    values = dict(conn.execute("SELECT key, value FROM entries"))
+    assert values["k0"][:2] == bytes((codec.FORMAT_VERSION, codec.ZLIB))
+
+    found = store.get_many(["k0", "k1", "k2"])
+    assert found["k1"] == _row(prompt, "model-1")
+    assert list(found["k1"]) == list(_row(prompt, "model-1"))  # field order survives
+    assert store.get("short") == _row("What is 2+2?", "model-0")
+
+    store.prune(max_bytes=0)
+    assert conn.execute("SELECT COUNT(*) FROM prompts").fetchone()[0] == 0
+
+
+def test_reads_and_compacts_old_json_rows(tmp_path):
+    path = tmp_path / "cache.db"
+    row = _row("Context: " + "dolor sit amet " * 200, "m")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE entries (key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID")
+    conn.execute("INSERT INTO entries VALUES ('old', ?)", (json.dumps(row, indent=2),))
+    conn.execute("PRAGMA user_version = 1")
+    conn.commit()
+    conn.close()
+
+    store = CacheStore(path)
+    assert store.get("old") == row
+    before = store.stats()["bytes"]
+
+    assert store.compact() == 1
+    assert store.compact() == 0
+    assert store.get("old") == row
+    assert store.stats()["bytes"] < before / 4
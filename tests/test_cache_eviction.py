@@ -0,0 +1,75 @@
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from evalpipe.cache import simple_cache
+from evalpipe.cache.store import CacheStore, parse_age, parse_size
+from evalpipe.cli import app
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SUITE = REPO_ROOT / "data" / "suites" / "basic_v1.jsonl"
+PROMPT = REPO_ROOT / "src" / "evalpipe" / "prompts" / "basic_v1.txt"
+
+
+def test_prune_evicts_least_recently_used_then_by_age(tmp_path):
+    store = CacheStore(tmp_path / "cache.db")
+    store.put_many((f"k{i}", {"model": "m", "output": "x" * 100}) for i in range(10))
+    entry_size = store.stats()["bytes"] // 10
+
+    time.sleep(0.01)
+    store.get_many(["k0", "k1"])  # recently used: must survive
+
+    removed, freed = store.prune(max_bytes=entry_size * 4)
+    assert (removed, freed) == (6, entry_size * 6)
+    assert {"k0", "k1"} <= set(store.get_many(f"k{i}" for i in range(10)))
+
+    time.sleep(0.05)
+    store.get("k0")
+    removed, _ = store.prune(max_age=0.04)
+    assert removed == 3
+    assert len(store) == 1
+
+
+def test_cli_stats_and_prune(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cli = CliRunner()
+    for _ in range(2):
+        out = cli.invoke(app, ["run", str(SUITE), "--prompt", str(PROMPT)])
+        assert out.exit_code == 0, out.output
+
+    out = cli.invoke(app, ["cache", "stats", "--json"])
+    assert out.exit_code == 0, out.output
+    stats = json.loads(out.output)
+    assert stats["entries"] == 31
+    assert stats["by_model"]["dummy-v0"]["entries"] == 31
+    # First run all misses, second all hits.
+    assert stats["recent_runs"] == 2 and stats["recent_hit_rate"] == 0.5
+
+    out = cli.invoke(app, ["cache", "prune", "--max-size", "1KB"])
+    assert out.exit_code == 0, out.output
+    assert simple_cache.get_store().stats()["bytes"] <= 1024
+    simple_cache.close_stores()
+
+
+def test_old_cache_files_are_upgraded(tmp_path):
+    path = tmp_path / "cache.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE entries (key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID")
+    conn.execute("INSERT INTO entries VALUES ('k', '{\"model\":\"m\"}')")
+    conn.execute("PRAGMA user_version = 1")
+    conn.commit()
+    conn.close()
+
+    stats = CacheStore(path).stats()
+
+    assert stats["by_model"] == {"m": {"entries": 1, "bytes": 13}}
+
+
+def test_parse_limits():
+    assert parse_size("2MB") == 2 * 1024**2
+    assert parse_size("512") == 512
+    assert parse_age("7d") == 7 * 86400
+    assert parse_age("90m") == 5400
@@ -0,0 +1,96 @@
+import asyncio
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from evalpipe.cache import simple_cache
+from evalpipe.cache.store import CacheStore
+from evalpipe.cache.tiered import TieredCache
+from evalpipe.cache.writer import CacheWriter
+from evalpipe.cli import app
+from evalpipe.concurrency import FixedLimiter
+from evalpipe.providers.dummy import DummyProvider
+from evalpipe.runner import run_inference_async
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SUITE = REPO_ROOT / "data" / "suites" / "basic_v1.jsonl"
+PROMPT = REPO_ROOT / "src" / "evalpipe" / "prompts" / "basic_v1.txt"
+
+
+class CountingLimiter(FixedLimiter):
+    def __init__(self, limit: int) -> None:
+        super().__init__(limit)
+        self.entered = 0
+
+    async def __aenter__(self) -> None:
+        self.entered += 1
+        await super().__aenter__()
+
+
+def _run(cases, limiter, provider):
+    return asyncio.run(
+        run_inference_async(
+            suite_id="s",
+            test_cases=iter(cases),
+            model="m",
+            rendered_prompt="What is gravity?",
+            params={},
+            max_concurrency=4,
+            limiter=limiter,
+            provider=provider,
+        )
+    )
+
+
+def test_warm_rerun_skips_limiter_and_provider(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cases = [{"id": str(i)} for i in range(300)]
+
+    cold = CountingLimiter(4)
+    results, _ = _run(cases, cold, DummyProvider())
+    assert cold.entered == 300
+    assert len(simple_cache.get_store()) == 300
+
+    # Fresh process state: hits come from the bulk disk lookup.
+    simple_cache.close_stores()
+    warm, provider = CountingLimiter(4), DummyProvider()
+    results, errors = _run(cases, warm, provider)
+
+    assert errors == []
+    assert [r["id"] for r in results] == [c["id"] for c in cases]
+    assert all(r["cache_hit"] for r in results)
+    assert warm.entered == 0
+    assert provider.requests == 0
+    simple_cache.close_stores()
+
+
+def test_writer_batches_rows_behind(tmp_path):
+    cache = TieredCache(CacheStore(tmp_path / "cache.db"))
+
+    async def main():
+        writer = CacheWriter(cache, batch_size=50, max_wait_ms=1000)
+        for i in range(120):
+            writer.put(f"k{i}", {"output": i})
+        # Visible in memory straight away, before anything hits disk.
+        assert cache.recall("k119") == {"output": 119}
+        await writer.aclose()
+        return writer.stats()
+
+    stats = asyncio.run(main())
+
+    assert stats == {"batches": 3, "rows": 120, "failed_batches": 0}
+    assert len(cache.store) == 120
+
+
+def test_persisted_rows_are_the_response_only(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    out = CliRunner().invoke(app, ["run", str(SUITE), "--prompt", str(PROMPT)])
+    assert out.exit_code == 0, out.output
+    simple_cache.close_stores()
+
+    rows = [row for _, row in CacheStore(tmp_path / ".cache" / "cache.db").iter_entries()]
+    assert len(rows) == 31
+    for row in rows:
+        # Fields the pipeline adds after inference stay out of the cache.
+        assert "rendered_prompt" not in row and "prompt_version" not in row
+        assert row["prompt"].startswith("You are a helpful assistant.")
@@ -0,0 +1,60 @@
+import json
+import multiprocessing
+
+from typer.testing import CliRunner
+
+from evalpipe.cache import simple_cache
+from evalpipe.cache.store import CacheStore
+from evalpipe.cli import app
+
+
+def _write_range(path, start, count):
+    store = CacheStore(path)
+    for i in range(start, start + count, 10):
+        store.put_many((f"k{j}", {"output": str(j)}) for j in range(i, i + 10))
+    store.close()
+
+
+def test_batched_reads_and_writes(tmp_path):
+    store = CacheStore(tmp_path / "cache.db")
+    store.put_many((f"k{i}", {"output": str(i)}) for i in range(1200))
+    store.put("k0", {"output": "replaced"})
+
+    found = store.get_many([f"k{i}" for i in range(0, 1500, 100)])
+
+    assert len(store) == 1200
+    assert sorted(found) == sorted(f"k{i}" for i in range(0, 1200, 100))
+    assert found["k0"] == {"output": "replaced"}
+    assert store.get("missing") is None
+
+
+def test_processes_share_one_store(tmp_path):
+    path = tmp_path / "cache.db"
+    CacheStore(path).close()
+
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=_write_range, args=(path, n * 500, 500)) for n in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+
+    assert all(p.exitcode == 0 for p in procs)
+    assert len(CacheStore(path)) == 2000
+
+
+def test_cli_migrates_json_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    legacy = tmp_path / ".cache"
+    legacy.mkdir()
+    for i in range(5):
+        (legacy / f"key{i}.json").write_text(json.dumps({"output": i}, indent=2))
+    (legacy / "broken.json").write_text("{not json")
+
+    out = CliRunner().invoke(app, ["cache", "migrate", "--delete"])
+
+    assert out.exit_code == 0, out.output
+    assert "Migrated 5 entries" in out.output
+    assert simple_cache.load_from_cache("key3") == {"output": 3}
+    assert sorted(f.name for f in legacy.glob("*.json")) == ["broken.json"]
+    simple_cache.close_stores()
@@ -0,0 +1,69 @@
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from evalpipe.cache.store import CacheStore
+from evalpipe.cache.tiered import TieredCache
+from evalpipe.cli import app
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SUITE = REPO_ROOT / "data" / "suites" / "basic_v1.jsonl"
+PROMPT = REPO_ROOT / "src" / "evalpipe" / "prompts" / "basic_v1.txt"
+
+
+def test_memory_tier_is_lru_and_writes_through(tmp_path):
+    cache = TieredCache(CacheStore(tmp_path / "cache.db"), max_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, {"output": key})
+
+    # "a" fell out of memory but was written through to disk.
+    assert cache.get("a") == {"output": "a"}
+    assert cache.get("c") == {"output": "c"}
+    stats = cache.stats()
+    assert (stats["memory"]["hits"], stats["disk"]["hits"]) == (1, 1)
+    assert stats["memory"]["evictions"] == 2
+    assert stats["disk"]["writes"] == 3
+
+    # Callers can't mutate what's cached.
+    cache.get("c")["cache_hit"] = True
+    assert cache.get("c") == {"output": "c"}
+
+
+def test_byte_budget(tmp_path):
+    cache = TieredCache(CacheStore(tmp_path / "cache.db"), max_bytes=300)
+    for i in range(10):
+        cache.put(f"k{i}", {"output": "x" * 90})
+
+    assert cache.stats()["memory"]["entries"] == 3
+    assert cache.stats()["memory"]["bytes"] <= 300
+
+
+def test_matrix_run_reports_tiers_in_meta(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    # Same model twice: the second cell's lookups are answered from memory.
+    out = CliRunner().invoke(
+        app,
+        ["run", str(SUITE), "--prompt", str(PROMPT), "--prompt", str(PROMPT), "--no-coalesce", "--max-concurrency", "1"],
+    )
+    assert out.exit_code == 0, out.output
+
+    run_dir = next((tmp_path / "runs").iterdir())
+    cell = next(d for d in run_dir.iterdir() if d.is_dir())
+    cache = json.loads((cell / "meta.json").read_text())["stages"]["cache"]
+    assert cache["memory"]["hits"] == 31
+    assert cache["disk"]["hits"] == 0
+    assert cache["disk"]["writes"] == 31
+
+
+def test_cold_run_counts_one_memory_miss_per_case(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    out = CliRunner().invoke(app, ["run", str(SUITE), "--prompt", str(PROMPT)])
+    assert out.exit_code == 0, out.output
+
+    run_dir = next((tmp_path / "runs").iterdir())
+    cache = json.loads((run_dir / "meta.json").read_text())["stages"]["cache"]
+    # Prefetched, then re-checked before calling out: still one lookup each.
+    assert (cache["memory"]["hits"], cache["memory"]["misses"]) == (0, 31)
+    assert cache["disk"]["misses"] == 31
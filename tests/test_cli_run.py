@@ -0,0 +1,41 @@
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from evalpipe.cli import app
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SUITE = REPO_ROOT / "data" / "suites" / "basic_v1.jsonl"
+PROMPT = REPO_ROOT / "src" / "evalpipe" / "prompts" / "basic_v1.txt"
+
+
+def _read_jsonl(path: Path):
+    return [json.loads(line) for line in path.read_text().splitlines() if line.strip()]
+
+
+def test_run_writes_results_in_suite_order(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    out = CliRunner().invoke(
+        app,
+        ["run", str(SUITE), "--prompt", str(PROMPT), "--max-concurrency", "4"],
+    )
+    assert out.exit_code == 0, out.output
+
+    run_dir = next((tmp_path / "runs").iterdir())
+    suite_ids = [row["id"] for row in _read_jsonl(SUITE)]
+    results = _read_jsonl(run_dir / "results.jsonl")
+    evaluations = _read_jsonl(run_dir / "evaluations.jsonl")
+
+    assert [r["id"] for r in results] == suite_ids
+    assert [e["id"] for e in evaluations] == suite_ids
+    assert results[0]["output"] == "408"
+    assert results[0]["prompt_version"] == "basic_v1"
+    assert "17 * 24" in results[0]["rendered_prompt"]
+
+    summary = json.loads((run_dir / "summary.json").read_text())
+    assert summary["total_tests"] == len(suite_ids)
+
+    meta = json.loads((run_dir / "meta.json").read_text())
+    assert meta["stages"]["evaluation"]["cases"] == len(suite_ids)
@@ -0,0 +1,71 @@
+import asyncio
+
+import evalpipe.runner as runner
+from evalpipe.cache import simple_cache
+from evalpipe.coalesce import RequestCoalescer
+
+
+def _run(suite_id, test_cases, coalescer):
+    return asyncio.run(
+        runner.run_inference_async(
+            suite_id=suite_id,
+            test_cases=test_cases,
+            model="m1",
+            rendered_prompt="What is 17 * 24?",
+            params={"temperature": 0.0},
+            max_concurrency=10,
+            coalescer=coalescer,
+        )
+    )
+
+
+def test_identical_requests_share_one_call(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    calls = []
+
+    async def counting_infer(prompt: str) -> str:
+        calls.append(prompt)
+        await asyncio.sleep(0.01)
+        return "408"
+
+    monkeypatch.setattr(runner, "dummy_infer", counting_infer)
+    coalescer = RequestCoalescer()
+
+    results, errors = _run("s1", [{"id": f"c{i}"} for i in range(20)], coalescer)
+
+    assert not errors
+    assert len(calls) == 1
+    assert [r["id"] for r in results] == [f"c{i}" for i in range(20)]
+    assert {r["output"] for r in results} == {"408"}
+    assert sum(r["coalesced"] for r in results) == 19
+    assert sum(r["attempts"] for r in results) == 1
+    # Each case still gets its own cache entry.
+    assert len(simple_cache.get_store()) == 20
+
+    # Another suite (other ids, same prompt) reuses the finished response.
+    memo_hits = coalescer.stats()["memo_hits"]
+    results, _ = _run("s2", [{"id": "x"}, {"id": "y"}], coalescer)
+    assert len(calls) == 1
+    assert all(r["coalesced"] for r in results)
+    assert coalescer.stats()["memo_hits"] == memo_hits + 2
+
+
+def test_failures_are_shared_but_not_remembered(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(runner, "MAX_RETRIES", 0)
+    calls = []
+
+    async def failing_infer(prompt: str) -> str:
+        calls.append(prompt)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(runner, "dummy_infer", failing_infer)
+    coalescer = RequestCoalescer()
+
+    _, errors = _run("s1", [{"id": "a"}, {"id": "b"}], coalescer)
+    assert len(errors) == 2
+    assert len(calls) == 1
+
+    _run("s1", [{"id": "c"}], coalescer)
+    assert len(calls) == 2
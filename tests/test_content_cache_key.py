@@ -0,0 +1,56 @@
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from evalpipe.cache import simple_cache
+from evalpipe.cache.simple_cache import make_content_key, normalize_prompt
+from evalpipe.cache.store import CacheStore
+from evalpipe.cli import app
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SUITE = REPO_ROOT / "data" / "suites" / "basic_v1.jsonl"
+PROMPT = REPO_ROOT / "src" / "evalpipe" / "prompts" / "basic_v1.txt"
+
+
+def test_normalized_prompts_share_a_key():
+    assert normalize_prompt("Café \t time  \r\n\n\n\nNext  ") == "Café time\n\nNext"
+
+    key = lambda prompt, version="dummy/v0": make_content_key(
+        model="m", prompt=prompt, params={"temperature": 0}, provider_version=version
+    )
+    assert key("Task:\n  What is 2+2?\n") == key("Task:\nWhat is 2+2?")
+    assert key("Task: What is 2+2?") != key("Task:\nWhat is 2+2?")
+    assert key("What is 2+2?") != key("What is 2+2?", version="dummy/v1")
+
+
+def test_copied_suite_reuses_responses(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # Same cases under new ids, in a new suite, with a reformatted template.
+    copy = tmp_path / "copied_v1.jsonl"
+    rows = [json.loads(line) for line in SUITE.read_text().splitlines() if line.strip()]
+    copy.write_text("".join(json.dumps({**r, "id": "copy_" + r["id"]}) + "\n" for r in rows))
+    prompt = tmp_path / "reformatted.txt"
+    prompt.write_text(PROMPT.read_text().replace("\n", "  \n"))
+
+    cli = CliRunner()
+    out = cli.invoke(app, ["run", str(SUITE), "--prompt", str(PROMPT), "--cache-key", "content"])
+    assert out.exit_code == 0, out.output
+    out = cli.invoke(app, ["run", str(copy), "--prompt", str(prompt), "--cache-key", "content"])
+    assert out.exit_code == 0, out.output
+
+    run_dir = max((tmp_path / "runs").iterdir())
+    summary = json.loads((run_dir / "summary.json").read_text())
+    assert summary["cache"] == {"hits": 31, "exact_hits": 0, "content_hits": 31, "hit_rate": 1.0}
+    first = json.loads((run_dir / "results.jsonl").read_text().splitlines()[0])
+    assert first["id"].startswith("copy_") and first["cache_match"] == "content"
+
+    # What's on disk is one response per case, stored under both its
+    # exact and content keys, with nothing the pipeline tagged on later.
+    simple_cache.close_stores()
+    stored = [row for _, row in CacheStore(tmp_path / ".cache" / "cache.db").iter_entries()]
+    assert len(stored) == 2 * len(rows)
+    assert sorted(row["id"] for row in stored) == sorted(r["id"] for r in rows for _ in range(2))
+    for row in stored:
+        assert not {"rendered_prompt", "prompt_version", "cache_match"} & row.keys()
+        assert row["prompt"].startswith("You are a helpful assistant.")
@@ -0,0 +1,75 @@
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from evalpipe.cli import app
+from evalpipe.early_stop import NO_REGRESSION, REGRESSION, EarlyStopper
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PROMPT = REPO_ROOT / "src" / "evalpipe" / "prompts" / "basic_v1.txt"
+
+
+def _feed(stopper, outcomes, category="c"):
+    for ok in outcomes:
+        stopper.add({"category": category}, {"passed": ok})
+        if stopper.settled:
+            break
+
+
+def test_stopper_calls_a_clear_regression_early():
+    baseline = {"pass_rate": 0.9, "by_category": {"c": {"total": 100, "passed": 90}}}
+    stopper = EarlyStopper(baseline)
+
+    # 50% pass rate against a 90% baseline.
+    _feed(stopper, [i % 2 == 0 for i in range(5000)])
+
+    assert stopper.verdict == REGRESSION
+    assert stopper.settled_at < 200
+
+
+def test_stopper_clears_a_run_within_margin_and_not_without():
+    baseline = {"pass_rate": 0.5, "by_category": {"c": {"total": 10, "passed": 5}}}
+
+    with_margin = EarlyStopper(baseline, margin=0.1)
+    _feed(with_margin, [True] * 5000)
+    assert with_margin.verdict == NO_REGRESSION
+
+    # Same pass rate as the baseline: can't be told apart without a margin.
+    exact = EarlyStopper(baseline)
+    _feed(exact, [i % 2 == 0 for i in range(2000)])
+    assert exact.verdict is None
+
+
+def test_cli_early_stop_stops_scheduling(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    suite = tmp_path / "suite.jsonl"
+    with suite.open("w") as f:
+        for i in range(3000):
+            # The dummy answers "7" to every one of these; a third expect "8".
+            expected = "8" if i % 3 == 0 else "7"
+            f.write(json.dumps({
+                "id": f"t{i}",
+                "category": "week",
+                "prompt": f"How many days are in a week? ({i})",
+                "expected": expected,
+                "evaluation": {"type": "exact_match"},
+            }) + "\n")
+    baseline = tmp_path / "baseline"
+    baseline.mkdir()
+    (baseline / "summary.json").write_text(json.dumps({
+        "run_id": "base", "pass_rate": 1.0, "by_category": {"week": {"total": 3000, "passed": 3000}},
+    }))
+
+    out = CliRunner().invoke(
+        app, ["run", str(suite), "--prompt", str(PROMPT), "--baseline", str(baseline), "--early-stop"]
+    )
+    assert out.exit_code == 1, out.output
+    assert "Stopped early" in out.output
+
+    run_dir = next((tmp_path / "runs").iterdir())
+    summary = json.loads((run_dir / "summary.json").read_text())
+    early = summary["early_stop"]
+    assert early["stopped"] and early["verdict"] == REGRESSION
+    assert early["evaluated"] == summary["total_tests"] < 500
+    assert len((run_dir / "results.jsonl").read_text().splitlines()) == early["evaluated"]
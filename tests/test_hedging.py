@@ -0,0 +1,104 @@
+import asyncio
+import json
+import time
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from evalpipe.cli import app
+from evalpipe.hedging import Hedger
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SUITE = REPO_ROOT / "data" / "suites" / "basic_v1.jsonl"
+PROMPT = REPO_ROOT / "src" / "evalpipe" / "prompts" / "basic_v1.txt"
+
+
+async def _warm_up(hedger, n=30):
+    async def fast():
+        await asyncio.sleep(0.001)
+        return "fast"
+
+    for _ in range(n):
+        await hedger.call("m", fast)
+
+
+def test_stalled_call_is_hedged_and_loser_cancelled():
+    hedger = Hedger(holdout_fraction=0.0, max_extra_fraction=0.5)
+    cancelled = []
+    attempts = []
+
+    async def stall_first_time():
+        attempts.append(1)
+        if len(attempts) == 1:
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+        await asyncio.sleep(0.001)
+        return "hedge"
+
+    async def go():
+        await _warm_up(hedger)
+        start = time.perf_counter()
+        result = await hedger.call("m", stall_first_time)
+        await asyncio.sleep(0)
+        return result, time.perf_counter() - start
+
+    result, elapsed = asyncio.run(go())
+
+    assert result == "hedge"
+    assert elapsed < 1
+    assert cancelled == [True]
+    stats = hedger.stats()["m"]
+    assert (stats["hedges"], stats["hedge_wins"]) == (1, 1)
+
+
+
+def test_hedge_waits_for_admission():
+    hedger = Hedger(holdout_fraction=0.0, max_extra_fraction=0.5)
+    attempts = []
+
+    async def slow():
+        attempts.append(1)
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    async def go():
+        await _warm_up(hedger)
+        return await hedger.call("m", slow, admit_hedge=lambda: False)
+
+    # No room in the rate limits: the slow call just runs on, alone.
+    assert asyncio.run(go()) == "ok"
+    assert len(attempts) == 1
+    stats = hedger.stats()["m"]
+    assert (stats["hedges"], stats["hedges_refused"]) == (0, 1)
+
+def test_extra_calls_are_capped():
+    hedger = Hedger(holdout_fraction=0.0, max_extra_fraction=0.1)
+
+    async def slow():
+        await asyncio.sleep(0.02)
+        return "ok"
+
+    async def go():
+        await _warm_up(hedger)
+        await asyncio.gather(*(hedger.call("m", slow) for _ in range(100)))
+
+    asyncio.run(go())
+
+    stats = hedger.stats()["m"]
+    assert stats["hedges"] > 0
+    assert stats["hedges"] <= 0.1 * stats["calls"]
+
+
+def test_cli_reports_hedging(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    out = CliRunner().invoke(app, ["run", str(SUITE), "--prompt", str(PROMPT), "--hedge", "--no-coalesce"])
+    assert out.exit_code == 0, out.output
+
+    run_dir = next((tmp_path / "runs").iterdir())
+    summary = json.loads((run_dir / "summary.json").read_text())
+    assert summary["hedging"]["calls"] + summary["hedging"]["holdout_calls"] == 31
+    assert "## Hedging" in (run_dir / "report.md").read_text()
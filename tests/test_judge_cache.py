@@ -0,0 +1,75 @@
+import json
+import sqlite3
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from evalpipe.cache import simple_cache
+from evalpipe.cli import app
+from evalpipe.judge.cache import cached_judgment
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+PROMPT = REPO_ROOT / "src" / "evalpipe" / "prompts" / "basic_v1.txt"
+
+
+def test_verdicts_are_reused_until_an_input_changes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    calls = []
+
+    def judge(**key):
+        return cached_judgment(**key, judge=lambda: calls.append(key) or {"passed": True})
+
+    base = {"judge_model": "j", "rubric": "r1", "prompt": "p", "output": "o"}
+    assert judge(**base) == {"model": "j", "passed": True, "cache_hit": False}
+    assert judge(**base)["cache_hit"]
+    for change in ({"judge_model": "j2"}, {"rubric": "r2"}, {"output": "o2"}):
+        assert not judge(**{**base, **change})["cache_hit"]
+    assert len(calls) == 4
+    simple_cache.close_stores()
+
+
+def test_rerun_reports_judge_hits(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    suite = tmp_path / "judged.jsonl"
+    suite.write_text(
+        "".join(
+            json.dumps({"id": f"j{i}", "category": "judged", "prompt": f"Explain thing {i}", "evaluation": {"type": "llm_judge"}}) + "\n"
+            for i in range(4)
+        )
+    )
+
+    def run():
+        out = CliRunner().invoke(app, ["run", str(suite), "--prompt", str(PROMPT), "--eval-executor", "process"])
+        assert out.exit_code == 0, out.output
+        return json.loads((max((tmp_path / "runs").iterdir()) / "summary.json").read_text())
+
+    assert run()["judge"] == {"judged": 4, "cache_hits": 0, "hit_rate": 0.0}
+    assert run()["judge"] == {"judged": 4, "cache_hits": 4, "hit_rate": 1.0}
+    stats = simple_cache.get_store().stats()
+    assert stats["by_model"]["stub-judge-v0"]["entries"] == 4
+    simple_cache.close_stores()
+
+
+def test_process_workers_record_judge_hits(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    suite = tmp_path / "judged.jsonl"
+    suite.write_text(
+        "".join(
+            json.dumps({"id": f"j{i}", "category": "judged", "prompt": f"Explain thing {i}", "evaluation": {"type": "llm_judge"}}) + "\n"
+            for i in range(4)
+        )
+    )
+    for _ in range(2):
+        out = CliRunner().invoke(app, ["run", str(suite), "--prompt", str(PROMPT), "--eval-executor", "process"])
+        assert out.exit_code == 0, out.output
+    simple_cache.close_stores()
+
+    # The second run's hits happened in the workers; their access times
+    # and lookup counts have to have been flushed when the pool shut down.
+    with sqlite3.connect(tmp_path / ".cache" / "cache.db") as conn:
+        judged = conn.execute("SELECT created_at, accessed_at FROM entries WHERE model = 'stub-judge-v0'").fetchall()
+        hits = conn.execute("SELECT COALESCE(SUM(hits), 0) FROM lookups").fetchone()[0]
+    assert len(judged) == 4
+    assert all(accessed > created for created, accessed in judged)
+    # Four inference hits in the parent, four verdict hits in the workers.
+    assert hits == 8
@@ -0,0 +1,62 @@
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+import evalpipe.runner as runner
+from evalpipe.cli import app
+from evalpipe.prompts.render import CompiledTemplate
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SUITE = REPO_ROOT / "data" / "suites" / "basic_v1.jsonl"
+PROMPT = REPO_ROOT / "src" / "evalpipe" / "prompts" / "basic_v1.txt"
+
+
+def test_matrix_run_writes_one_dir_per_cell(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    terse = tmp_path / "terse_v1.txt"
+    terse.write_text("{{prompt}}")
+
+    renders = []
+    real_render = CompiledTemplate.render
+
+    def counting_render(self, tc):
+        renders.append(tc["id"])
+        return real_render(self, tc)
+
+    monkeypatch.setattr(CompiledTemplate, "render", counting_render)
+
+    calls = []
+    real_infer = runner.dummy_infer
+
+    async def counting_infer(prompt: str) -> str:
+        calls.append(prompt)
+        return await real_infer(prompt)
+
+    monkeypatch.setattr(runner, "dummy_infer", counting_infer)
+
+    out = CliRunner().invoke(
+        app,
+        [
+            "run", str(SUITE),
+            "--prompt", str(PROMPT), "--prompt", str(terse),
+            "--model", "dummy-v0", "--model", "gpt-4o-mini",
+        ],
+    )
+    assert out.exit_code == 0, out.output
+
+    n_cases = sum(1 for line in SUITE.read_text().splitlines() if line.strip())
+    assert len(renders) == 2 * n_cases
+    assert len(calls) == 4 * n_cases
+
+    matrix_dir = next((tmp_path / "runs").iterdir())
+    matrix = json.loads((matrix_dir / "matrix.json").read_text())
+    assert len(matrix["cells"]) == 4
+    assert (matrix_dir / "matrix.md").exists()
+
+    for cell in matrix["cells"]:
+        cell_dir = Path(cell["run_dir"])
+        rows = (cell_dir / "results.jsonl").read_text().splitlines()
+        assert len(rows) == n_cases
+        assert {json.loads(r)["model"] for r in rows} == {cell["model"]}
+        assert cell["total_tests"] == n_cases
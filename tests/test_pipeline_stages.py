@@ -0,0 +1,42 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from evalpipe.loader import iter_suite
+from evalpipe.pipeline import run_pipeline
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SUITE = REPO_ROOT / "data" / "suites" / "basic_v1.jsonl"
+PROMPT = REPO_ROOT / "src" / "evalpipe" / "prompts" / "basic_v1.txt"
+
+
+@pytest.mark.parametrize("executor", ["inline", "thread", "process"])
+def test_pipeline_stages_keep_order_and_report_throughput(tmp_path, monkeypatch, executor):
+    monkeypatch.chdir(tmp_path)
+    run_dir = tmp_path / "run"
+
+    pipeline_run = run_pipeline(
+        indexed_cases=enumerate(iter_suite(SUITE)),
+        suite_id=SUITE.stem,
+        prompt_path=PROMPT,
+        model="dummy-v0",
+        run_dir=run_dir,
+        max_concurrency=4,
+        eval_executor=executor,
+        eval_workers=2,
+        eval_chunk_size=5,
+    )
+
+    suite_ids = [tc["id"] for tc in iter_suite(SUITE)]
+    written = [
+        json.loads(line)["id"]
+        for line in (run_dir / "evaluations.jsonl").read_text().splitlines()
+    ]
+    assert written == suite_ids
+
+    stages = pipeline_run.stages
+    assert stages["inference"]["cases"] == len(suite_ids)
+    assert stages["evaluation"]["cases"] == len(suite_ids)
+    assert stages["evaluation"]["executor"] == executor
+    assert stages["queue"]["max_depth"] <= stages["queue"]["max_size"]
@@ -0,0 +1,87 @@
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from evalpipe.cli import app
+from evalpipe.history import FAILED, FLAKY, load_priorities, prioritized
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SUITE = REPO_ROOT / "data" / "suites" / "basic_v1.jsonl"
+PROMPT = REPO_ROOT / "src" / "evalpipe" / "prompts" / "basic_v1.txt"
+
+
+def _write_evals(path, outcomes):
+    path.write_text("".join(json.dumps({"id": i, "passed": ok}) + "\n" for i, ok in outcomes.items()))
+    return path
+
+
+def test_failed_then_flaky_then_rest(tmp_path):
+    latest = _write_evals(tmp_path / "latest.jsonl", {"a": True, "b": True, "c": False, "d": True})
+    older = _write_evals(tmp_path / "older.jsonl", {"a": True, "b": False, "c": False, "d": True})
+
+    priorities = load_priorities([latest, older])
+    assert priorities == {"c": FAILED, "b": FLAKY}
+
+    cases = [(i, {"id": x}) for i, x in enumerate("abcde")]
+    order = [tc["id"] for _, tc in prioritized(lambda: iter(cases), priorities)]
+    assert order == ["c", "b", "a", "d", "e"]
+
+
+def test_cli_runs_previous_failures_first(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    latest = _write_evals(tmp_path / "latest.jsonl", {"math_001": True, "edge_004": False})
+    older = _write_evals(tmp_path / "older.jsonl", {"math_001": False, "edge_004": False})
+
+    out = CliRunner().invoke(
+        app,
+        [
+            "run", str(SUITE), "--prompt", str(PROMPT), "--max-concurrency", "1",
+            "--prioritize-failures", str(latest), "--prioritize-failures", str(older),
+        ],
+    )
+    assert out.exit_code == 0, out.output
+
+    run_dir = next((tmp_path / "runs").iterdir())
+    ids = [json.loads(line)["id"] for line in (run_dir / "results.jsonl").read_text().splitlines()]
+    assert ids[:3] == ["edge_004", "math_001", "math_002"]
+    assert len(ids) == 31
+    meta = json.loads((run_dir / "meta.json").read_text())
+    assert meta["prioritized"]["failed"] == 1 and meta["prioritized"]["flaky"] == 1
+
+
+
+def test_prioritizing_is_refused_for_shards(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    latest = _write_evals(tmp_path / "latest.jsonl", {"edge_004": False})
+
+    # Merging shards relies on each one being in suite order.
+    out = CliRunner().invoke(
+        app,
+        [
+            "run", str(SUITE), "--prompt", str(PROMPT), "--num-shards", "2", "--shard-index", "0",
+            "--prioritize-failures", str(latest),
+        ],
+    )
+    assert out.exit_code != 0
+    assert "sharding" in out.output
+    assert not (tmp_path / "runs").exists()
+
+def test_max_failures_cancels_outstanding_work(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    out = CliRunner().invoke(
+        app,
+        [
+            "run", str(SUITE), "--prompt", str(PROMPT), "--max-concurrency", "1",
+            "--eval-chunk-size", "1", "--eval-executor", "inline", "--max-failures", "2",
+        ],
+    )
+    assert out.exit_code == 1, out.output
+    assert "Stopped after 2 failures" in out.output
+
+    run_dir = next((tmp_path / "runs").iterdir())
+    summary = json.loads((run_dir / "summary.json").read_text())
+    assert summary["max_failures"]["reached"]
+    assert summary["failed"] >= 2
+    assert summary["total_tests"] < 31
@@ -1,5 +1,5 @@
 from pathlib import Path
-from evalpipe.prompts.render import render_prompt
+from evalpipe.prompts.render import load_prompt, load_template, render_prompt
 
 
 def test_render_prompt(tmp_path: Path):
@@ -12,3 +12,19 @@ def test_render_prompt(tmp_path: Path):
 
     assert rendered == "Q: What is 2+2?\nA:"
 
+
+
+def test_compiled_template_fields_and_reload(tmp_path: Path):
+    template = tmp_path / "t.txt"
+    template.write_text("{{category}}: {{prompt}} {{prompt}} {{unknown}}")
+
+    compiled = load_template(template)
+    assert compiled.fields == {"category", "prompt", "unknown"}
+    assert compiled.prompt_hash == load_prompt(str(template))[1]
+    assert load_template(template) is compiled
+    # Missing fields keep their placeholder; values aren't re-scanned.
+    assert compiled.render({"category": "{{prompt}}", "prompt": "x", "id": "1"}) == "{{prompt}}: x x {{unknown}}"
+
+    template.write_text("Q: {{prompt}}, longer")
+    assert render_prompt(template, {"prompt": "y"}) == "Q: y, longer"
+    assert load_template(template).fields == {"prompt"}
@@ -0,0 +1,107 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from evalpipe.cli import app
+from evalpipe.providers import RateLimitError, get_provider, openai_provider
+from evalpipe.providers.openai_provider import OpenAIProvider
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SUITE = REPO_ROOT / "data" / "suites" / "basic_v1.jsonl"
+PROMPT = REPO_ROOT / "src" / "evalpipe" / "prompts" / "basic_v1.txt"
+
+
+def _run_many(provider, prompts):
+    async def go():
+        try:
+            return await asyncio.gather(
+                *(provider.infer(p, model="gpt-4o-mini", params={}) for p in prompts)
+            )
+        finally:
+            await provider.aclose()
+
+    return asyncio.run(go())
+
+
+def test_openai_provider_reuses_connections(mock_server):
+    mock_server.latency = 0.01
+    provider = OpenAIProvider(base_url=mock_server.base_url, max_connections=4)
+
+    outputs = _run_many(provider, ["What is 17 * 24?"] * 20)
+
+    assert [o.output for o in outputs] == ["408"] * 20
+    assert outputs[0].prompt_tokens == 5
+    assert outputs[0].completion_tokens == 1
+    assert mock_server.requests == 20
+    assert mock_server.connections <= 4
+
+
+def test_without_keep_alive_every_call_connects(mock_server):
+    provider = OpenAIProvider(base_url=mock_server.base_url, keep_alive=False)
+
+    _run_many(provider, ["sky?"] * 5)
+
+    assert mock_server.connections == 5
+
+
+def test_rate_limit_raises(mock_server):
+    mock_server.rate_limit_every = 1
+    provider = OpenAIProvider(base_url=mock_server.base_url)
+
+    with pytest.raises(RateLimitError):
+        _run_many(provider, ["sky?"])
+
+
+
+def test_retry_after_may_be_an_http_date():
+    def retry_after(value):
+        with pytest.raises(RateLimitError) as e:
+            OpenAIProvider._raise_for_status(429, {"retry-after": value}, b"slow down")
+        return e.value.retry_after
+
+    assert retry_after("7") == 7.0
+    in_30s = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 < retry_after(in_30s) <= 30
+    assert retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    # Unparseable: no hint, the runner's own backoff applies.
+    assert retry_after("soon") is None
+
+def test_unknown_provider():
+    with pytest.raises(ValueError):
+        get_provider("nope")
+
+
+def test_sync_infer_refuses_to_run_inside_an_event_loop(monkeypatch, mock_server):
+    monkeypatch.setenv("OPENAI_BASE_URL", mock_server.base_url)
+    assert openai_provider.infer("sky?", model="gpt-4o-mini")["output"]
+
+    async def from_a_coroutine():
+        return openai_provider.infer("sky?", model="gpt-4o-mini")
+
+    with pytest.raises(RuntimeError, match="--eval-executor"):
+        asyncio.run(from_a_coroutine())
+
+def test_cli_run_against_mock_server(tmp_path, monkeypatch, mock_server):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("OPENAI_BASE_URL", mock_server.base_url)
+
+    out = CliRunner().invoke(
+        app,
+        ["run", str(SUITE), "--prompt", str(PROMPT), "--provider", "openai", "--model", "gpt-4o-mini"],
+    )
+    assert out.exit_code == 0, out.output
+
+    run_dir = next((tmp_path / "runs").iterdir())
+    first = json.loads((run_dir / "results.jsonl").read_text().splitlines()[0])
+    assert first["output"] == "408"
+    assert first["prompt_tokens"] > 0
+
+    meta = json.loads((run_dir / "meta.json").read_text())
+    provider_stats = meta["stages"]["inference"]["provider"]
+    assert provider_stats["name"] == "openai"
+    assert provider_stats["connections_opened"] <= 10
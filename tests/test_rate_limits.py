@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+from evalpipe.providers.openai_provider import OpenAIProvider
+from evalpipe.ratelimit import ModelRateLimiter, RateLimits, estimate_tokens
+from evalpipe.runner import run_inference_async
+
+
+def test_both_buckets_must_have_room():
+    # 6000 rpm with a 0.1s burst: 10 requests up front, then 100/s.
+    limiter = ModelRateLimiter(rpm=6000, tpm=10**9, burst_seconds=0.1)
+
+    async def admit(n, tokens):
+        for _ in range(n):
+            await limiter.acquire(tokens)
+
+    start = time.monotonic()
+    asyncio.run(admit(30, 1))
+    assert time.monotonic() - start >= 0.15
+
+    # Plenty of requests left, but each call is a whole second of TPM.
+    limiter = ModelRateLimiter(rpm=10**6, tpm=6000, burst_seconds=1.0)
+    start = time.monotonic()
+    asyncio.run(admit(2, 100))
+    assert time.monotonic() - start >= 0.9
+    assert limiter.admitted == 2
+
+
+def test_settle_refunds_overestimated_tokens():
+    limiter = ModelRateLimiter(rpm=60, tpm=6000, burst_seconds=1.0)
+    tokens = estimate_tokens("x" * 40, {"max_tokens": 64})
+    assert tokens == 75
+
+    asyncio.run(limiter.acquire(tokens))
+    limiter.settle(tokens, 10)
+    assert round(limiter.tokens.level) == 100 - 10
+
+
+
+def test_try_acquire_never_waits():
+    limiter = ModelRateLimiter(rpm=60, tpm=6000, burst_seconds=2.0)
+    assert limiter.try_acquire(10) and limiter.try_acquire(10)
+    # Two requests of burst, both spent; the third would have to wait.
+    assert not limiter.try_acquire(10)
+    assert limiter.admitted == 2
+    assert round(limiter.tokens.level) == 200 - 20
+
+def test_runner_holds_calls_to_quota(tmp_path, monkeypatch, mock_server):
+    monkeypatch.chdir(tmp_path)
+    provider = OpenAIProvider(base_url=mock_server.base_url)
+    # 20 requests/sec with 5 allowed up front.
+    limits = RateLimits({"gpt-4o-mini": {"rpm": 1200, "tpm": 10**7}}, burst_seconds=0.25)
+
+    async def go():
+        try:
+            return await run_inference_async(
+                suite_id="s",
+                test_cases=[{"id": f"c{i}"} for i in range(15)],
+                model="gpt-4o-mini",
+                rendered_prompt="sky?",
+                params={"max_tokens": 8},
+                max_concurrency=15,
+                provider=provider,
+                rate_limits=limits,
+            )
+        finally:
+            await provider.aclose()
+
+    start = time.monotonic()
+    results, errors = asyncio.run(go())
+
+    assert not errors
+    assert time.monotonic() - start >= 0.45
+    stats = limits.stats()["gpt-4o-mini"]
+    assert stats["admitted"] == 15
+    assert stats["throttled"] == 0
+    assert stats["waited_seconds"] > 0
@@ -0,0 +1,78 @@
+import json
+import shutil
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+import evalpipe.runner as runner
+from evalpipe.cli import app
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SUITE = REPO_ROOT / "data" / "suites" / "basic_v1.jsonl"
+PROMPT = REPO_ROOT / "src" / "evalpipe" / "prompts" / "basic_v1.txt"
+
+
+def _ids(path: Path):
+    return [json.loads(line)["id"] for line in path.read_text().splitlines()]
+
+
+def _keep_lines(path: Path, n: int, partial: bool = False) -> None:
+    lines = path.read_text().splitlines(keepends=True)
+    text = "".join(lines[:n])
+    if partial:
+        text += lines[n][: len(lines[n]) // 2]
+    path.write_text(text)
+
+
+def test_resume_only_reruns_unfinished_cases(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cli = CliRunner()
+
+    out = cli.invoke(app, ["run", str(SUITE), "--prompt", str(PROMPT)])
+    assert out.exit_code == 0, out.output
+    run_dir = next((tmp_path / "runs").iterdir())
+    full_summary = json.loads((run_dir / "summary.json").read_text())
+    suite_ids = _ids(run_dir / "test_cases.jsonl")
+
+    # Simulate a crash: results/evaluations are one case behind test_cases
+    # and the last results row was only half written.
+    _keep_lines(run_dir / "test_cases.jsonl", 10)
+    _keep_lines(run_dir / "results.jsonl", 9, partial=True)
+    _keep_lines(run_dir / "evaluations.jsonl", 9)
+    (run_dir / "summary.json").unlink()
+    shutil.rmtree(tmp_path / ".cache")
+
+    calls = []
+    real_infer = runner.dummy_infer
+
+    async def counting_infer(prompt: str) -> str:
+        calls.append(prompt)
+        return await real_infer(prompt)
+
+    monkeypatch.setattr(runner, "dummy_infer", counting_infer)
+
+    out = cli.invoke(app, ["run", "--resume", str(run_dir)])
+    assert out.exit_code == 0, out.output
+
+    assert len(calls) == len(suite_ids) - 9
+    for name in ("test_cases", "results", "evaluations"):
+        assert _ids(run_dir / f"{name}.jsonl") == suite_ids
+
+    resumed_summary = json.loads((run_dir / "summary.json").read_text())
+    for key in ("total_tests", "passed", "failed", "by_category", "top_failures"):
+        assert resumed_summary[key] == full_summary[key]
+
+    progress = json.loads((run_dir / "progress.json").read_text())
+    assert progress["status"] == "complete"
+    assert progress["completed"] == len(suite_ids)
+
+
+def test_resume_rejects_different_model(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cli = CliRunner()
+
+    cli.invoke(app, ["run", str(SUITE), "--prompt", str(PROMPT)])
+    run_dir = next((tmp_path / "runs").iterdir())
+
+    out = cli.invoke(app, ["run", "--resume", str(run_dir), "--model", "gpt-4o"])
+    assert out.exit_code != 0
@@ -0,0 +1,74 @@
+import asyncio
+
+import evalpipe.runner as runner
+from evalpipe.scheduler import worker_pool
+
+
+def test_reorder_buffer_vs_as_completed():
+    delays = {0: 0.03, 1: 0.0, 2: 0.01, 3: 0.0}
+
+    async def source():
+        for i in range(4):
+            yield i
+
+    async def work(i):
+        await asyncio.sleep(delays[i])
+        return i * 10
+
+    async def collect(ordered):
+        return [pair async for pair in worker_pool(source(), work, workers=4, ordered=ordered)]
+
+    assert asyncio.run(collect(True)) == [(0, 0), (1, 10), (2, 20), (3, 30)]
+    assert [i for i, _ in asyncio.run(collect(False))] == [1, 3, 2, 0]
+
+
+def test_million_cases_stay_within_the_window():
+    workers, buffer = 16, 8
+    pulled = 0
+    consumed = 0
+    peak_alive = 0
+
+    def cases():
+        nonlocal pulled, peak_alive
+        for i in range(1_000_000):
+            pulled += 1
+            peak_alive = max(peak_alive, pulled - consumed)
+            yield i
+
+    async def work(i):
+        return i
+
+    async def go():
+        nonlocal consumed
+        expected = 0
+        async for i, result in worker_pool(cases(), work, workers=workers, buffer=buffer):
+            assert i == result == expected
+            expected += 1
+            consumed += 1
+
+    asyncio.run(go())
+
+    assert consumed == 1_000_000
+    assert peak_alive <= workers + buffer
+
+
+def test_run_inference_async_takes_an_async_iterator(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    async def cases():
+        for i in range(25):
+            yield {"id": f"c{i}"}
+
+    results, errors = asyncio.run(
+        runner.run_inference_async(
+            suite_id="s",
+            test_cases=cases(),
+            model="m1",
+            rendered_prompt="What is 17 * 24?",
+            params={},
+            max_concurrency=4,
+        )
+    )
+
+    assert not errors
+    assert [r["id"] for r in results] == [f"c{i}" for i in range(25)]
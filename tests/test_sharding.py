@@ -0,0 +1,70 @@
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from evalpipe.cli import app
+from evalpipe.sharding import select_shard, shard_of
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SUITE = REPO_ROOT / "data" / "suites" / "basic_v1.jsonl"
+PROMPT = REPO_ROOT / "src" / "evalpipe" / "prompts" / "basic_v1.txt"
+
+
+def test_shards_partition_the_suite():
+    cases = [(i, {"id": f"case_{i}"}) for i in range(200)]
+
+    picked = []
+    for shard in range(4):
+        picked.extend(select_shard(cases, 4, shard))
+
+    assert sorted(i for i, _ in picked) == list(range(200))
+    assert shard_of("case_7", 4) == shard_of("case_7", 4)
+
+
+def test_merged_shards_match_single_process_run(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cli = CliRunner()
+    base = ["run", str(SUITE), "--prompt", str(PROMPT)]
+
+    out = cli.invoke(app, base)
+    assert out.exit_code == 0, out.output
+    single_dir = next((tmp_path / "runs").iterdir())
+
+    for i in range(3):
+        out = cli.invoke(app, base + ["--num-shards", "3", "--shard-index", str(i)])
+        assert out.exit_code == 0, out.output
+    shard_dirs = sorted(p for p in (tmp_path / "runs").iterdir() if "shard" in p.name)
+    assert len(shard_dirs) == 3
+
+    merged_dir = tmp_path / "merged"
+    out = cli.invoke(app, ["merge", *map(str, shard_dirs), "--output", str(merged_dir)])
+    assert out.exit_code == 0, out.output
+
+    single = json.loads((single_dir / "summary.json").read_text())
+    merged = json.loads((merged_dir / "summary.json").read_text())
+    single.pop("run_id")
+    merged.pop("run_id")
+    # The shards ran against the cache the single run filled in.
+    assert "cache" not in single
+    assert merged.pop("cache")["exact_hits"] == 31
+    assert merged == single
+
+    def ids(run_dir):
+        return [json.loads(l)["id"] for l in (run_dir / "evaluations.jsonl").read_text().splitlines()]
+
+    assert ids(merged_dir) == ids(single_dir)
+
+    report_body = lambda d: (d / "report.md").read_text().split("## Tokens")[1]
+    assert report_body(merged_dir) == report_body(single_dir)
+
+
+def test_merge_rejects_missing_shard(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cli = CliRunner()
+
+    cli.invoke(app, ["run", str(SUITE), "--prompt", str(PROMPT), "--num-shards", "2", "--shard-index", "0"])
+    shard_dir = next((tmp_path / "runs").iterdir())
+
+    out = cli.invoke(app, ["merge", str(shard_dir)])
+    assert out.exit_code != 0
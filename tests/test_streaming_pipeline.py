@@ -0,0 +1,69 @@
+import json
+import tracemalloc
+from pathlib import Path
+
+from evalpipe import coalesce
+from evalpipe.cache import simple_cache
+from evalpipe.loader import iter_suite
+from evalpipe.pipeline import run_pipeline
+
+
+def _write_suite(path: Path, n: int) -> None:
+    with path.open("w") as f:
+        for i in range(n):
+            row = {
+                "id": f"case_{i}",
+                "category": "math" if i % 2 else "format",
+                "prompt": f"What is 17 * 24? ({i})",
+                "expected": "408",
+                "evaluation": {"type": "exact_match"},
+            }
+            f.write(json.dumps(row) + "\n")
+
+
+def _peak_for(tmp_path: Path, n: int) -> int:
+    suite = tmp_path / f"suite_{n}.jsonl"
+    _write_suite(suite, n)
+    template = tmp_path / "t.txt"
+    template.write_text("Q: {{prompt}}")
+
+    tracemalloc.start()
+    aggregator = run_pipeline(
+        indexed_cases=enumerate(iter_suite(suite)),
+        suite_id=suite.stem,
+        prompt_path=template,
+        model="dummy-v0",
+        run_dir=tmp_path / f"run_{n}",
+        max_concurrency=8,
+    ).aggregator
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert aggregator.total == n
+    assert aggregator.passed == n
+    return peak
+
+
+def test_pipeline_streams_rows_in_order(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    _peak_for(tmp_path, 50)
+
+    ids = [
+        json.loads(line)["id"]
+        for line in (tmp_path / "run_50" / "evaluations.jsonl").read_text().splitlines()
+    ]
+    assert ids == [f"case_{i}" for i in range(50)]
+
+
+def test_pipeline_memory_does_not_grow_with_suite(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # The coalescer's memo and the cache's memory tier are fixed budgets;
+    # shrink them so both runs fill them.
+    monkeypatch.setattr(coalesce, "DEFAULT_MAX_ENTRIES", 100)
+    monkeypatch.setattr(simple_cache, "MEMORY_MAX_ENTRIES", 100)
+
+    small = _peak_for(tmp_path, 200)
+    large = _peak_for(tmp_path, 2000)
+
+    # 10x the cases should not mean anything close to 10x the memory.
+    assert large < small * 2
@@ -0,0 +1,79 @@
+import asyncio
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from evalpipe.aggregate import Aggregator
+from evalpipe.cli import app
+from evalpipe.providers.openai_provider import OpenAIProvider
+from evalpipe.runner import run_single
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SUITE = REPO_ROOT / "data" / "suites" / "basic_v1.jsonl"
+PROMPT = REPO_ROOT / "src" / "evalpipe" / "prompts" / "basic_v1.txt"
+
+
+def test_streamed_result_has_token_timings(tmp_path, monkeypatch, mock_server):
+    monkeypatch.chdir(tmp_path)
+    mock_server.ttft = 0.05
+    mock_server.token_interval = 0.01
+    provider = OpenAIProvider(base_url=mock_server.base_url)
+
+    async def go():
+        try:
+            return await run_single(
+                suite_id="s",
+                test_case={"id": "t1"},
+                model="gpt-4o-mini",
+                rendered_prompt="What is gravity?",
+                params={},
+                provider=provider,
+                stream=True,
+            )
+        finally:
+            await provider.aclose()
+
+    res = asyncio.run(go())
+
+    assert res["output"] == "Gravity is a force."
+    assert res["ttft_ms"] >= 45
+    assert 8 <= res["inter_token_ms"] < 40
+    assert res["tokens_per_sec"] > 0
+    assert res["latency_ms"] >= res["ttft_ms"]
+
+
+def test_aggregator_summarizes_stream_timings_per_model_and_category():
+    def row(model, ttft, cache_hit=False):
+        return {"model": model, "ttft_ms": ttft, "inter_token_ms": 10.0, "tokens_per_sec": 100.0, "cache_hit": cache_hit}
+
+    left, right = Aggregator(), Aggregator()
+    left.add({"category": "a"}, row("m1", 100.0), {"passed": True})
+    left.add({"category": "a"}, row("m1", 5000.0, cache_hit=True), {"passed": True})
+    right.add({"category": "b"}, row("m2", 300.0), {"passed": True})
+    right.add({"category": "b"}, {"model": "m2", "latency_ms": 5}, {"passed": True})
+
+    streaming = left.merge(right).summary()["streaming"]
+
+    assert streaming["by_model"]["m1"]["count"] == 1
+    assert abs(streaming["by_model"]["m1"]["ttft_ms"]["p50"] - 100.0) < 2
+    assert streaming["by_category"]["b"]["ttft_ms"]["mean"] == 300.0
+    assert abs(streaming["by_category"]["b"]["tokens_per_sec"]["p95"] - 100.0) < 2
+
+
+def test_cli_stream(tmp_path, monkeypatch, mock_server):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("OPENAI_BASE_URL", mock_server.base_url)
+
+    out = CliRunner().invoke(
+        app,
+        ["run", str(SUITE), "--prompt", str(PROMPT), "--provider", "openai", "--model", "gpt-4o-mini", "--stream"],
+    )
+    assert out.exit_code == 0, out.output
+
+    run_dir = next((tmp_path / "runs").iterdir())
+    rows = [json.loads(line) for line in (run_dir / "results.jsonl").read_text().splitlines()]
+    assert all(r["ttft_ms"] is not None for r in rows if not r["coalesced"])
+    summary = json.loads((run_dir / "summary.json").read_text())
+    assert summary["streaming"]["by_model"]["gpt-4o-mini"]["count"] >= 1
+    assert "## Streaming" in (run_dir / "report.md").read_text()